@@ -1,103 +1,125 @@
 import streamlit as st
 import requests
 import re
+import textwrap
+import uuid
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+from config import get_config
+from src.analytics import track
+from src.circuit_breaker import ipapi_breaker, is_server_error, nominatim_breaker
+from src.conversation_log import log_turn
+from src.deadline import (clamp_timeout, deadline_scope, has_time_for, mark_degraded,
+                          turn_budget, wait_timeout)
+from src.feedback import get_feedback_store, profile_bucket
+from src.geo_cache import location_cache, office_cache, office_key
+from src.language_packs import AVAILABLE_PACKS, pack_for, patterns_for
+from src.llm_extractor import llm_extractor
+from src.metrics import count_error, observe_turn, register_sessions, start_metrics_server
+from src.conversation_engine import SaarthakConversationEngine
+from src.office_prefetch import OfficePrefetcher
+from src.profiler import stage_tag
+from src.rate_limit import admission, allow_request
+from src.scheme_render import build_scheme_pages, scheme_key
+from src.single_flight import ipapi_flight, nominatim_flight
+from src.session_history import HistorySpill, cap_history
+from src.session_store import SessionSweeper, create_session_store, pack_messages, unpack_messages
+from src.stage_timing import record_stage, timed, timed_stage
+from src.tracing import span, trace_turn, traced
 
 class EnhancedConversationEngine:
     """Enhanced conversation engine with robust Hindi/Hinglish support"""
     
+    # Rendered scheme cards/detail pages shared by every session (see get_scheme_pages)
+    _scheme_pages = None
+    
+    CITY_STATE_MAP = {
+        'mumbai': 'Maharashtra', 'delhi': 'Delhi', 'bangalore': 'Karnataka',
+        'chennai': 'Tamil Nadu', 'kolkata': 'West Bengal', 'hyderabad': 'Telangana',
+        'pune': 'Maharashtra', 'ahmedabad': 'Gujarat', 'jaipur': 'Rajasthan',
+        'lucknow': 'Uttar Pradesh', 'kanpur': 'Uttar Pradesh', 'nagpur': 'Maharashtra',
+        'indore': 'Madhya Pradesh', 'thane': 'Maharashtra', 'bhopal': 'Madhya Pradesh',
+        'visakhapatnam': 'Andhra Pradesh', 'pimpri': 'Maharashtra', 'patna': 'Bihar',
+        'vadodara': 'Gujarat', 'ghaziabad': 'Uttar Pradesh', 'ludhiana': 'Punjab',
+        'agra': 'Uttar Pradesh', 'nashik': 'Maharashtra', 'faridabad': 'Haryana',
+        'meerut': 'Uttar Pradesh', 'rajkot': 'Gujarat', 'kalyan': 'Maharashtra'
+    }
+    
     def __init__(self):
         self.user_profile = {}
         self.conversation_stage = "initial"
         self.schemes_database = self.load_schemes()
+        self.scheme_pages = self.get_scheme_pages(self.schemes_database)
         self.selected_scheme = None
         self.show_details = False
         self.language_patterns = self.load_language_patterns()
         self.waiting_for_city = False  # New flag to track when waiting for city input
-        
-    def load_language_patterns(self):
-        """Comprehensive language patterns for Hindi/Hinglish/English"""
+        self.prefetcher = None  # OfficePrefetcher set by the host (Streamlit/API)
+        self.session_id = None
+        self.last_deadline = None  # Deadline of the most recent turn (for tagging)
+        self.last_question = None  # field last asked, so each question is counted once
+        self.feedback = {}  # scheme key -> feedback kinds this session gave
+        self.last_intent = None  # intent of the most recent turn (metrics label)
+        self.last_trace_id = None  # set when the most recent turn was sampled for tracing
+    
+    def to_state(self):
+        """Compact, JSON-serializable snapshot of the conversation state"""
         return {
-            "age_indicators": [
-                "age", "years old", "year old", "yrs", "i am",
-                "umra", "umr", "saal", "varsh", "main", "hun", "hoon",
-                "umar", "age hai", "saal ka", "saal ki"
-            ],
-            
-            "profession_keywords": {
-                "farmer": [
-                    "farmer", "farming", "agriculture", "crop", "farm",
-                    "किसान", "खेती", "कृषि", "खेत", "फसल", "कृषक",
-                    "kisan", "kheti", "krishi", "khet", "fasal", "krshak",
-                    "farming karta", "kheti karta", "farmer hun"
-                ],
-                "student": [
-                    "student", "study", "studying", "college", "school", "education",
-                    "छात्र", "छात्रा", "पढ़ाई", "पढ़ता", "पढ़ती", "कॉलेज", "स्कूल", "शिक्षा",
-                    "chatra", "chhatra", "padhai", "padhta", "padhti", "college", "school",
-                    "student hun", "padh raha", "padh rahi", "study karta"
-                ],
-                "employee": [
-                    "job", "work", "working", "employee", "service", "office",
-                    "नौकरी", "काम", "कार्य", "सेवा", "ऑफिस", "कर्मचारी", "कामगार",
-                    "naukri", "nokri", "kaam", "karya", "seva", "office", "karmchari",
-                    "job karta", "kaam karta", "naukri hai", "service mein"
-                ],
-                "business_owner": [
-                    "business", "shop", "store", "entrepreneur", "owner", "trade",
-                    "व्यापार", "व्यवसाय", "दुकान", "कारोबार", "धंधा", "मालिक",
-                    "vyapar", "vyvasay", "dukan", "karobar", "dhanda", "malik", 
-                    "business karta", "shop hai", "vyapar karta"
-                ],
-                "unemployed": [
-                    "unemployed", "no job", "jobless", "searching job",
-                    "बेरोजगार", "बिना काम", "काम नहीं", "नौकरी नहीं",
-                    "berojgar", "berozgar", "kaam nahi", "naukri nahi", "job nahi",
-                    "koi kaam nahi", "unemployed hun"
-                ]
-            },
-            
-            "location_keywords": {
-                "rural": [
-                    "village", "rural", "countryside", "farm area",
-                    "गांव", "गाँव", "ग्रामीण", "देहात", "खेत",
-                    "gaon", "ganv", "grameen", "dehat", "village mein",
-                    "gaon se", "rural area"
-                ],
-                "urban": [
-                    "city", "town", "urban", "metro", "municipal",
-                    "शहर", "नगर", "महानगर", "कस्बा", "शहरी",
-                    "sheher", "shahar", "nagar", "mahanagar", "kasba", "shahri",
-                    "city mein", "town mein", "urban area"
-                ]
-            },
-            
-            "income_keywords": [
-                "income", "salary", "earning", "earn", "rupees", "rs", "inr",
-                "आय", "वेतन", "कमाई", "कमाता", "कमाती", "रुपए", "रुपये", "पैसा",
-                "aay", "vetan", "kamai", "kamata", "kamati", "rupee", "rupaye", "paisa",
-                "salary hai", "kamai hai", "income hai", "kamata hun"
-            ],
-            
-            "family_keywords": [
-                "family", "members", "people", "persons",
-                "परिवार", "सदस्य", "लोग", "व्यक्ति", "घर", "घरवाले",
-                "parivar", "parivaar", "sadasya", "log", "vyakti", "ghar", "gharwale",
-                "family mein", "ghar mein", "members hai"
-            ],
-            
-            "number_words": {
-                "एक": 1, "दो": 2, "तीन": 3, "चार": 4, "पांच": 5, "छह": 6, "सात": 7, "आठ": 8, "नौ": 9, "दस": 10,
-                "ग्यारह": 11, "बारह": 12, "तेरह": 13, "चौदह": 14, "पंद्रह": 15, "सोलह": 16, "सत्रह": 17, "अट्ठारह": 18, "उन्नीस": 19, "बीस": 20,
-                "ek": 1, "do": 2, "teen": 3, "char": 4, "panch": 5, "chhe": 6, "saat": 7, "aath": 8, "nau": 9, "das": 10,
-                "gyarah": 11, "barah": 12, "terah": 13, "chaudah": 14, "pandrah": 15, "solah": 16, "satrah": 17, "atharah": 18, "unnis": 19, "bees": 20
-            }
+            "p": self.user_profile,
+            "s": self.conversation_stage,
+            "sc": self.selected_scheme,
+            "w": self.waiting_for_city,
+            "q": self.last_question,
+            "f": self.feedback
         }
     
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an engine from a to_state() snapshot"""
+        engine = cls()
+        if state:
+            engine.user_profile = dict(state.get("p", {}))
+            engine.conversation_stage = state.get("s", "initial")
+            engine.selected_scheme = state.get("sc")
+            engine.waiting_for_city = bool(state.get("w", False))
+            engine.last_question = state.get("q")
+            engine.feedback = {key: list(kinds) for key, kinds in state.get("f", {}).items()}
+        return engine
+        
+    def load_language_patterns(self, language="English"):
+        """Matcher tables for the session language, compiled once per process from its pack"""
+        return patterns_for(language)
+    
+    @classmethod
+    def get_scheme_pages(cls, schemes):
+        """Cards and detail pages for every scheme and language, rendered once per process"""
+        if cls._scheme_pages is None:
+            cls._scheme_pages = build_scheme_pages(schemes.values())
+        return cls._scheme_pages
+    
+    def reload_schemes(self):
+        """Reload scheme data and re-render its cards and detail pages"""
+        self.schemes_database = self.load_schemes()
+        EnhancedConversationEngine._scheme_pages = build_scheme_pages(self.schemes_database.values())
+        self.scheme_pages = EnhancedConversationEngine._scheme_pages
+    
+    @timed("chat.render")
+    def scheme_page(self, scheme, language):
+        """Pre-rendered name/card/detail page for a scheme in the UI language"""
+        render_language = pack_for(language).name
+        pages = self.scheme_pages[scheme_key(scheme)]
+        if render_language not in pages:
+            # Languages beyond the preloaded ones are rendered on first use, once per process
+            for scheme_id, rendered in build_scheme_pages(self.schemes_database.values(), (render_language,)).items():
+                self.scheme_pages[scheme_id].update(rendered)
+        return pages[render_language]
+    
     def load_schemes(self):
         """Load schemes with location-specific data"""
         return {
             "pm_kisan": {
+                "id": "pm_kisan",
                 "name_hindi": "PM किसान सम्मान निधि",
                 "name_english": "PM Kisan Samman Nidhi",
                 "category": "agriculture",
@@ -113,6 +135,7 @@ class EnhancedConversationEngine:
                 "quick_docs_hindi": ["आधार", "भूमि रिकॉर्ड", "बैंक खाता"]
             },
             "ayushman_bharat": {
+                "id": "ayushman_bharat",
                 "name_hindi": "आयुष्मान भारत",
                 "name_english": "Ayushman Bharat PM-JAY", 
                 "category": "health",
@@ -128,6 +151,7 @@ class EnhancedConversationEngine:
                 "quick_docs_hindi": ["आधार", "राशन कार्ड", "SECC सत्यापन"]
             },
             "pm_awas_urban": {
+                "id": "pm_awas_urban",
                 "name_hindi": "PM आवास योजना",
                 "name_english": "PM Awas Yojana Urban",
                 "category": "housing", 
@@ -143,6 +167,7 @@ class EnhancedConversationEngine:
                 "quick_docs_hindi": ["आधार", "आय प्रमाण पत्र", "संपत्ति दस्तावेज"]
             },
             "nsp_scholarship": {
+                "id": "nsp_scholarship",
                 "name_hindi": "राष्ट्रीय छात्रवृत्ति",
                 "name_english": "National Scholarship Portal",
                 "category": "education",
@@ -169,6 +194,8 @@ class EnhancedConversationEngine:
     def fuzzy_match_keywords(self, text, keyword_list, threshold=0.7):
         """Fuzzy matching for keywords to handle typos and variations"""
         text_normalized = self.normalize_text(text)
+        # Out of budget: exact keyword hits only, skip the SequenceMatcher passes
+        fuzzy = has_time_for("extraction")
         
         for keyword in keyword_list:
             keyword_normalized = self.normalize_text(keyword)
@@ -176,7 +203,7 @@ class EnhancedConversationEngine:
             if keyword_normalized in text_normalized:
                 return True
             
-            if len(keyword_normalized) > 3:
+            if fuzzy and len(keyword_normalized) > 3:
                 similarity = SequenceMatcher(None, keyword_normalized, text_normalized).ratio()
                 if similarity >= threshold:
                     return True
@@ -233,13 +260,7 @@ class EnhancedConversationEngine:
         
         text_clean = re.sub(r'[₹$¢€£]', '', text_lower)
         
-        income_patterns = [
-            (r'(\d+(?:\.\d+)?)\s*(?:lakh|lakhs|लाख|लाखों|l|L)', 100000),
-            (r'(\d+(?:\.\d+)?)\s*(?:thousand|thousands|हजार|हज़ार|k|K)', 1000),
-            (r'(\d+(?:\.\d+)?)\s*(?:crore|crores|करोड़|करोड़ों)', 10000000),
-            (r'(\d{1,3}(?:,\d{3})+)', 1),
-            (r'(\d{4,8})', 1),
-        ]
+        income_patterns = self.language_patterns["income_patterns"]
         
         for pattern, multiplier in income_patterns:
             match = re.search(pattern, text_clean)
@@ -256,77 +277,86 @@ class EnhancedConversationEngine:
         
         return None
     
+    @traced("extraction")
     def extract_user_info_from_text(self, text):
         """Enhanced information extraction with better language support"""
         text_normalized = self.normalize_text(text)
         
-        if "age" not in self.user_profile:
-            age = self.extract_numbers_with_context(text)
-            if age:
-                self.user_profile["age"] = age
-        
-        if "profession" not in self.user_profile:
-            for profession, keywords in self.language_patterns["profession_keywords"].items():
-                if self.fuzzy_match_keywords(text_normalized, keywords):
-                    self.user_profile["profession"] = profession
-                    break
+        with timed_stage("chat.extract.age"):
+            if "age" not in self.user_profile:
+                age = self.extract_numbers_with_context(text)
+                if age:
+                    self.user_profile["age"] = age
+        
+        with timed_stage("chat.extract.profession"):
+            if "profession" not in self.user_profile:
+                for profession, keywords in self.language_patterns["profession_keywords"].items():
+                    if self.fuzzy_match_keywords(text_normalized, keywords):
+                        self.user_profile["profession"] = profession
+                        break
         
-        if "location" not in self.user_profile:
-            for location_type, keywords in self.language_patterns["location_keywords"].items():
-                if self.fuzzy_match_keywords(text_normalized, keywords):
-                    self.user_profile["location"] = location_type
-                    break
+        with timed_stage("chat.extract.location"):
+            if "location" not in self.user_profile:
+                for location_type, keywords in self.language_patterns["location_keywords"].items():
+                    if self.fuzzy_match_keywords(text_normalized, keywords):
+                        self.user_profile["location"] = location_type
+                        break
         
-        if "annual_income" not in self.user_profile:
-            income = self.extract_income_amount(text)
-            if income:
-                self.user_profile["annual_income"] = income
+        with timed_stage("chat.extract.income"):
+            if "annual_income" not in self.user_profile:
+                income = self.extract_income_amount(text)
+                if income:
+                    self.user_profile["annual_income"] = income
         
-        if "family_size" not in self.user_profile and "age" in self.user_profile:
-            family_size = None
+        with timed_stage("chat.extract.family_size"):
+            if "family_size" not in self.user_profile and "age" in self.user_profile:
+                family_size = None
             
-            simple_match = re.search(r'^\s*(\d{1,2})\s*$', text_normalized)
-            if simple_match:
-                family_size = int(simple_match.group(1))
-            else:
-                patterns = [
-                    r'(?:family|parivar|परिवार|ghar|घर).*?(\d{1,2})',
-                    r'(\d{1,2}).*?(?:members|sadasya|सदस्य|log|लोग)',
-                    r'(?:hum|हम|main|मैं)\s*(\d{1,2})',
-                    r'(\d{1,2})\s*(?:log|लोग|member|sadasya|सदस्य)'
-                ]
+                simple_match = re.search(r'^\s*(\d{1,2})\s*$', text_normalized)
+                if simple_match:
+                    family_size = int(simple_match.group(1))
+                else:
+                    patterns = [
+                        r'(?:family|parivar|परिवार|ghar|घर).*?(\d{1,2})',
+                        r'(\d{1,2}).*?(?:members|sadasya|सदस्य|log|लोग)',
+                        r'(?:hum|हम|main|मैं)\s*(\d{1,2})',
+                        r'(\d{1,2})\s*(?:log|लोग|member|sadasya|सदस्य)'
+                    ]
                 
-                for pattern in patterns:
-                    match = re.search(pattern, text_normalized)
-                    if match:
-                        family_size = int(match.group(1))
-                        break
+                    for pattern in patterns:
+                        match = re.search(pattern, text_normalized)
+                        if match:
+                            family_size = int(match.group(1))
+                            break
             
-            if family_size and family_size != self.user_profile["age"] and 1 <= family_size <= 20:
-                self.user_profile["family_size"] = family_size
+                if family_size and family_size != self.user_profile["age"] and 1 <= family_size <= 20:
+                    self.user_profile["family_size"] = family_size
+        
+        with timed_stage("chat.extract.city"):
+            city = self.detect_city(text_normalized)
+            if city:
+                self.prefetch_offices(city, self.CITY_STATE_MAP[city.lower()])
     
+    def detect_city(self, text_normalized):
+        """Return a known city named in the text, if any"""
+        words = set(text_normalized.split())
+        for city in self.CITY_STATE_MAP:
+            if city in words:
+                return city.title()
+        return None
+    
+    def prefetch_offices(self, city, state):
+        """Warm the office cache for a city in the background"""
+        if self.prefetcher is not None:
+            self.prefetcher.prefetch_offices(self.session_id, self, city, state)
+    
+    @timed("chat.render")
     def get_smart_response(self, missing_field, language):
         """Generate contextual responses based on previous inputs"""
-        
-        if language == "हिंदी":
-            questions = {
-                "age": ["आपकी उम्र क्या है? 🎂", "*संख्या लिखें (जैसे: 25)*"],
-                "profession": ["आप क्या करते हैं? 💼", "• 'किसान' 🌾 • 'छात्र' 📚 • 'नौकरी' 💼"],
-                "location": ["आप कहाँ रहते हैं? 🏠", "• 'गांव' 🌾 • 'शहर' 🏙️"],
-                "annual_income": ["सालाना पारिवारिक आय? 💰", "जैसे: '2 लाख' या '50000'"],
-                "family_size": ["परिवार में कितने सदस्य? 👨‍👩‍👧‍👦", "*संख्या लिखें (जैसे: 4)*"]
-            }
-        else:
-            questions = {
-                "age": ["What is your age? 🎂", "*Type a number (e.g., 25)*"],
-                "profession": ["What do you do? 💼", "• 'farmer' 🌾 • 'student' 📚 • 'job' 💼"],
-                "location": ["Where do you live? 🏠", "• 'village' 🌾 • 'city' 🏙️"],
-                "annual_income": ["Family income per year? 💰", "e.g., '2 lakh' or '50000'"],
-                "family_size": ["How many family members? 👨‍👩‍👧‍👦", "*Type a number (e.g., 4)*"]
-            }
-        
-        return "\n".join(questions.get(missing_field, ["Please provide more details."]))
+        return pack_for(language).prompt(missing_field)
     
+    @timed("chat.matching")
+    @traced("matching")
     def find_matching_schemes(self):
         """Find schemes matching user profile"""
         matching = []
@@ -345,6 +375,54 @@ class EnhancedConversationEngine:
     
     def process_query(self, user_input, language="English"):
         """Process with improved UX - progressive disclosure"""
+        return "".join(self.process_query_stream(user_input, language))
+    
+    def process_query_stream(self, user_input, language="English"):
+        """Yield response sections as soon as each one is ready, within the turn budget"""
+        self.language_patterns = self.load_language_patterns(language)
+        message = user_input
+        user_input = user_input.translate(self.language_patterns["digits"])
+        sections = []
+        track("language", pack_for(language).name)
+        with trace_turn("chat.turn", session=self.session_id or "", language=language) as trace, \
+                stage_tag(self.conversation_stage):
+            self.last_trace_id = trace.trace_id
+            with deadline_scope(turn_budget(get_config())) as deadline:
+                self.last_deadline = deadline
+                for section in self.route_query_stream(user_input, language):
+                    sections.append(section)
+                    yield section
+            trace.set("intent", self.last_intent)
+            trace.set("stage", self.conversation_stage)
+            if deadline.degraded_stages:
+                trace.set("degraded", ",".join(deadline.degraded_stages))
+        record_stage("chat.turn", deadline.elapsed())
+        observe_turn("chat", self.last_intent, deadline.elapsed())
+        log_turn(self.session_id, language, message, "".join(sections), self.conversation_stage,
+                 deadline.elapsed(), deadline.degraded_stages, self.last_trace_id)
+    
+    def route_query_stream(self, user_input, language):
+        """Route one turn to the handler for its intent"""
+        with timed_stage("chat.routing"):
+            intent, argument = self.detect_intent(user_input)
+        self.last_intent = intent or self.conversation_stage
+        
+        if intent == "city_offices":
+            yield from self.get_city_specific_offices_stream(argument, language)
+        elif intent == "scheme_details":
+            yield self.show_scheme_details(argument, language)
+        elif intent == "location_services":
+            yield from self.provide_location_services_stream(language)
+        # Regular conversation flow
+        elif self.conversation_stage == "initial":
+            yield self.handle_initial_query(user_input, language)
+        elif self.conversation_stage == "gathering_details":
+            yield self.handle_detail_gathering(user_input, language)
+        elif self.conversation_stage == "recommendations":
+            yield self.provide_smart_recommendations(language)
+    
+    def detect_intent(self, user_input):
+        """(intent, argument) for a turn; intent is None for the regular conversation flow"""
         
         user_input_lower = user_input.lower().strip()
         
@@ -352,8 +430,7 @@ class EnhancedConversationEngine:
         if self.waiting_for_city:
             self.waiting_for_city = False  # Reset the flag
             # Clean the city name and get office information
-            city_name = user_input.strip().title()
-            return self.get_city_specific_offices(city_name, language)
+            return "city_offices", user_input.strip().title()
         
         # Handle city-specific office requests with explicit patterns
         city_office_patterns = [
@@ -369,33 +446,48 @@ class EnhancedConversationEngine:
                 # Clean up common Hindi words from city name
                 city_name = re.sub(r'\b(mein|में|ke|का|की|office|कार्यालय)\b', '', city_name, flags=re.IGNORECASE).strip()
                 if city_name:
-                    return self.get_city_specific_offices(city_name, language)
+                    return "city_offices", city_name
         
         # Handle scheme details requests
         if user_input_lower.startswith("details"):
-            scheme_id = user_input_lower.replace("details ", "").strip()
-            return self.show_scheme_details(scheme_id, language)
+            return "scheme_details", user_input_lower.replace("details ", "").strip()
         
         # Handle location services
         if ("near me" in user_input_lower or "office address" in user_input_lower or 
             user_input_lower == "offices near me"):
-            return self.provide_location_services(language)
+            return "location_services", None
         
-        # Regular conversation flow
-        if self.conversation_stage == "initial":
-            return self.handle_initial_query(user_input, language)
-        elif self.conversation_stage == "gathering_details":
-            return self.handle_detail_gathering(user_input, language)
-        elif self.conversation_stage == "recommendations":
-            return self.provide_smart_recommendations(language)
+        return None, None
+    
+    def start_llm_extraction(self, user_input, asked):
+        """After the regex pass: ask the LLM for the fields still missing, only if the asked one is among them"""
+        missing = self.get_missing_information()
+        if asked not in missing or not get_config().ENABLE_LLM_EXTRACTION:
+            return None
+        if not has_time_for("llm_extraction", get_config().MIN_STAGE_TIME):
+            return None
+        return llm_extractor.submit(user_input, missing, needed=(asked,))
+    
+    @traced("extraction.llm")
+    def finish_llm_extraction(self, extraction):
+        """Fill fields the regex extractor missed with what the LLM produced in time"""
+        if extraction is None:
+            return
+        missing = self.get_missing_information()
+        if not missing:
+            extraction.cancel()
+            return
+        with timed_stage("chat.extract.llm"):
+            self.user_profile.update(llm_extractor.collect(extraction, missing))
     
     def handle_initial_query(self, user_input, language):
         """Smart initial handling"""
+        missing = self.get_missing_information()
         self.extract_user_info_from_text(user_input.lower())
+        self.finish_llm_extraction(self.start_llm_extraction(user_input, missing[0] if missing else None))
         
         if "age" not in self.user_profile:
             self.conversation_stage = "gathering_details"
-            return self.get_smart_response("age", language)
         
         return self.continue_questioning(language)
     
@@ -405,9 +497,13 @@ class EnhancedConversationEngine:
         
         for field in question_sequence:
             if field not in self.user_profile:
+                if field != self.last_question:
+                    self.last_question = field
+                    track("question_asked", field)
                 return self.get_smart_response(field, language)
         
         self.conversation_stage = "recommendations"
+        track("questions_completed")
         return self.provide_smart_recommendations(language)
     
     def handle_detail_gathering(self, user_input, language):
@@ -430,6 +526,7 @@ class EnhancedConversationEngine:
                     1 <= family_size <= 20):
                     self.user_profile["family_size"] = family_size
         
+        self.finish_llm_extraction(self.start_llm_extraction(user_input, current_field))
         return self.continue_questioning(language)
     
     def get_missing_information(self):
@@ -442,22 +539,14 @@ class EnhancedConversationEngine:
         """Provide clean, scannable recommendations"""
         matching_schemes = self.find_matching_schemes()
         
+        pack = pack_for(language)
         if not matching_schemes:
-            if language == "हिंदी":
-                return "आपकी प्रोफ़ाइल से मेल खाने वाली कोई योजना नहीं मिली।"
-            else:
-                return "No schemes found matching your profile."
+            return pack.text("no_schemes")
         
-        if language == "हिंदी":
-            response = """🎯 **बहुत बढ़िया! आपके लिए सबसे अच्छी सरकारी योजनाएं मिल गईं!**
-
-नीचे दिए गए कार्ड पर क्लिक करके किसी भी योजना की पूरी जानकारी देखें। 👇"""
-        else:
-            response = """🎯 **Perfect! Found the best government schemes for you!**
-
-Click on any card below to see complete details for that scheme. 👇"""
+        for scheme in matching_schemes:
+            track("recommendation", scheme_key(scheme))
         
-        return response
+        return pack.text("recommendations_intro")
     
     def show_scheme_details(self, scheme_number, language):
         """Show detailed information for specific scheme"""
@@ -467,113 +556,71 @@ Click on any card below to see complete details for that scheme. 👇"""
             matching_schemes = self.find_matching_schemes()
             
             if scheme_index >= len(matching_schemes):
-                if language == "हिंदी":
-                    return "गलत योजना नंबर। कृपया फिर से कोशिश करें।"
-                else:
-                    return "Invalid scheme number. Please try again."
+                return pack_for(language).text("invalid_scheme_number")
             
             scheme = matching_schemes[scheme_index]
-            
-            if language == "हिंदी":
-                benefit_summary = scheme['benefit_summary_hindi']
-                eligibility_summary = scheme['eligibility_summary_hindi']
-                quick_docs = scheme['quick_docs_hindi']
-                
-                return f"""
-## 📋 {scheme['name_hindi']} - पूरी जानकारी
-
-**💰 वित्तीय लाभ:**
-{benefit_summary} (कुल: ₹{scheme['benefit_amount']:,})
-
-**✅ पात्रता:**
-{eligibility_summary}
-
-**📄 आवश्यक दस्तावेज:**
-{', '.join(quick_docs)}
-
-**🌐 आवेदन कैसे करें:**
-1. वेबसाइट पर जाएं: {scheme['website']}
-2. 'नया पंजीकरण' पर क्लिक करें
-3. आधार OTP से फॉर्म भरें
-4. दस्तावेज अपलोड करें (PDF, अधिकतम 200KB)
-5. सबमिट करें और रेफरेंस नंबर सेव करें
-
-**📞 सहायता:**
-• हेल्पलाइन: {scheme['helpline']} (टोल-फ्री)
-• समय: सुबह 9 से शाम 6 बजे
-• ईमेल: support@{scheme['website']}
-
-**⏰ समयसीमा:**
-• प्रोसेसिंग: 15-30 दिन
-• पहला भुगतान: अप्रूवल के 2-3 महीने बाद
-
-**💡 सुझाव:**
-• योजना की डेडलाइन में आवेदन करें (मार्च/सितंबर)
-• मोबाइल नंबर आधार से लिंक रखें
-• आवेदन कन्फर्मेशन का स्क्रीनशॉट लें
-
-*नजदीकी आवेदन केंद्र खोजने के लिए 'offices near me' लिखें*
-                """
-            else:
-                benefit_summary = scheme['benefit_summary_english']
-                eligibility_summary = scheme['eligibility_summary_english']
-                quick_docs = scheme['quick_docs_english']
-                
-                return f"""
-## 📋 {scheme['name_english']} - Complete Details
-
-**💰 Financial Benefit:**
-{benefit_summary} (Total: ₹{scheme['benefit_amount']:,})
-
-**✅ Eligibility:**
-{eligibility_summary}
-
-**📄 Required Documents:**
-{', '.join(quick_docs)}
-
-**🌐 How to Apply:**
-1. Visit: {scheme['website']}
-2. Click 'New Registration'
-3. Fill form with Aadhaar OTP
-4. Upload documents (PDF, max 200KB each)
-5. Submit and save reference number
-
-**📞 Help & Support:**
-• Helpline: {scheme['helpline']} (Toll-free)
-• Timings: 9 AM to 6 PM
-• Email: support@{scheme['website']}
-
-**⏰ Timeline:**
-• Processing: 15-30 days
-• First payment: 2-3 months after approval
-
-**💡 Pro Tips:**
-• Apply during scheme deadlines (March/September)
-• Keep mobile number linked with Aadhaar
-• Take screenshots of application confirmation
-
-*Type 'offices near me' to find local application centers*
-                """
-        except:
-            if language == "हिंदी":
-                return "कृपया सही योजना नंबर बताएं (1, 2, या 3)।"
-            else:
-                return "Please specify a valid scheme number (1, 2, or 3)."
+            track("scheme_details", scheme_key(scheme))
+            return self.scheme_page(scheme, language)["detail"]
+        except ValueError:
+            return pack_for(language).text("scheme_number_help")
+        except Exception as e:
+            count_error("scheme_details")
+            print(f"Could not show scheme details: {e}")
+            return pack_for(language).text("scheme_number_help")
+    
+    def record_feedback(self, scheme, kind):
+        """Record 👍, 👎 or "applied" for a recommended scheme; a new vote replaces the old one"""
+        store = get_feedback_store()
+        key = scheme_key(scheme)
+        given = self.feedback.setdefault(key, [])
+        if store is None or kind in given:
+            return False
+        
+        bucket = profile_bucket(self.user_profile)
+        if kind in ("up", "down"):
+            for previous in [k for k in given if k in ("up", "down")]:
+                store.record(key, bucket, previous, self.session_id, delta=-1)
+                given.remove(previous)
+        store.record(key, bucket, kind, self.session_id)
+        given.append(kind)
+        return True
     
+    @traced("get_user_location")
     def get_user_location(self):
         """Get user's approximate location for local office addresses"""
+        cached = location_cache.get("ipapi")
+        if cached is not None:
+            return cached
+        # Without time for the lookup, fall through to asking for the city
+        if not has_time_for("ip_location", get_config().MIN_STAGE_TIME):
+            return None
         try:
-            response = requests.get('https://ipapi.co/json/', timeout=5)
+            return ipapi_flight.do("ipapi", self.fetch_user_location, wait_timeout=wait_timeout())
+        except TimeoutError:
+            mark_degraded("ip_location")
+            return None
+    
+    @timed("ip_location")
+    @traced("http.ipapi")
+    def fetch_user_location(self):
+        """Query ipapi.co for the approximate location"""
+        try:
+            response = ipapi_breaker.call(requests.get, get_config().IPAPI_URL,
+                                          timeout=clamp_timeout(ipapi_breaker.current_timeout()),
+                                          is_failure=is_server_error)
             if response.status_code == 200:
                 data = response.json()
-                return {
+                location = {
                     'city': data.get('city', 'Unknown'),
                     'state': data.get('region', 'Unknown'),
                     'country': data.get('country_name', 'India'),
                     'latitude': data.get('latitude'),
                     'longitude': data.get('longitude')
                 }
+                location_cache.set("ipapi", location)
+                return location
         except Exception as e:
+            count_error("ip_location")
             return {
                 'city': 'Delhi',
                 'state': 'Delhi',
@@ -583,248 +630,272 @@ Click on any card below to see complete details for that scheme. 👇"""
     
     def get_city_specific_offices(self, city_name, language):
         """Get offices for a specific city mentioned by user"""
+        return "".join(self.get_city_specific_offices_stream(city_name, language))
+    
+    def get_city_specific_offices_stream(self, city_name, language):
+        """Yield the header at once, then each office as its lookup completes"""
         
-        city_state_map = {
-            'mumbai': 'Maharashtra', 'delhi': 'Delhi', 'bangalore': 'Karnataka',
-            'chennai': 'Tamil Nadu', 'kolkata': 'West Bengal', 'hyderabad': 'Telangana',
-            'pune': 'Maharashtra', 'ahmedabad': 'Gujarat', 'jaipur': 'Rajasthan',
-            'lucknow': 'Uttar Pradesh', 'kanpur': 'Uttar Pradesh', 'nagpur': 'Maharashtra',
-            'indore': 'Madhya Pradesh', 'thane': 'Maharashtra', 'bhopal': 'Madhya Pradesh',
-            'visakhapatnam': 'Andhra Pradesh', 'pimpri': 'Maharashtra', 'patna': 'Bihar',
-            'vadodara': 'Gujarat', 'ghaziabad': 'Uttar Pradesh', 'ludhiana': 'Punjab',
-            'agra': 'Uttar Pradesh', 'nashik': 'Maharashtra', 'faridabad': 'Haryana',
-            'meerut': 'Uttar Pradesh', 'rajkot': 'Gujarat', 'kalyan': 'Maharashtra'
-        }
+        state = self.CITY_STATE_MAP.get(city_name.lower(), city_name)
+        pack = pack_for(language)
+        track("office_lookup", city_name)
         
-        state = city_state_map.get(city_name.lower(), city_name)
-        offices = self.get_local_offices(city_name, state)
+        yield pack.text("city_offices_header", city=city_name, state=state)
         
-        if language == "English":
-            response = f"**🏢 Government Offices in {city_name}, {state}:**\n\n"
-            for i, office in enumerate(offices, 1):
-                response += f"{i}. {office}\n"
-            
-            response += f"""
-**📱 For Exact Locations:**
-• Google Maps: Search "{offices[0]}"
-• Phone Directory: Call 1800-180-1551
-• State Portal: Search "{state} government offices"
-
-**🚀 Quick Tips for {city_name}:**
-• Best time to visit: 11 AM - 3 PM (less crowded)
-• Carry: All originals + 2 photocopies
-• Parking: Most offices have visitor parking
-
-**📞 {city_name} Helplines:**
-• General Govt Info: 100
-• District Administration: 1800-180-1551
-• Aadhaar Support: 1947
-            """
-        else:
-            response = f"**🏢 {city_name}, {state} में सरकारी कार्यालय:**\n\n"
-            for i, office in enumerate(offices, 1):
-                response += f"{i}. {office}\n"
-            
-            response += f"""
-**📱 सटीक स्थान के लिए:**
-• Google Maps: "{offices[0]}" खोजें
-• फोन डायरेक्टरी: 1800-180-1551 पर कॉल करें
-• राज्य पोर्टल: "{state} सरकारी कार्यालय" खोजें
-
-**🚀 {city_name} के लिए त्वरित सुझाव:**
-• जाने का बेस्ट समय: 11 AM - 3 PM (कम भीड़)
-• साथ लेकर जाएं: सभी मूल + 2 फोटोकॉपी
-• पार्किंग: ज्यादातर कार्यालयों में विजिटर पार्किंग है
-
-**📞 {city_name} हेल्पलाइन:**
-• सामान्य सरकारी जानकारी: 100
-• जिला प्रशासन: 1800-180-1551
-• आधार सपोर्ट: 1947
-            """
+        offices = []
+        for office in self.iter_real_government_offices(city_name, state):
+            offices.append(office)
+            yield f"{len(offices)}. {office}\n"
         
-        return response
+        yield pack.text("city_offices_tips", office=offices[0], city=city_name, state=state)
 
-    def get_real_government_offices(self, city, state):
-        """Get real government office locations using OpenStreetMap Nominatim API"""
+    def lookup_office_address(self, query):
+        """Single Nominatim lookup; concurrent identical queries share one request"""
+        with span("nominatim", query=query) as lookup:
+            if not has_time_for("geocoding", get_config().MIN_STAGE_TIME):
+                lookup.set("skipped", "no_time")
+                return None
+            try:
+                address = nominatim_flight.do(query, self.fetch_office_address, query,
+                                              wait_timeout=wait_timeout())
+            except TimeoutError:
+                mark_degraded("geocoding")
+                lookup.set("skipped", "timeout")
+                return None
+            if address is None:
+                has_time_for("geocoding")  # tags the turn if the lookup ran out the budget
+            lookup.set("found", address is not None)
+            return address
+    
+    @timed("geocoding")
+    @traced("http.nominatim")
+    def fetch_office_address(self, query):
+        """Query Nominatim; returns a short address or None"""
         try:
-            # Search for government offices in the city
-            search_queries = [
-                f"District Collector Office {city} {state} India",
-                f"Tehsildar Office {city} {state} India", 
-                f"Block Development Office {city} {state} India",
-                f"Municipal Corporation {city} {state} India"
-            ]
+            # Using Nominatim API (free OpenStreetMap service)
+            url = get_config().NOMINATIM_URL
+            params = {
+                'q': query,
+                'format': 'json',
+                'limit': 1,
+                'countrycodes': 'in',
+                'addressdetails': 1
+            }
             
-            offices = []
-            
-            for query in search_queries:
-                try:
-                    # Using Nominatim API (free OpenStreetMap service)
-                    url = f"https://nominatim.openstreetmap.org/search"
-                    params = {
-                        'q': query,
-                        'format': 'json',
-                        'limit': 1,
-                        'countrycodes': 'in',
-                        'addressdetails': 1
-                    }
-                    
-                    response = requests.get(url, params=params, timeout=3, 
-                                          headers={'User-Agent': 'SaarthakAI/1.0'})
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data:
-                            place = data[0]
-                            address = place.get('display_name', '')
-                            # Clean up the address
-                            if address:
-                                # Extract relevant parts
-                                address_parts = address.split(',')
-                                clean_address = ', '.join(address_parts[:3])
-                                offices.append(clean_address)
-                except:
-                    continue
-                    
-            # If API calls fail, fallback to template offices
-            if not offices:
-                offices = [
-                    f"District Collector Office, {city}, {state}",
-                    f"Municipal Corporation, {city}, {state}",
-                    f"Tehsil Office, {city}, {state}"
-                ]
-                
-            return offices[:3]  # Return top 3
+            # Breaker fails fast while Nominatim is down and picks the timeout
+            response = nominatim_breaker.call(requests.get, url, params=params,
+                                              headers={'User-Agent': 'SaarthakAI/1.0'},
+                                              timeout=clamp_timeout(nominatim_breaker.current_timeout()),
+                                              is_failure=is_server_error)
             
+            if response.status_code == 200:
+                data = response.json()
+                if data:
+                    place = data[0]
+                    address = place.get('display_name', '')
+                    # Clean up the address
+                    if address:
+                        # Extract relevant parts
+                        address_parts = address.split(',')
+                        return ', '.join(address_parts[:3])
         except Exception as e:
-            # Fallback to manual addresses
-            return [
+            count_error("geocoding")
+        return None
+    
+    def iter_real_government_offices(self, city, state):
+        """Yield up to 3 office locations as each Nominatim lookup completes"""
+        # Search for government offices in the city
+        search_queries = [
+            f"District Collector Office {city} {state} India",
+            f"Tehsildar Office {city} {state} India", 
+            f"Block Development Office {city} {state} India",
+            f"Municipal Corporation {city} {state} India"
+        ]
+        
+        cached = office_cache.get(office_key(city, state))
+        if cached is not None:
+            yield from cached
+            return
+        
+        found = []
+        for query in search_queries:
+            address = self.lookup_office_address(query)
+            if address:
+                found.append(address)
+                yield address
+                if len(found) == 3:  # Return top 3
+                    break
+        
+        if found:
+            office_cache.set(office_key(city, state), found)
+        else:
+            # If API calls fail, fallback to template offices
+            yield from [
                 f"District Collector Office, {city}, {state}",
                 f"Municipal Corporation, {city}, {state}",
                 f"Tehsil Office, {city}, {state}"
             ]
     
+    def get_real_government_offices(self, city, state):
+        """Get real government office locations using OpenStreetMap Nominatim API"""
+        return list(self.iter_real_government_offices(city, state))
+    
     def get_local_offices(self, city, state, scheme_type="general"):
         """Legacy method - redirects to new method for backward compatibility"""
         return self.get_real_government_offices(city, state)
     
     def provide_location_services(self, language):
         """Provide location-specific office information"""
+        return "".join(self.provide_location_services_stream(language))
+    
+    def provide_location_services_stream(self, language):
+        """Yield static tips immediately, then offices as lookups complete"""
+        pack = pack_for(language)
+        
+        yield pack.text("travel_tips")
         
         location_data = self.get_user_location()
         
         if location_data and location_data.get('city') != 'Unknown':
             city = location_data.get('city', 'Delhi')
             state = location_data.get('state', 'Delhi')
+            track("office_lookup", city)
             
-            offices = self.get_real_government_offices(city, state)
+            yield pack.text("offices_near_you", city=city, state=state)
             
-            if language == "हिंदी":
-                response = f"""
-**🏢 आपके नजदीक सरकारी कार्यालय ({city}, {state}):**
-
-"""
-                for i, office in enumerate(offices, 1):
-                    response += f"**{i}.** {office}\n\n"
-                
-                response += f"""
-**📱 त्वरित सहायता:**
-
-• **सटीक दिशा:** Google Maps पर "{offices[0]}" खोजें
-• **फोन सहायता:** 1800-180-1551 (जिला हेल्पलाइन)
-• **ऑनलाइन सूची:** {state} सरकार पोर्टल देखें
-
-**💡 यात्रा के सुझाव:**
-
-• **CSC केंद्र** तेज़ होते हैं और कम इंतजार
-• सभी दस्तावेजों के **मूल + 2 फोटोकॉपी** लेकर जाएं
-• कम भीड़ के लिए **11 AM - 3 PM** के बीच जाएं
-                """
-            else:
-                response = f"""
-**🏢 Government Offices Near You ({city}, {state}):**
-
-"""
-                for i, office in enumerate(offices, 1):
-                    response += f"**{i}.** {office}\n\n"
-                
-                response += f"""
-**📱 Quick Assistance:**
-
-• **Exact Directions:** Search "{offices[0]}" on Google Maps
-• **Phone Support:** 1800-180-1551 (District Helpline)
-• **Complete List:** Visit {state} Government Portal
-
-**💡 Travel Tips:**
-
-• **CSC Centers** are faster with less waiting time
-• Carry **originals + 2 photocopies** of all documents
-• Visit during **11 AM - 3 PM** for shorter queues
-                """
+            offices = []
+            for office in self.iter_real_government_offices(city, state):
+                offices.append(office)
+                yield f"**{len(offices)}.** {office}\n\n"
+            
+            yield pack.text("quick_assistance", office=offices[0], state=state)
         else:
             # Set flag to indicate we're waiting for city input
             self.waiting_for_city = True
             
-            if language == "हिंदी":
-                response = """
-### 🏢 अपने नजदीक सरकारी कार्यालय खोजें:
+            yield pack.text("ask_city")
 
-**अपने शहर का नाम बताएं**, मैं सटीक कार्यालय खोजूंगा! 🎯
+@st.cache_resource
+def get_session_store():
+    """One session store per server process, shared by all browser sessions"""
+    config = get_config()
+    store = create_session_store(config)
+    SessionSweeper(store, get_history_spill(), interval=config.SESSION_SWEEP_INTERVAL).start()
+    register_sessions(store.stats)
+    return store
 
-*उदाहरण: "मुंबई", "दिल्ली", "जयपुर", "लखनऊ" लिखें*
+@st.cache_resource
+def get_history_spill():
+    """Disk spill for chat turns evicted from session memory"""
+    return HistorySpill(get_config().HISTORY_SPILL_DIR)
 
----
+@st.cache_resource
+def get_office_prefetcher():
+    """Shared background worker pool for office lookups"""
+    return OfficePrefetcher(max_workers=get_config().PREFETCH_WORKERS)
 
-### 📋 सामान्य कार्यालय प्रकार:
+def attach_engine(engine):
+    """Wire a session's engine to the prefetcher and start resolving its location"""
+    engine.session_id = st.session_state.session_id
+    if get_config().ENABLE_PREFETCH:
+        engine.prefetcher = get_office_prefetcher()
+        engine.prefetcher.prefetch_user_location(engine.session_id, engine)
+    return engine
 
-• **जिला कलेक्टर कार्यालय** - मुख्य प्रशासनिक केंद्र
-• **तहसील कार्यालय** - उप-जिला स्तर के आवेदन
-• **ब्लॉक विकास कार्यालय** - ग्रामीण योजना आवेदन
-• **कॉमन सर्विस सेंटर (CSC)** - डिजिटल सेवा केंद्र
+@st.cache_resource
+def get_busy_responder():
+    """Scheme engine whose canned answers stand in for limited or shed turns"""
+    return SaarthakConversationEngine()
 
-### 📞 सार्वभौमिक हेल्पलाइन:
+def guarded_query_stream(engine, prompt, language):
+    """Stream a turn unless the session is over RATE_LIMIT or the server is shedding load"""
+    if not allow_request(st.session_state.session_id):
+        yield get_busy_responder().get_busy_response(language, rate_limited=True)
+        return
+    if not admission.try_enter():
+        yield get_busy_responder().get_busy_response(language)
+        return
+    try:
+        yield from engine.process_query_stream(prompt, language)
+    finally:
+        admission.leave()
 
-• **सामान्य सरकारी जानकारी:** 1800-180-1551
-• **CSC लोकेटर:** 1800-121-3468
-• **आधार सहायता:** 1947
+def get_session_id():
+    """Stable session id carried in the URL so a reload or another replica can resume"""
+    session_id = st.query_params.get("sid")
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        st.query_params["sid"] = session_id
+    return session_id
 
-### 🌐 ऑनलाइन संसाधन:
+def save_session():
+    """Cap in-memory history, then persist the compact conversation state"""
+    config = get_config()
+    try:
+        kept, overflow = cap_history(st.session_state.enhanced_messages,
+                                     config.MAX_HISTORY_MESSAGES, config.SESSION_MEMORY_BUDGET)
+        if overflow:
+            get_history_spill().spill(st.session_state.session_id, overflow)
+            st.session_state.enhanced_messages = kept
+            st.session_state.spilled_messages = st.session_state.get("spilled_messages", 0) + len(overflow)
+        elif st.session_state.get("spilled_messages"):
+            get_history_spill().touch(st.session_state.session_id)
+        
+        get_session_store().save(st.session_state.session_id, {
+            "e": st.session_state.enhanced_engine.to_state(),
+            "m": pack_messages(st.session_state.enhanced_messages),
+            "l": st.session_state.current_lang,
+            "n": st.session_state.get("spilled_messages", 0)
+        })
+    except Exception as e:
+        count_error("session_store")
+        print(f"Could not save session: {e}")
 
-• Google Maps पर "[आपका शहर] जिला कलेक्टर कार्यालय" खोजें
-• अपनी राज्य सरकार की वेबसाइट देखें
-• नजदीकी केंद्रों के लिए 'जन औषधि' ऐप का उपयोग करें
-                """
-            else:
-                response = """
-### 🏢 Find Government Offices Near You:
+@st.cache_resource
+def get_metrics_server():
+    """Prometheus scrape endpoint (METRICS_HOST:METRICS_PORT/metrics) next to Streamlit"""
+    return start_metrics_server() if get_config().ENABLE_METRICS else None
 
-**Tell me your city name**, and I'll find exact offices! 🎯
+@st.cache_resource
+def get_page_chrome():
+    """Theme CSS and top header from static/, read once per process"""
+    static_dir = get_config().STATIC_DIR
+    css = (static_dir / "style.css").read_text(encoding="utf-8")
+    header = (static_dir / "header.html").read_text(encoding="utf-8")
+    return f"<style>\n{css}</style>\n\n{header}"
 
-*Example: Type "Mumbai", "Delhi", "Jaipur", "Lucknow"*
+@lru_cache(maxsize=512)
+def prepare_message_markdown(content):
+    """Rendered markdown for one message (engine responses carry template indentation)"""
+    return textwrap.dedent(content).strip()
 
----
-
-### 📋 Common Office Types:
-
-• **District Collector Office** - Main administrative center
-• **Tehsil Office** - Sub-district level applications  
-• **Block Development Office** - Rural scheme applications
-• **Common Service Center (CSC)** - Digital services hub
-
-### 📞 Universal Helplines:
-
-• **General Government Info:** 1800-180-1551
-• **CSC Locator:** 1800-121-3468  
-• **Aadhaar Help:** 1947
-
-### 🌐 Online Resources:
+def get_visible_history():
+    """Recent window of chat history, widened by 'load earlier' clicks"""
+    config = get_config()
+    messages = st.session_state.enhanced_messages
+    window = config.CHAT_PAGE_SIZE * st.session_state.get("history_pages", 1)
+    spilled = st.session_state.get("spilled_messages", 0)
+    
+    if window <= len(messages):
+        return messages[-window:], window < len(messages) or bool(spilled)
+    
+    # Reach into turns spilled to disk once the in-memory history is exhausted
+    if not spilled:
+        return messages, False
+    earlier = get_history_spill().load(st.session_state.session_id, limit=window - len(messages))
+    return earlier + messages, len(earlier) < spilled
 
-• Search "[Your City] District Collector Office" on Google Maps
-• Visit your state government website
-• Use 'Jan Aushadhi' app for nearest centers
-                """
-        
-        return response
+def render_chat_history(language):
+    """Render the recent chat window with a 'load earlier' control"""
+    visible, has_more = get_visible_history()
+    
+    if has_more:
+        if st.button(pack_for(language).text("load_earlier"), key="load_earlier"):
+            st.session_state.history_pages = st.session_state.get("history_pages", 1) + 1
+            st.rerun()
+    
+    for message in visible:
+        with st.chat_message(message["role"]):
+            st.markdown(prepare_message_markdown(message['content']))
 
 def main():
     st.set_page_config(
@@ -834,408 +905,36 @@ def main():
         initial_sidebar_state="collapsed"
     )
     
-    # Modern ChatGPT-like interface
-    st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-        
-        /* Reset and base styles */
-        .main .block-container {
-            padding: 0;
-            max-width: 100%;
-            font-family: 'Inter', sans-serif;
-        }
-        
-        /* Main app background */
-        .stApp {
-            background: #f7f7f8;
-        }
-        
-        /* Top header bar like ChatGPT */
-        .top-header {
-            background: white;
-            border-bottom: 1px solid #e5e5e5;
-            padding: 16px 24px;
-            position: sticky;
-            top: 0;
-            z-index: 100;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            box-shadow: 0 1px 2px rgba(0,0,0,0.05);
-        }
-        
-        .app-title {
-            font-size: 18px;
-            font-weight: 600;
-            color: #202123;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        
-        .language-selector {
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            font-size: 14px;
-        }
-        
-        /* Main chat container */
-        .chat-container {
-            max-width: 768px;
-            margin: 0 auto;
-            min-height: calc(100vh - 120px);
-            display: flex;
-            flex-direction: column;
-        }
-        
-        /* Welcome section */
-        .welcome-section {
-            text-align: center;
-            padding: 48px 24px;
-            max-width: 600px;
-            margin: 0 auto;
-        }
-        
-        .welcome-title {
-            font-size: 32px;
-            font-weight: 600;
-            color: #202123;
-            margin-bottom: 16px;
-        }
-        
-        .welcome-subtitle {
-            font-size: 16px;
-            color: #6b7280;
-            margin-bottom: 32px;
-            line-height: 1.5;
-        }
-        
-        /* Progress indicator */
-        .progress-indicator {
-            background: white;
-            border: 1px solid #e5e5e5;
-            border-radius: 12px;
-            padding: 16px;
-            margin: 16px 24px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .progress-info {
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            font-size: 14px;
-            color: #6b7280;
-        }
-        
-        .progress-badge {
-            background: #3b82f6;
-            color: white;
-            padding: 4px 8px;
-            border-radius: 20px;
-            font-size: 12px;
-            font-weight: 500;
-        }
-        
-        .progress-bar {
-            height: 4px;
-            background: #f3f4f6;
-            border-radius: 2px;
-            overflow: hidden;
-            margin: 8px 0;
-            width: 100%;
-        }
-        
-        .progress-fill {
-            height: 100%;
-            background: #3b82f6;
-            border-radius: 2px;
-            transition: width 0.3s ease;
-        }
-        
-        /* Chat messages area */
-        .messages-area {
-            flex: 1;
-            padding: 0 24px 24px 24px;
-            overflow-y: auto;
-        }
-        
-        /* Message bubbles like ChatGPT */
-        .stChatMessage {
-            margin: 0 0 24px 0;
-            padding: 0;
-        }
-        
-        .stChatMessage > div {
-            max-width: 100%;
-            margin: 0;
-            padding: 0;
-            background: transparent;
-            border: none;
-            box-shadow: none;
-        }
-        
-        /* Assistant messages */
-        .stChatMessage[data-testid="assistant-message"] {
-            background: transparent;
-        }
-        
-        .stChatMessage[data-testid="assistant-message"] > div {
-            background: transparent;
-            padding: 24px 0;
-            border-bottom: 1px solid #f0f0f0;
-        }
-        
-        .stChatMessage[data-testid="assistant-message"] > div > div {
-            background: transparent;
-            padding: 0;
-            max-width: 100%;
-        }
-        
-        /* User messages */
-        .stChatMessage[data-testid="user-message"] {
-            background: #f7f7f8;
-        }
-        
-        .stChatMessage[data-testid="user-message"] > div {
-            background: #f7f7f8;
-            padding: 24px 0;
-            border-bottom: 1px solid #f0f0f0;
-        }
-        
-        .stChatMessage[data-testid="user-message"] > div > div {
-            background: transparent;
-            padding: 0;
-            max-width: 100%;
-        }
-        
-        /* Message content styling */
-        .stChatMessage p {
-            margin: 0 0 12px 0;
-            font-size: 16px;
-            line-height: 1.6;
-            color: #374151;
-        }
-        
-        .stChatMessage strong {
-            font-weight: 600;
-            color: #111827;
-        }
-        
-        /* Input area */
-        .input-area {
-            position: sticky;
-            bottom: 0;
-            background: white;
-            border-top: 1px solid #e5e5e5;
-            padding: 16px 24px;
-        }
-        
-        .stChatInput > div {
-            max-width: 768px;
-            margin: 0 auto;
-            border: 1px solid #d1d5db;
-            border-radius: 12px;
-            background: white;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }
-        
-        .stChatInput > div:focus-within {
-            border-color: #3b82f6;
-            box-shadow: 0 0 0 3px rgba(59,130,246,0.1);
-        }
-        
-        .stChatInput input {
-            border: none;
-            background: transparent;
-            font-size: 16px;
-            padding: 12px 16px;
-            color: #374151;
-            font-family: 'Inter', sans-serif;
-        }
-        
-        .stChatInput input::placeholder {
-            color: #9ca3af;
-        }
-        
-        /* Language selector styling */
-        .stSelectbox {
-            min-width: 120px;
-        }
-        
-        .stSelectbox > div > div {
-            border: 1px solid #d1d5db;
-            border-radius: 8px;
-            background: white;
-            font-size: 14px;
-            min-height: 36px;
-        }
-        
-        .stSelectbox > div > div:focus-within {
-            border-color: #3b82f6;
-            box-shadow: 0 0 0 3px rgba(59,130,246,0.1);
-        }
-        
-        /* Scheme cards */
-        .stExpander {
-            background: white;
-            border: 1px solid #e5e5e5;
-            border-radius: 12px;
-            margin: 16px 0;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        
-        .stExpander > div:first-child {
-            background: #3b82f6;
-            color: white;
-            font-weight: 600;
-            padding: 16px 20px;
-            border: none;
-            font-size: 16px;
-        }
-        
-        .stExpander > div:last-child {
-            padding: 20px;
-            background: white;
-        }
-        
-        .stExpander svg {
-            color: white !important;
-        }
-        
-        /* Buttons */
-        .stButton > button {
-            background: #3b82f6;
-            color: white;
-            border: none;
-            border-radius: 8px;
-            padding: 8px 16px;
-            font-weight: 500;
-            font-size: 14px;
-            transition: background-color 0.2s;
-        }
-        
-        .stButton > button:hover {
-            background: #2563eb;
-        }
-        
-        /* Stats section */
-        .stats-section {
-            background: white;
-            border: 1px solid #e5e5e5;
-            border-radius: 12px;
-            padding: 20px;
-            margin: 16px 24px;
-            text-align: center;
-        }
-        
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 16px;
-            margin-top: 16px;
-        }
-        
-        .stat-item {
-            padding: 12px;
-            background: #f9fafb;
-            border-radius: 8px;
-        }
-        
-        .stat-value {
-            font-size: 20px;
-            font-weight: 600;
-            color: #3b82f6;
-        }
-        
-        .stat-label {
-            font-size: 12px;
-            color: #6b7280;
-            margin-top: 4px;
-        }
-        
-        /* Hide Streamlit elements */
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        header {visibility: hidden;}
-        .stDeployButton {display: none;}
-        
-        /* Responsive design */
-        @media (max-width: 768px) {
-            .top-header {
-                padding: 12px 16px;
-            }
-            
-            .chat-container {
-                margin: 0;
-            }
-            
-            .messages-area {
-                padding: 0 16px 16px 16px;
-            }
-            
-            .input-area {
-                padding: 12px 16px;
-            }
-            
-            .welcome-section {
-                padding: 32px 16px;
-            }
-            
-            .welcome-title {
-                font-size: 24px;
-            }
-            
-            .stats-grid {
-                grid-template-columns: 1fr;
-            }
-        }
-        
-        /* Scrollbar styling */
-        .messages-area::-webkit-scrollbar {
-            width: 4px;
-        }
-        
-        .messages-area::-webkit-scrollbar-track {
-            background: transparent;
-        }
-        
-        .messages-area::-webkit-scrollbar-thumb {
-            background: #d1d5db;
-            border-radius: 2px;
-        }
-        
-        .messages-area::-webkit-scrollbar-thumb:hover {
-            background: #9ca3af;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    get_metrics_server()
     
-    # Top header like ChatGPT
-    st.markdown("""
-    <div class="top-header">
-        <div class="app-title">
-            🚀 SaarthakAI
-        </div>
-        <div class="language-selector">
-            <span style="color: #6b7280; font-size: 14px;">Language:</span>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    # Modern ChatGPT-like interface and top header (static, read once per process)
+    st.markdown(get_page_chrome(), unsafe_allow_html=True)
+    
+    # Initialize engine (resume a stored session after restart or on another replica)
+    if "enhanced_engine" not in st.session_state:
+        st.session_state.session_id = get_session_id()
+        try:
+            stored = get_session_store().load(st.session_state.session_id)
+        except Exception as e:
+            count_error("session_store")
+            print(f"Could not load session: {e}")
+            stored = None
+        
+        if stored:
+            st.session_state.enhanced_engine = attach_engine(EnhancedConversationEngine.from_state(stored.get("e")))
+            st.session_state.enhanced_messages = unpack_messages(stored.get("m", []))
+            st.session_state.spilled_messages = stored.get("n", 0)
+            # Select the session's language before the selectbox exists, so resuming is not a language change
+            languages = list(AVAILABLE_PACKS.values())
+            st.session_state.current_lang = stored.get("l") if stored.get("l") in languages else languages[0]
+            st.session_state["lang"] = st.session_state.current_lang
+        else:
+            st.session_state.enhanced_engine = attach_engine(EnhancedConversationEngine())
     
     # Language selector in header
     col1, col2, col3 = st.columns([1, 1, 1])
     with col3:
-        language = st.selectbox("", ["English", "हिंदी"], key="lang", label_visibility="collapsed")
-    
-    # Initialize engine
-    if "enhanced_engine" not in st.session_state:
-        st.session_state.enhanced_engine = EnhancedConversationEngine()
+        language = st.selectbox("", list(AVAILABLE_PACKS.values()), key="lang", label_visibility="collapsed")
     
     # Progress indicator
     if len(st.session_state.enhanced_engine.user_profile) < 5:
@@ -1274,33 +973,23 @@ def main():
     
     # Initialize messages
     if "enhanced_messages" not in st.session_state or st.session_state.get("current_lang") != language:
-        welcome_msg = """Hello! I'm your smart assistant! 🚀
-
-I'll find **perfect schemes** for you by asking just **5 quick questions**.
-
-You can respond in **English, Hindi, or Hinglish**! 
-
-**What's your age?** 🎂
-*Examples: "25", "twenty five", "25 saal"*""" if language == "English" else """नमस्ते! मैं आपका स्मार्ट सहायक हूं! 🚀
-
-मैं सिर्फ **5 आसान सवाल** पूछकर **बेहतरीन योजनाएं** खोजूंगा।
-
-आप **हिंदी, English, या Hinglish** में जवाब दे सकते हैं!
-
-**आपकी उम्र क्या है?** 🎂
-*उदाहरण: "25", "पच्चीस", "25 years"*"""
+        welcome_msg = pack_for(language).text("welcome")
         
         st.session_state.enhanced_messages = [
             {"role": "assistant", "content": welcome_msg}
         ]
         st.session_state.current_lang = language
-        st.session_state.enhanced_engine = EnhancedConversationEngine()
+        if get_config().ENABLE_PREFETCH:
+            get_office_prefetcher().cancel_session(st.session_state.session_id)
+        st.session_state.enhanced_engine = attach_engine(EnhancedConversationEngine())
+        st.session_state.spilled_messages = 0
+        get_history_spill().delete(st.session_state.session_id)
     
-    # Messages area
+    # Messages area (only the most recent window is rendered on each rerun)
     st.markdown('<div class="messages-area">', unsafe_allow_html=True)
-    for message in st.session_state.enhanced_messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message['content'])
+    render_chat_history(language)
+    if get_config().DEBUG and st.session_state.enhanced_engine.last_trace_id:
+        st.caption(f"🔎 trace {st.session_state.enhanced_engine.last_trace_id}")
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Scheme recommendations
@@ -1310,44 +999,41 @@ You can respond in **English, Hindi, or Hinglish**!
         matching_schemes = st.session_state.enhanced_engine.find_matching_schemes()
         
         if matching_schemes:
+            pack = pack_for(language)
             for i, scheme in enumerate(matching_schemes[:3]):
-                if language == "हिंदी":
-                    benefit_summary = scheme['benefit_summary_hindi']
-                    eligibility_summary = scheme['eligibility_summary_hindi']
-                    quick_docs = scheme['quick_docs_hindi']
-                    scheme_name = scheme['name_hindi']
-                else:
-                    benefit_summary = scheme['benefit_summary_english']
-                    eligibility_summary = scheme['eligibility_summary_english']
-                    quick_docs = scheme['quick_docs_english']
-                    scheme_name = scheme['name_english']
+                page = st.session_state.enhanced_engine.scheme_page(scheme, language)
                 
-                with st.expander(f"💰 **{i+1}. {scheme_name}**"):
-                    st.markdown(f"""
-                    **💰 {'लाभ' if language == 'हिंदी' else 'Benefit'}:**
-                    {benefit_summary}
-                    
-                    **👥 {'पात्रता' if language == 'हिंदी' else 'Eligibility'}:**
-                    {eligibility_summary}
-                    
-                    **📄 {'दस्तावेज' if language == 'हिंदी' else 'Documents'}:**
-                    {', '.join(quick_docs[:2])} + more
-                    
-                    **🌐 {'संपर्क' if language == 'हिंदी' else 'Contact'}:**
-                    Website: {scheme['website']}  
-                    Helpline: {scheme['helpline']}
-                    """)
+                with st.expander(f"💰 **{i+1}. {page['name']}**"):
+                    st.markdown(page["card"])
                     
                     col1, col2 = st.columns(2)
                     with col1:
-                        if st.button(f"📋 {'पूरी जानकारी' if language == 'हिंदी' else 'Full Details'}", key=f"details_{i}"):
+                        if st.button(f"📋 {pack.text('full_details')}", key=f"details_{i}"):
                             # Show complete scheme details
                             details_response = st.session_state.enhanced_engine.show_scheme_details(str(i+1), language)
                             st.session_state.enhanced_messages.append({"role": "assistant", "content": details_response})
+                            save_session()
                             st.rerun()
                     with col2:
-                        if st.button(f"📞 {'संपर्क करें' if language == 'हिंदी' else 'Contact'}", key=f"contact_{i}"):
+                        if st.button(f"📞 {pack.text('contact')}", key=f"contact_{i}"):
                             st.info(f"📱 Call: {scheme['helpline']}")
+                    
+                    feedback_store = get_feedback_store()
+                    if feedback_store is not None:
+                        engine = st.session_state.enhanced_engine
+                        given = engine.feedback.get(scheme_key(scheme), [])
+                        buttons = (("up", "👍"), ("down", "👎"), ("applied", f"✅ {pack.text('applied')}"))
+                        for column, (kind, label) in zip(st.columns(3), buttons):
+                            with column:
+                                if st.button(label, key=f"{kind}_{i}", disabled=kind in given,
+                                             type="primary" if kind in given else "secondary"):
+                                    engine.record_feedback(scheme, kind)
+                                    save_session()
+                                    st.rerun()
+                        
+                        helpful = feedback_store.counts(scheme_key(scheme), profile_bucket(engine.user_profile)).get("up", 0)
+                        if helpful:
+                            st.caption(pack.text("helpful_count", count=helpful))
     
     # Stats section
     if len(st.session_state.enhanced_engine.user_profile) >= 5:
@@ -1375,15 +1061,21 @@ You can respond in **English, Hindi, or Hinglish**!
     
     # Input area at bottom
     st.markdown('<div class="input-area">', unsafe_allow_html=True)
-    placeholder = "Type your answer..." if language == "English" else "अपना जवाब टाइप करें..."
+    placeholder = pack_for(language).text("chat_placeholder")
     
     if prompt := st.chat_input(placeholder):
         st.session_state.enhanced_messages.append({"role": "user", "content": prompt})
+        st.session_state.history_pages = 1
+        
+        with st.chat_message("user"):
+            st.markdown(prompt)
         
-        with st.spinner("🔍 Finding schemes..." if language == "English" else "🔍 योजनाएं खोज रहा हूं..."):
-            response = st.session_state.enhanced_engine.process_query(prompt, language)
+        # Stream sections as they become ready instead of waiting behind a spinner
+        with st.chat_message("assistant"):
+            response = st.write_stream(guarded_query_stream(st.session_state.enhanced_engine, prompt, language))
             st.session_state.enhanced_messages.append({"role": "assistant", "content": response})
         
+        save_session()
         st.rerun()
     
     st.markdown('</div>', unsafe_allow_html=True)
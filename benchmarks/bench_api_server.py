@@ -0,0 +1,108 @@
+# benchmarks/bench_api_server.py - Requests/sec: headless API vs Streamlit script reruns
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.api_server import SaarthakAPIServer
+
+# Five answers that walk the guided flow without touching the network
+CONVERSATION = ["25", "farmer", "village", "2 lakh", "4"]
+
+
+async def post_json(reader, writer, path, payload):
+    """Send one keep-alive POST and return the decoded JSON body"""
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+    await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(await reader.readexactly(length))
+
+
+async def run_client(host, port, conversations):
+    """Drive complete conversations over one connection"""
+    reader, writer = await asyncio.open_connection(host, port)
+    turns = 0
+    for _ in range(conversations):
+        session_id = None
+        for message in CONVERSATION:
+            result = await post_json(reader, writer, "/v1/chat",
+                                     {"session_id": session_id, "message": message})
+            session_id = result["session_id"]
+            turns += 1
+        await post_json(reader, writer, "/v1/query", {"message": "kisan yojana", "language": "hindi"})
+        turns += 1
+    writer.close()
+    return turns
+
+
+async def bench_api(clients, conversations):
+    # Measuring capacity: every client shares 127.0.0.1, so per-IP limiting is off
+    server = SaarthakAPIServer(port=0, rate_limited=False)
+    await server.start()
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            run_client(server.host, server.port, conversations) for _ in range(clients)
+        ])
+        elapsed = time.perf_counter() - start
+    finally:
+        server.close()
+    turns = sum(results)
+    return {"path": "api", "requests": turns, "seconds": round(elapsed, 3),
+            "requests_per_sec": round(turns / elapsed, 1)}
+
+
+def bench_streamlit(conversations):
+    """Same flow through Streamlit's script runner (one full rerun per turn)"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return {"path": "streamlit", "skipped": "streamlit.testing not available"}
+
+    turns = 0
+    start = time.perf_counter()
+    for _ in range(conversations):
+        app = AppTest.from_file(str(ROOT / "app.py"), default_timeout=30).run()
+        for message in CONVERSATION:
+            app.chat_input[0].set_value(message).run()
+            turns += 1
+    elapsed = time.perf_counter() - start
+    return {"path": "streamlit", "requests": turns, "seconds": round(elapsed, 3),
+            "requests_per_sec": round(turns / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50, help="concurrent API connections")
+    parser.add_argument("--conversations", type=int, default=20, help="conversations per client")
+    parser.add_argument("--streamlit-conversations", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [
+        asyncio.run(bench_api(args.clients, args.conversations)),
+        bench_streamlit(args.streamlit_conversations),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# benchmarks/bench_llm_batching.py - LLM extraction throughput and p99: micro-batching vs one call per request
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.stub_ollama import StubOllama
+from src.circuit_breaker import CircuitBreaker
+from src.llm_batcher import Job
+from src.llm_extractor import FIELD_PATTERNS, Extraction, OllamaExtractor
+
+# Answers real sessions repeat a lot, plus free text that is mostly unique
+COMMON_MESSAGES = ["gaon", "shahar", "2 lakh", "kisan hun", "4", "main 30 saal ka hun", "naukri karta hun"]
+FIELDS = tuple(FIELD_PATTERNS)
+
+
+class OneCallPerRequest(OllamaExtractor):
+    """Baseline: every session opens its own streaming request, no sharing or queueing"""
+
+    def submit(self, text, fields, wait=None):
+        extraction = Extraction(fields, deadline=time.monotonic() + wait)
+        job = Job(uuid.uuid4().hex, text)
+        job.waiters.append(extraction)
+        threading.Thread(target=self._call, args=(job,), daemon=True).start()
+        return extraction
+
+    def _call(self, job):
+        try:
+            self.run_job(requests.Session(), job)
+        finally:
+            for waiter in job.waiters:
+                waiter.ready.set()
+                waiter.finished.set()
+
+
+def make_extractor(cls, stub, connections):
+    # A private breaker so an overloaded baseline cannot trip the other run
+    breaker = CircuitBreaker("bench", max_timeout=30, failure_threshold=10 ** 6)
+    extractor = cls(base_url=stub.url, connections=connections, breaker=breaker, cache=None)
+    extractor.health.refresh()
+    return extractor
+
+
+def message_stream(rng, repeat_share):
+    while True:
+        if rng.random() < repeat_share:
+            yield rng.choice(COMMON_MESSAGES)
+        else:
+            yield f"main {rng.randint(18, 80)} saal ka hun, {uuid.uuid4().hex[:6]}"
+
+
+def run_sessions(extractor, sessions, turns, wait, repeat_share, seed):
+    """Each session sends `turns` messages back to back and waits up to `wait` for each"""
+    latencies = []
+    filled = [0]
+    lock = threading.Lock()
+
+    def session(index):
+        rng = random.Random(seed + index)
+        messages = message_stream(rng, repeat_share)
+        for _ in range(turns):
+            start = time.perf_counter()
+            extraction = extractor.submit(next(messages), FIELDS, wait=wait)
+            found = extractor.collect(extraction, FIELDS)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                filled[0] += bool(found)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1)
+
+    return {
+        "requests": len(latencies),
+        "answered_in_time": filled[0],
+        "seconds": round(elapsed, 3),
+        "answered_per_sec": round(filled[0] / elapsed, 2),
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=32, help="concurrent sessions")
+    parser.add_argument("--turns", type=int, default=10, help="messages per session")
+    parser.add_argument("--parallel", type=int, default=4, help="stub model slots (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds per streamed chunk")
+    parser.add_argument("--wait", type=float, default=1.2, help="per-request deadline (LLM_EXTRACTION_WAIT)")
+    parser.add_argument("--repeat-share", type=float, default=0.5, help="share of messages from the common set")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = []
+    for name, cls in (("one_call_per_request", OneCallPerRequest), ("micro_batched", OllamaExtractor)):
+        stub = StubOllama(parallel=args.parallel, token_delay=args.token_delay).start()
+        try:
+            extractor = make_extractor(cls, stub, args.parallel)
+            result = run_sessions(extractor, args.sessions, args.turns, args.wait, args.repeat_share, args.seed)
+            result.update({"path": name, "model_generations": stub.generations})
+            if cls is OllamaExtractor:
+                result["batching"] = extractor.batcher.stats()
+            results.append(result)
+        finally:
+            stub.stop()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# benchmarks/bench_pipeline.py - Extraction, matching and rendering microbenchmarks with JSON results and regression checks
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import generate_messages, generate_sentences, scale_guided_schemes, scale_schemes
+from benchmarks.stub_geo import StubGeo
+from config import get_config
+
+SCHEME_SIZES = (7, 100, 1000, 10000)
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+# Allowed slowdown per case before --compare fails; anything touching sockets is noisier
+DEFAULT_THRESHOLD = 0.25
+THRESHOLDS = {"get_city_specific_offices[uncached]": 0.5}
+
+
+def measure(func, inputs, min_time: float, repeat: int):
+    """Microseconds per call: median and best of `repeat` runs of at least `min_time` seconds each"""
+    runs = []
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            for args in inputs:
+                func(*args)
+            calls += len(inputs)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        runs.append(elapsed / calls * 1e6)
+    return {"median_us": round(statistics.median(runs), 3), "best_us": round(min(runs), 3), "calls": calls}
+
+
+def build_cases(sizes, seed: int):
+    """(name, callable, inputs) for every benchmark; engines are set up outside the timed calls"""
+    from app import EnhancedConversationEngine
+    from src.conversation_engine import SaarthakConversationEngine
+    from src.scheme_render import build_scheme_pages, build_scheme_summaries
+
+    chat = EnhancedConversationEngine()
+    query_engine = SaarthakConversationEngine()
+    query_engine.response_cache = None
+
+    messages = generate_messages(500, seed)
+    sentences = generate_sentences(500, seed)
+    texts = [(message,) for _, _, message in messages]
+    keyword_lists = list(chat.language_patterns["profession_keywords"].values())
+
+    def extract(text):
+        chat.user_profile = {}
+        chat.extract_user_info_from_text(text)
+
+    cases = [
+        ("normalize_text", chat.normalize_text, texts),
+        ("fuzzy_match_keywords", chat.fuzzy_match_keywords,
+         [(text, keyword_lists[i % len(keyword_lists)]) for i, text in enumerate(sentences)]),
+        ("extract_numbers_with_context", chat.extract_numbers_with_context,
+         [(message,) for _, field, message in messages if field in ("age", "family")]),
+        ("extract_income_amount", chat.extract_income_amount,
+         [(message,) for _, field, message in messages if field == "income"]),
+        ("extract_user_info_from_text", extract, [(sentence,) for sentence in sentences]),
+    ]
+
+    guided_base = chat.load_schemes()
+    query_base = query_engine.load_schemes_database()
+    profiles = [{"profession": "farmer", "annual_income": 150000, "location": "rural", "age": 40},
+                {"profession": "student", "annual_income": 90000, "location": "urban", "age": 20}]
+    queries = [(message, query_engine.extract_user_info(message))
+               for _, field, message in messages if field in ("query", "profession")]
+
+    for size in sizes:
+        guided = scale_guided_schemes(guided_base, size, seed)
+        chat_at_size = EnhancedConversationEngine()
+        chat_at_size.schemes_database = guided
+        chat_at_size.scheme_pages = build_scheme_pages(guided.values())
+
+        def match_guided(profile, engine=chat_at_size):
+            engine.user_profile = profile
+            return engine.find_matching_schemes()
+
+        def scheme_details(profile, number, language, engine=chat_at_size):
+            engine.user_profile = profile
+            return engine.show_scheme_details(number, language)
+
+        schemes = scale_schemes(query_base, size, seed)
+        query_at_size = SaarthakConversationEngine()
+        query_at_size.response_cache = None
+        query_at_size.schemes_data = schemes
+        query_at_size.scheme_summaries = build_scheme_summaries(schemes)
+
+        cases += [
+            (f"app.find_matching_schemes[n={size}]", match_guided, [(profile,) for profile in profiles]),
+            (f"engine.find_matching_schemes[n={size}]", query_at_size.find_matching_schemes, queries),
+            (f"show_scheme_details[n={size}]", scheme_details,
+             [(profile, "1", language) for profile in profiles for language in ("English", "Hindi")]),
+        ]
+    return chat, cases
+
+
+def office_cases(chat, latency: float):
+    """get_city_specific_offices against a local Nominatim stub, with and without the office cache"""
+    from src.geo_cache import office_cache, office_key
+
+    stub = StubGeo(latency=latency).start()
+    get_config().NOMINATIM_URL = stub.nominatim_url
+    cities = [("Lucknow", "English"), ("Patna", "Hindi"), ("Indore", "English")]
+
+    def uncached(city, language):
+        office_cache.pop(office_key(city, chat.CITY_STATE_MAP[city.lower()]))
+        return chat.get_city_specific_offices(city, language)
+
+    return stub, [
+        ("get_city_specific_offices[uncached]", uncached, cities),
+        ("get_city_specific_offices[cached]", chat.get_city_specific_offices, cities),
+    ]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline, threshold: float):
+    """Print each case against the baseline; returns the names slower than their threshold"""
+    regressions = []
+    print(f"{'case':<44}{'baseline':>12}{'now':>12}{'change':>9}  (median µs/call)")
+    for name, row in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<44}{'-':>12}{row['median_us']:>12.3f}{'new':>9}")
+            continue
+        change = row["median_us"] / before["median_us"] - 1 if before["median_us"] else 0.0
+        allowed = THRESHOLDS.get(name, threshold)
+        flag = "  REGRESSION" if change > allowed else ""
+        print(f"{name:<44}{before['median_us']:>12.3f}{row['median_us']:>12.3f}{change:>+9.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for extraction, matching and rendering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SCHEME_SIZES), help="scheme DB sizes")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (median is reported)")
+    parser.add_argument("--filter", help="only cases whose name contains this")
+    parser.add_argument("--geo-latency", type=float, default=0.0, help="stub Nominatim latency in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help=f"results JSON (default {RESULTS_DIR.relative_to(ROOT)}/<commit>.json)")
+    parser.add_argument("--compare", help="baseline results JSON; exit 1 if a case regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction of the baseline median")
+    args = parser.parse_args()
+
+    chat, cases = build_cases(args.sizes, args.seed)
+    stub, offices = office_cases(chat, args.geo_latency)
+    cases += offices
+
+    results = {}
+    try:
+        for name, func, inputs in cases:
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = measure(func, inputs, args.min_time, args.repeat)
+            print(f"{name:<44}{results[name]['median_us']:>12.3f} µs", file=sys.stderr)
+    finally:
+        stub.stop()
+
+    commit = git_commit()
+    report = {
+        "meta": {"commit": commit, "python": platform.python_version(), "machine": platform.machine(),
+                 "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": args.seed, "sizes": args.sizes,
+                 "min_time": args.min_time, "repeat": args.repeat},
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote {output}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/corpus.py - Synthetic Hindi/Hinglish/English messages and scheme databases of any size
+
+import copy
+import random
+from typing import Dict, List, Tuple
+
+CITIES = ["Lucknow", "Patna", "Indore", "Nashik", "Agra", "Jaipur", "Kanpur", "Bhopal", "Varanasi", "Surat"]
+
+# Each field has answers the way users type them in that script
+ANSWERS = {
+    "english": {
+        "age": ["I am {age} years old", "age {age}", "{age} yrs", "my age is {age}"],
+        "profession": ["I am a farmer", "student in college", "small business owner", "I work in a factory",
+                       "unemployed, looking for a job", "govt employee"],
+        "location": ["I live in a village", "city", "rural area", "we stay in town"],
+        "income": ["{lakh} lakh per year", "income is {thousand}k", "₹{rupees:,} a year", "very low income"],
+        "family": ["{family} members", "family of {family}", "{family}"],
+        "query": ["schemes for farmers", "health insurance for my family", "scholarship for my daughter",
+                  "housing subsidy", "loan for small business", "LPG connection for women"],
+    },
+    "hindi": {
+        "age": ["मैं {age} साल का हूं", "उम्र {age} वर्ष", "मेरी उम्र {age} है"],
+        "profession": ["मैं किसान हूं", "छात्र हूं", "मेरा छोटा व्यापार है", "मजदूरी करता हूं", "बेरोजगार हूं"],
+        "location": ["गांव में रहते हैं", "शहर", "ग्रामीण क्षेत्र", "कस्बा"],
+        "income": ["{lakh} लाख सालाना", "{thousand} हजार महीना", "बहुत कम आय", "₹{rupees} साल का"],
+        "family": ["परिवार में {family} सदस्य", "हम {family} लोग हैं", "{family}"],
+        "query": ["किसान योजना", "स्वास्थ्य बीमा चाहिए", "छात्रवृत्ति के लिए", "घर के लिए सब्सिडी", "महिला गैस कनेक्शन"],
+    },
+    "hinglish": {
+        "age": ["main {age} saal ka hun", "umar {age} hai", "{age} saal", "meri umr {age}"],
+        "profession": ["kisan hun", "kheti karta hun", "college mein padhai", "naukri karta hun",
+                       "dukaan chalata hun", "berozgar hun"],
+        "location": ["gaon se hun", "shahar mein rehta hun", "village mein", "kasba"],
+        "income": ["{lakh} lakh saal ka", "{thousand} hazar mahina", "kamai bahut kam hai", "salary {rupees}"],
+        "family": ["ghar mein {family} log", "parivar {family} sadasya", "{family}"],
+        "query": ["kisan yojana batao", "sehat bima chahiye", "padhai ke liye scholarship", "ghar ke liye loan",
+                  "mahila yojana"],
+    },
+}
+SCRIPTS = tuple(ANSWERS)
+
+
+def make_message(rng: random.Random, script: str, field: str) -> str:
+    values = {
+        "age": rng.randint(18, 75),
+        "lakh": rng.choice([1, 1.5, 2, 2.5, 3, 5, 8]),
+        "thousand": rng.choice([8, 10, 12, 15, 25, 40]),
+        "rupees": rng.randrange(30000, 900000, 5000),
+        "family": rng.randint(1, 9),
+    }
+    message = rng.choice(ANSWERS[script][field]).format(**values)
+    if field == "query" and rng.random() < 0.3:
+        message += f" {rng.choice(CITIES)}"
+    return message
+
+
+def generate_messages(count: int, seed: int = 7, scripts=SCRIPTS) -> List[Tuple[str, str, str]]:
+    """`count` (script, field, message) triples, deterministic for a seed"""
+    rng = random.Random(seed)
+    fields = list(ANSWERS["english"])
+    return [(script, field, make_message(rng, script, field))
+            for script, field in ((rng.choice(scripts), rng.choice(fields)) for _ in range(count))]
+
+
+def generate_sentences(count: int, seed: int = 7, scripts=SCRIPTS) -> List[str]:
+    """Whole-profile messages ("main 34 saal ka hun, kisan hun, gaon se...") for the extractors"""
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(count):
+        script = rng.choice(scripts)
+        parts = [make_message(rng, script, field) for field in ("age", "profession", "location", "income")]
+        rng.shuffle(parts)
+        sentences.append(", ".join(parts[:rng.randint(1, 4)]))
+    return sentences
+
+
+def _variant(scheme: Dict, index: int) -> Dict:
+    clone = copy.deepcopy(scheme)
+    clone["id"] = f"{scheme['id']}_{index}"
+    clone["name_english"] = f"{scheme['name_english']} {index}"
+    clone["name_hindi"] = f"{scheme['name_hindi']} {index}"
+    return clone
+
+
+def scale_schemes(base: List[Dict], size: int, seed: int = 7) -> List[Dict]:
+    """A scheme-database list (data/schemes_database.json format) of exactly `size` schemes
+
+    The real schemes come first; the rest are renamed copies with a random
+    slice of the keywords, so matching does a realistic amount of work.
+    """
+    rng = random.Random(seed)
+    schemes = [copy.deepcopy(scheme) for scheme in base[:size]]
+    while len(schemes) < size:
+        clone = _variant(rng.choice(base), len(schemes))
+        keywords = clone.get("keywords", [])
+        clone["keywords"] = rng.sample(keywords, rng.randint(1, len(keywords))) if keywords else []
+        schemes.append(clone)
+    return schemes
+
+
+def scale_guided_schemes(base: Dict[str, Dict], size: int, seed: int = 7) -> Dict[str, Dict]:
+    """A guided-conversation scheme dict (EnhancedConversationEngine.load_schemes format) of `size` schemes"""
+    rng = random.Random(seed)
+    professions = ["farmer", "student", "employee", "business", "unemployed", "labour"]
+    originals = list(base.values())
+    schemes = {scheme_id: copy.deepcopy(scheme) for scheme_id, scheme in list(base.items())[:size]}
+    while len(schemes) < size:
+        clone = _variant(rng.choice(originals), len(schemes))
+        clone["target_users"] = rng.sample(professions, rng.randint(1, 2))
+        schemes[clone["id"]] = clone
+    return schemes
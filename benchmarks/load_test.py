@@ -0,0 +1,307 @@
+# benchmarks/load_test.py - Concurrent full conversations with think times against stubbed dependencies
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import CITIES, make_message
+from benchmarks.stub_geo import StubGeo
+from benchmarks.stub_ollama import StubOllama
+
+# One conversation: the five questions, then the three follow-ups
+TURNS = ("age", "profession", "location", "income", "family_size", "recommendations", "details", "offices")
+PROFILE_FIELDS = {"age": "age", "profession": "profession", "location": "location",
+                  "income": "annual_income", "family_size": "family_size"}
+LANGUAGES = {"english": "English", "hindi": "Hindi", "hinglish": "English"}
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def conversation_messages(rng: random.Random):
+    """(script, [(turn type, message), ...]) for one simulated citizen"""
+    script = rng.choice(tuple(LANGUAGES))
+    messages = [(turn, make_message(rng, script, "family" if turn == "family_size" else turn))
+                for turn in TURNS[:5]]
+    messages.append(("recommendations", "yojana dikhao" if script != "english" else "show schemes"))
+    messages.append(("details", "details 1"))
+    if rng.random() < 0.8:
+        messages.append(("offices", f"offices in {rng.choice(CITIES)}"))
+    else:
+        messages.append(("offices", "offices near me"))  # IP geolocation, then offices
+    return script, messages
+
+
+def think_time(rng: random.Random, median: float) -> float:
+    """Reading the reply and typing the answer: log-normal around `median` seconds"""
+    return rng.lognormvariate(math.log(median), 0.6) if median > 0 else 0.0
+
+
+def local_rss() -> float:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, kB on Linux
+
+
+def scraped_rss(url: str) -> float:
+    """Resident memory of a remote API server, from its /metrics"""
+    try:
+        for line in requests.get(f"{url}/metrics", timeout=5).text.splitlines():
+            if line.startswith("process_resident_memory_bytes "):
+                return float(line.split()[1]) / 2 ** 20
+    except requests.RequestException as e:
+        print(f"Could not scrape memory: {e}", file=sys.stderr)
+    return float("nan")
+
+
+class Results:
+    """Per-turn-type latencies and outcomes (only touched from the event loop)"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.shed = defaultdict(int)
+        self.stalled = defaultdict(int)
+        self.conversations = 0
+        self.memory = []
+
+    def report(self, elapsed: float) -> dict:
+        turns = {}
+        for turn in TURNS:
+            values = sorted(self.latencies[turn])
+            def percentile(p):
+                return round(values[min(len(values) - 1, int(len(values) * p))] * 1000, 1) if values else None
+            turns[turn] = {"count": len(values), "errors": self.errors[turn], "shed": self.shed[turn],
+                           "stalled": self.stalled[turn], "p50_ms": percentile(0.50),
+                           "p95_ms": percentile(0.95), "p99_ms": percentile(0.99)}
+        total = sum(len(values) for values in self.latencies.values())
+        rss = [mb for _, mb in self.memory if not math.isnan(mb)]
+        return {
+            "seconds": round(elapsed, 1),
+            "turns": total,
+            "turns_per_sec": round(total / elapsed, 1),
+            "conversations": self.conversations,
+            "conversations_per_min": round(self.conversations / elapsed * 60, 1),
+            "errors": sum(self.errors.values()),
+            "by_turn": turns,
+            "memory_mb": {
+                "start": round(rss[0], 1) if rss else None,
+                "peak": round(max(rss), 1) if rss else None,
+                "end": round(rss[-1], 1) if rss else None,
+                "growth": round(rss[-1] - rss[0], 1) if rss else None,
+                "samples": [(round(t, 1), round(mb, 1)) for t, mb in self.memory],
+            },
+        }
+
+
+class APITarget:
+    """Each simulated citizen holds one keep-alive connection to /v1/chat"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+
+    async def open(self):
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def turn(self, connection, session, message: str, language: str) -> dict:
+        from benchmarks.bench_api_server import post_json
+        reader, writer = connection
+        reply = await post_json(reader, writer, "/v1/chat",
+                                {"session_id": session.get("id"), "message": message, "language": language})
+        session["id"] = reply.get("session_id")
+        return reply
+
+    async def reconnect(self, connection):
+        await self.close(connection)
+        return await self.open()
+
+    async def close(self, connection):
+        connection[1].close()
+
+
+class EngineTarget:
+    """Turns go straight to EnhancedConversationEngine on a worker pool, like the API minus HTTP"""
+
+    def __init__(self, workers: int):
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="saarthak-load")
+
+    async def open(self):
+        from app import EnhancedConversationEngine
+        engine = EnhancedConversationEngine()
+        engine.session_id = uuid.uuid4().hex
+        return engine
+
+    async def turn(self, engine, session, message: str, language: str) -> dict:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(self.executor, engine.process_query, message, language)
+        return {"response": response, "user_profile": engine.user_profile,
+                "conversation_stage": engine.conversation_stage}
+
+    async def reconnect(self, engine):
+        return engine
+
+    async def close(self, engine):
+        pass
+
+
+async def citizen(index: int, target, results: Results, args, stop_at: float):
+    rng = random.Random(args.seed + index)
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+    done = 0
+    while time.monotonic() < stop_at and (not args.conversations or done < args.conversations):
+        script, messages = conversation_messages(rng)
+        language = LANGUAGES[script]
+        session = {}
+        connection = await target.open()
+        try:
+            for turn, message in messages:
+                started = time.perf_counter()
+                try:
+                    reply = await target.turn(connection, session, message, language)
+                except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                    results.errors[turn] += 1
+                    print(f"Turn {turn} failed: {e}", file=sys.stderr)
+                    connection = await target.reconnect(connection)
+                    continue
+                results.latencies[turn].append(time.perf_counter() - started)
+                if reply.get("shed") or reply.get("rate_limited"):
+                    results.shed[turn] += 1  # 429 / overload: the canned busy answer
+                elif "error" in reply:
+                    results.errors[turn] += 1
+                    print(f"Turn {turn} got an error reply: {reply['error']}", file=sys.stderr)
+                field = PROFILE_FIELDS.get(turn)
+                if field and field not in reply.get("user_profile", {field: None}):
+                    results.stalled[turn] += 1
+                await asyncio.sleep(think_time(rng, args.think))
+        finally:
+            await target.close(connection)
+        results.conversations += 1
+        done += 1
+
+
+async def sample_memory(results: Results, url: str, interval: float, started: float):
+    loop = asyncio.get_running_loop()
+    while True:
+        rss = await loop.run_in_executor(None, scraped_rss, url) if url else local_rss()
+        results.memory.append((time.monotonic() - started, rss))
+        await asyncio.sleep(interval)
+
+
+async def run(args) -> dict:
+    server = None
+    if args.target == "engine":
+        target = EngineTarget(args.workers)
+    elif args.url:
+        host, _, port = args.url.split("://", 1)[-1].partition(":")
+        target = APITarget(host, int(port or 80))
+    else:
+        from src.api_server import SaarthakAPIServer
+        # Every citizen shares 127.0.0.1, so per-IP rate limiting is off
+        server = SaarthakAPIServer(port=0, workers=args.workers, rate_limited=False)
+        await server.start()
+        target = APITarget(server.host, server.port)
+
+    results = Results()
+    started = time.monotonic()
+    sampler = asyncio.ensure_future(sample_memory(results, args.url, args.memory_interval, started))
+    try:
+        await asyncio.gather(*[citizen(i, target, results, args, started + args.duration)
+                               for i in range(args.users)])
+    finally:
+        sampler.cancel()
+        if server is not None:
+            server.close()
+    results.memory.append((time.monotonic() - started,
+                           scraped_rss(args.url) if args.url else local_rss()))
+    return results.report(time.monotonic() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many concurrent citizens talking to SaarthakAI")
+    parser.add_argument("--target", choices=("api", "engine"), default="api")
+    parser.add_argument("--url", help="running API server (default: start one in-process)")
+    parser.add_argument("--users", type=int, default=1000, help="concurrent citizens")
+    parser.add_argument("--duration", type=float, default=300, help="seconds before citizens stop starting conversations")
+    parser.add_argument("--conversations", type=int, default=0, help="per citizen (0 = until --duration)")
+    parser.add_argument("--ramp", type=float, default=30, help="seconds over which citizens arrive")
+    parser.add_argument("--think", type=float, default=4.0, help="median think time between turns (seconds)")
+    parser.add_argument("--workers", type=int, default=32, help="engine worker threads")
+    parser.add_argument("--geo-latency", type=float, default=0.2, help="stub Nominatim/ipapi latency (seconds)")
+    parser.add_argument("--geo-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm", action="store_true", help="run LLM extraction against a stub Ollama")
+    parser.add_argument("--llm-parallel", type=int, default=4)
+    parser.add_argument("--llm-token-delay", type=float, default=0.02)
+    parser.add_argument("--memory-interval", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    parser.add_argument("--max-p99-ms", type=float, help="fail if any non-office turn's p99 is above this")
+    parser.add_argument("--max-error-rate", type=float, help="fail if errors / turns is above this")
+    parser.add_argument("--max-memory-growth-mb", type=float, help="fail if RSS grew by more than this")
+    args = parser.parse_args()
+
+    geo = StubGeo(latency=args.geo_latency, error_rate=args.geo_error_rate).start()
+    ollama = StubOllama(parallel=args.llm_parallel, token_delay=args.llm_token_delay).start() if args.llm else None
+    if not args.url:
+        # Config reads these at import, so they are set before the app is imported
+        os.environ["SAARTHAK_NOMINATIM_URL"] = geo.nominatim_url
+        os.environ["SAARTHAK_IPAPI_URL"] = geo.ipapi_url
+        os.environ["SAARTHAK_LLM_EXTRACTION"] = "1" if ollama else "0"
+        if ollama is not None:
+            os.environ["SAARTHAK_OLLAMA_URL"] = ollama.url
+        # Conversation logs, analytics and feedback from the run go to a scratch dir, not data/
+        from config import get_config
+        data_dir = tempfile.mkdtemp(prefix="saarthak-load-")
+        get_config().use_data_dir(data_dir)
+        print(f"Run logs, analytics and feedback go to {data_dir}", file=sys.stderr)
+    else:
+        print(f"Point the server at SAARTHAK_NOMINATIM_URL={geo.nominatim_url} SAARTHAK_IPAPI_URL={geo.ipapi_url}"
+              + (f" SAARTHAK_OLLAMA_URL={ollama.url}" if ollama else ""), file=sys.stderr)
+
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        geo.stop()
+        if ollama is not None:
+            ollama.stop()
+
+    report["config"] = {key: value for key, value in vars(args).items() if key != "output"}
+    report["stubs"] = {"nominatim_searches": geo.searches, "ipapi_lookups": geo.locations,
+                       "geo_errors": geo.errors, "llm_generations": ollama.generations if ollama else 0}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    failures = []
+    if args.max_p99_ms is not None:
+        failures += [f"{turn} p99 {row['p99_ms']}ms" for turn, row in report["by_turn"].items()
+                     if turn != "offices" and row["p99_ms"] is not None and row["p99_ms"] > args.max_p99_ms]
+    if args.max_error_rate is not None and report["turns"] and report["errors"] / report["turns"] > args.max_error_rate:
+        failures.append(f"error rate {report['errors'] / report['turns']:.2%}")
+    growth = report["memory_mb"]["growth"]
+    if args.max_memory_growth_mb is not None and growth is not None and growth > args.max_memory_growth_mb:
+        failures.append(f"memory grew {growth}MB")
+    if failures:
+        print("Load test failed: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/stub_geo.py - Local stand-ins for Nominatim search and ipapi.co with configurable latency
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_LOCATION = {"city": "Lucknow", "region": "Uttar Pradesh", "country_name": "India",
+                    "latitude": 26.85, "longitude": 80.95}
+
+
+class StubGeo:
+    """Serves GET /search (Nominatim) and GET /json/ (ipapi.co) from one port
+
+    Each request sleeps `latency` seconds. `error_rate` of them answer 503 and
+    `miss_rate` of searches find nothing, so breakers and fallbacks get
+    exercised. Point the app at it with
+    SAARTHAK_NOMINATIM_URL=<url>/search and SAARTHAK_IPAPI_URL=<url>/json/.
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.05, error_rate: float = 0.0, miss_rate: float = 0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.miss_rate = miss_rate
+        self.searches = 0
+        self.locations = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.nominatim_url = self.url + "/search"
+        self.ipapi_url = self.url + "/json/"
+
+    def _roll(self, rate: float, counter: int) -> bool:
+        # Deterministic spread: every 1/rate-th request, not random clumps
+        return rate > 0 and int(counter * rate) != int((counter - 1) * rate)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status: int, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up first (timeouts under test)
+                    self.close_connection = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                time.sleep(stub.latency)
+                with stub._lock:
+                    if url.path == "/search":
+                        stub.searches += 1
+                        counter = stub.searches
+                    elif url.path.startswith("/json"):
+                        stub.locations += 1
+                        counter = stub.locations
+                    else:
+                        self.reply(404, {"error": "not found"})
+                        return
+                    failed = stub._roll(stub.error_rate, counter)
+                    if failed:
+                        stub.errors += 1
+                if failed:
+                    self.reply(503, {"error": "stub outage"})
+                elif url.path.startswith("/json"):
+                    self.reply(200, DEFAULT_LOCATION)
+                elif stub._roll(stub.miss_rate, counter):
+                    self.reply(200, [])
+                else:
+                    query = parse_qs(url.query).get("q", [""])[0]
+                    self.reply(200, [{"display_name": f"{query}, Civil Lines, 226001, India"}])
+
+        return Handler
+
+    def start(self) -> "StubGeo":
+        threading.Thread(target=self.server.serve_forever, name="stub-geo", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a stub Nominatim/ipapi server")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubGeo(args.port, args.latency, args.error_rate)
+    print(f"Stub Nominatim on {stub.nominatim_url}, ipapi on {stub.ipapi_url}")
+    stub.server.serve_forever()
@@ -0,0 +1,95 @@
+# benchmarks/stub_ollama.py - Local stand-in for Ollama's HTTP API with CPU-like serving limits
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = ('{"age": 34, "profession": "farmer", "location": "rural", '
+                 '"annual_income": 120000, "family_size": 5}')
+
+
+class StubOllama:
+    """Serves /api/version and streaming /api/generate like a small model on CPU
+
+    Only `parallel` generations run at once (Ollama's OLLAMA_NUM_PARALLEL); the
+    rest queue inside the server, as they do in Ollama. Each generation costs
+    `prefill` seconds plus `token_delay` per streamed chunk of the reply.
+    """
+
+    def __init__(self, port: int = 0, parallel: int = 2, prefill: float = 0.05,
+                 token_delay: float = 0.01, reply: str = DEFAULT_REPLY, chunk_chars: int = 6):
+        self.slots = threading.Semaphore(parallel)
+        self.prefill = prefill
+        self.token_delay = token_delay
+        self.reply = reply
+        self.chunk_chars = chunk_chars
+        self.generations = 0
+        self.abandoned = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = b'{"version": "0.0.0-stub"}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub.slots:
+                    stub.generations += 1
+                    time.sleep(stub.prefill)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    tokens = [stub.reply[i:i + stub.chunk_chars]
+                              for i in range(0, len(stub.reply), stub.chunk_chars)]
+                    try:
+                        for i, token in enumerate(tokens + [""]):
+                            line = (json.dumps({"response": token, "done": i == len(tokens)}) + "\n").encode()
+                            self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                            self.wfile.flush()
+                            time.sleep(stub.token_delay)
+                        self.wfile.write(b"0\r\n\r\n")
+                    except (BrokenPipeError, ConnectionResetError):
+                        stub.abandoned += 1
+                        self.close_connection = True
+
+        return Handler
+
+    def start(self) -> "StubOllama":
+        threading.Thread(target=self.server.serve_forever, name="stub-ollama", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a stub Ollama server")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--parallel", type=int, default=2)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    stub = StubOllama(args.port, args.parallel, token_delay=args.token_delay)
+    print(f"Stub Ollama on {stub.url}")
+    stub.server.serve_forever()
@@ -0,0 +1,138 @@
+# benchmarks/stub_redis.py - Local stand-in for Redis speaking just enough RESP2 for the session store
+
+import socket
+import threading
+import time
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+
+
+class StubRedis:
+    """Serves PING, AUTH, SELECT, GET, SET (with EX/PX) and DEL over RESP2
+
+    Keys live in `databases` in-memory dicts and expire lazily on read, like
+    Redis. With `password` set, commands before AUTH answer NOAUTH.
+    drop_connections() closes every client socket, so reconnects can be tested.
+    Point the app at it with SAARTHAK_SESSION_BACKEND=redis
+    SAARTHAK_REDIS_URL=<url>/0.
+    """
+
+    def __init__(self, port: int = 0, password: str = None, databases: int = 16):
+        self.password = password
+        self.databases = [{} for _ in range(databases)]
+        self.commands = 0
+        self.connections = 0
+        self._clients = set()
+        self._lock = threading.Lock()
+        self.server = ThreadingTCPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.url = f"redis://127.0.0.1:{self.port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(StreamRequestHandler):
+            def read_command(self):
+                line = self.rfile.readline()
+                if not line:
+                    return None
+                if not line.startswith(b"*"):
+                    raise ValueError(f"inline commands are not supported: {line!r}")
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int(self.rfile.readline()[1:-2])
+                    args.append(self.rfile.read(length + 2)[:-2])
+                return args
+
+            def handle(self):
+                with stub._lock:
+                    stub._clients.add(self.connection)
+                    stub.connections += 1
+                session = {"authed": stub.password is None, "db": 0}
+                try:
+                    while True:
+                        args = self.read_command()
+                        if not args:
+                            break
+                        self.wfile.write(stub.execute(args, session))
+                except (OSError, ValueError):
+                    pass
+                finally:
+                    with stub._lock:
+                        stub._clients.discard(self.connection)
+
+        return Handler
+
+    def execute(self, args, session) -> bytes:
+        """One command's encoded reply; `session` holds the connection's auth and DB"""
+        command = args[0].decode("utf-8", "replace").upper()
+        with self._lock:
+            self.commands += 1
+        if command == "AUTH":
+            if self.password is not None and args[-1].decode("utf-8", "replace") == self.password:
+                session["authed"] = True
+                return b"+OK\r\n"
+            return b"-WRONGPASS invalid username-password pair or user is disabled.\r\n"
+        if not session["authed"]:
+            return b"-NOAUTH Authentication required.\r\n"
+        if command == "PING":
+            return b"+PONG\r\n"
+        if command == "SELECT":
+            index = int(args[1]) if len(args) > 1 and args[1].isdigit() else -1
+            if not 0 <= index < len(self.databases):
+                return b"-ERR DB index is out of range\r\n"
+            session["db"] = index
+            return b"+OK\r\n"
+
+        data = self.databases[session["db"]]
+        with self._lock:
+            if command == "GET" and len(args) == 2:
+                entry = data.get(args[1])
+                if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                    del data[args[1]]
+                    entry = None
+                return b"$-1\r\n" if entry is None else b"$%d\r\n%s\r\n" % (len(entry[0]), entry[0])
+            if command == "SET" and len(args) >= 3:
+                expires_at = None
+                options = [arg.upper() for arg in args[3:]]
+                if b"EX" in options:
+                    expires_at = time.monotonic() + int(args[3 + options.index(b"EX") + 1])
+                elif b"PX" in options:
+                    expires_at = time.monotonic() + int(args[3 + options.index(b"PX") + 1]) / 1000
+                data[args[1]] = (args[2], expires_at)
+                return b"+OK\r\n"
+            if command == "DEL" and len(args) >= 2:
+                removed = sum(1 for key in args[1:] if data.pop(key, None) is not None)
+                return b":%d\r\n" % removed
+        return b"-ERR unknown command or wrong number of arguments for '%s'\r\n" % command.encode()
+
+    def drop_connections(self):
+        """Close every client connection (a server restart or failover, as clients see it)"""
+        with self._lock:
+            clients = list(self._clients)
+        for connection in clients:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def start(self) -> "StubRedis":
+        threading.Thread(target=self.server.serve_forever, name="stub-redis", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a stub Redis server")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    stub = StubRedis(args.port, args.password)
+    print(f"Stub Redis on {stub.url}")
+    stub.server.serve_forever()
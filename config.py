@@ -6,6 +6,8 @@ from pathlib import Path
 class Config:
     """Configuration settings for SaarthakAI"""
     
+    DEBUG = False
+    
     # Project paths
     BASE_DIR = Path(__file__).parent
     DATA_DIR = BASE_DIR / "data"
@@ -14,16 +16,37 @@ class Config:
     
     # LLM Settings
     OLLAMA_MODEL = "llama3.1:3b"  # Fast model for demo
-    OLLAMA_URL = "http://localhost:11434"
+    OLLAMA_URL = os.getenv("SAARTHAK_OLLAMA_URL", "http://localhost:11434")
     OLLAMA_TIMEOUT = 10  # seconds
+    ENABLE_LLM_EXTRACTION = os.getenv("SAARTHAK_LLM_EXTRACTION", "1") == "1"
+    LLM_EXTRACTION_WAIT = 1.2  # seconds a turn waits on the LLM before keeping the regex result
+    LLM_WORKERS = 4  # connections to Ollama; match its OLLAMA_NUM_PARALLEL
+    LLM_BATCH_WINDOW = 0.005  # seconds to gather concurrent requests into one batch
+    LLM_MAX_BATCH = 16
+    OLLAMA_HEALTH_INTERVAL = 30  # seconds between background availability checks
     
     # Database Settings
     SCHEMES_DB_PATH = DATA_DIR / "schemes_database.json"
-    CONVERSATIONS_DB_PATH = DATA_DIR / "user_conversations.json"
-    ANALYTICS_DB_PATH = DATA_DIR / "analytics.json"
+    CONVERSATIONS_DB_PATH = DATA_DIR / "user_conversations.jsonl"  # append-only, one turn per line
+    ANALYTICS_DB_PATH = DATA_DIR / "analytics"  # <event>/<YYYY-MM>.tsv rollups
+    TRACE_LOG_PATH = DATA_DIR / "traces.jsonl"  # one span per line
+    PROFILE_DIR = DATA_DIR / "profiles"  # collapsed-stack captures
+    FEEDBACK_DB_PATH = DATA_DIR / "feedback.db"
+    SESSION_DB_PATH = DATA_DIR / "sessions.db"
+    RESPONSE_CACHE_PATH = DATA_DIR / "response_cache.db"
+    LLM_CACHE_PATH = DATA_DIR / "llm_cache.db"
+    
+    # Session Settings
+    SESSION_BACKEND = os.getenv("SAARTHAK_SESSION_BACKEND", "memory")  # memory, sqlite, redis
+    SESSION_TTL = 2 * 60 * 60  # seconds of inactivity before a session expires
+    REDIS_URL = os.getenv("SAARTHAK_REDIS_URL", "redis://localhost:6379/0")
+    SESSION_SWEEP_INTERVAL = 60  # seconds between idle-session sweeps
+    MAX_HISTORY_MESSAGES = 30  # messages kept per session; older ones spill to disk
+    SESSION_MEMORY_BUDGET = 256 * 1024  # bytes of chat history kept per session
+    HISTORY_SPILL_DIR = DATA_DIR / "history"
     
     # Language Settings
-    SUPPORTED_LANGUAGES = ["hindi", "english"]
+    SUPPORTED_LANGUAGES = ["hindi", "english", "marathi", "bengali", "tamil"]  # see src/language_packs
     DEFAULT_LANGUAGE = "hindi"
     LANGUAGE_CODES = {
         "hindi": "hi",
@@ -46,13 +69,15 @@ class Config:
     DEMO_MODE = True
     FAST_RESPONSES = True
     CACHED_RESPONSES = True
-    MAX_RESPONSE_TIME = 3  # seconds
+    MAX_RESPONSE_TIME = 3  # seconds, enforced per turn when FAST_RESPONSES is on
+    MIN_STAGE_TIME = 0.2  # seconds a network stage needs; less and it degrades to templates
     
     # UI Settings
     PRIMARY_COLOR = "#4CAF50"
     SECONDARY_COLOR = "#45a049"
     BACKGROUND_COLOR = "#FFFFFF"
     TEXT_COLOR = "#262730"
+    CHAT_PAGE_SIZE = 10  # messages rendered per "load earlier" page
     
     # Scheme Matching Settings
     MAX_SCHEMES_RETURNED = 3
@@ -65,17 +90,72 @@ class Config:
     MAX_RETRIES = 3
     REQUEST_TIMEOUT = 10
     
+    # External Services
+    NOMINATIM_URL = os.getenv("SAARTHAK_NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
+    IPAPI_URL = os.getenv("SAARTHAK_IPAPI_URL", "https://ipapi.co/json/")
+    NOMINATIM_TIMEOUT = 3  # upper bound; actual timeout adapts to observed latency
+    IPAPI_TIMEOUT = 5
+    BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures/slow calls before failing fast
+    BREAKER_RESET_TIMEOUT = 30  # seconds before a half-open probe
+    
+    # Headless API Server Settings
+    API_HOST = os.getenv("SAARTHAK_API_HOST", "127.0.0.1")
+    API_PORT = int(os.getenv("SAARTHAK_API_PORT", "8600"))
+    API_WORKERS = 32  # threads running engine turns
+    API_MAX_BODY_BYTES = 16 * 1024
+    
+    # Tracing (one trace per sampled turn)
+    TRACE_SAMPLE_RATE = float(os.getenv("SAARTHAK_TRACE_SAMPLE_RATE", "0.05"))  # head sampling, per turn
+    TRACE_EXPORTER = os.getenv("SAARTHAK_TRACE_EXPORTER", "jsonl")  # jsonl, otlp, none
+    TRACE_LOG_MAX_BYTES = 32 * 1024 * 1024  # rotate (and gzip) the span log beyond this size
+    TRACE_LOG_MAX_SEGMENTS = 8  # rotated span segments kept; older ones are deleted at rotation
+    OTLP_ENDPOINT = os.getenv("SAARTHAK_OTLP_ENDPOINT", "http://127.0.0.1:4318")  # OTLP/HTTP collector
+    
+    # Metrics (Prometheus text format)
+    ENABLE_METRICS = os.getenv("SAARTHAK_METRICS", "1") == "1"
+    METRICS_HOST = os.getenv("SAARTHAK_METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("SAARTHAK_METRICS_PORT", "9464"))  # Streamlit only; the API serves /metrics
+    
+    # Sampling profiler (SAARTHAK_PROFILE=<seconds> captures from startup)
+    PROFILER_INTERVAL = 0.01  # seconds between stack samples
+    PROFILER_MAX_SECONDS = 300  # longest capture window
+    PROFILER_MAX_OVERHEAD = 0.03  # sampler backs off to stay under this share of one CPU
+    
     # Logging Settings
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
     # Performance Settings
     CACHE_SIZE = 100  # Number of cached responses
+    RESPONSE_CACHE_TTL = 24 * 60 * 60  # seconds; scheme DB reloads invalidate sooner
+    PERSIST_RESPONSE_CACHE = True  # keep cached responses on disk across restarts
+    LLM_CACHE_SIZE = 2000  # LLM results kept in memory
+    LLM_CACHE_TTL = 7 * 24 * 60 * 60  # seconds; a prompt template change invalidates sooner
+    PERSIST_LLM_CACHE = True
     PRELOAD_SCHEMES = True
     ASYNC_PROCESSING = False
+    ENABLE_PREFETCH = True  # resolve offices in the background once a location is known
+    PREFETCH_WORKERS = 2  # keep low: Nominatim allows ~1 request/second
+    OFFICE_CACHE_SIZE = 512  # cities
+    OFFICE_CACHE_TTL = 24 * 60 * 60  # seconds
+    LOCATION_CACHE_TTL = 60 * 60  # seconds
+    ENABLE_CONVERSATION_LOG = os.getenv("SAARTHAK_CONVERSATION_LOG", "1") == "1"
+    CONVERSATION_LOG_MAX_BYTES = 64 * 1024 * 1024  # rotate the active file beyond this size...
+    CONVERSATION_LOG_ROTATE_DAILY = True  # ...and at the first write of a new day
+    COMPRESS_CONVERSATION_LOGS = True  # gzip rotated segments
+    CONVERSATION_LOG_FLUSH_INTERVAL = 0.2  # seconds of turns grouped into one fsync
+    ANALYTICS_FLUSH_INTERVAL = 60  # seconds between rollups written to ANALYTICS_DB_PATH
+    ANALYTICS_SHARDS = 16  # counter shards (by thread) so request threads rarely contend
+    ENABLE_STAGE_TIMING = os.getenv("SAARTHAK_STAGE_TIMING", "1") == "1"  # per-stage latency histograms
+    STAGE_TIMING_DUMP = os.getenv("SAARTHAK_STAGE_TIMING_DUMP")  # path; summary JSON written at exit
+    FEEDBACK_FLUSH_INTERVAL = 1.0  # seconds of feedback clicks committed in one transaction
     
     # Security Settings
     RATE_LIMIT = 60  # requests per minute per user
+    RATE_LIMIT_BURST = 10  # back-to-back requests allowed before the per-minute rate applies
+    RATE_LIMIT_IP_MULTIPLIER = 10  # a CSC kiosk IP serves many users
+    MAX_IN_FLIGHT_TURNS = 64  # shed load (canned answer) beyond this many concurrent turns
+    MAX_LOAD_PER_CPU = 2.0  # ...or when the 1-minute load average per CPU exceeds this
     MAX_MESSAGE_LENGTH = 500
     ALLOWED_FILE_TYPES = [".txt", ".json"]
     
@@ -98,10 +178,28 @@ class Config:
         paths = {
             "schemes": cls.SCHEMES_DB_PATH,
             "conversations": cls.CONVERSATIONS_DB_PATH,
-            "analytics": cls.ANALYTICS_DB_PATH
+            "analytics": cls.ANALYTICS_DB_PATH,
+            "feedback": cls.FEEDBACK_DB_PATH,
+            "sessions": cls.SESSION_DB_PATH,
+            "response_cache": cls.RESPONSE_CACHE_PATH,
+            "llm_cache": cls.LLM_CACHE_PATH
         }
         return paths.get(db_type, cls.SCHEMES_DB_PATH)
-    
+
+    @classmethod
+    def use_data_dir(cls, data_dir):
+        """Write logs, caches and stores under `data_dir` (tests, load runs); scheme data is still read from DATA_DIR"""
+        data_dir = Path(data_dir)
+        cls.CONVERSATIONS_DB_PATH = data_dir / "user_conversations.jsonl"
+        cls.ANALYTICS_DB_PATH = data_dir / "analytics"
+        cls.TRACE_LOG_PATH = data_dir / "traces.jsonl"
+        cls.PROFILE_DIR = data_dir / "profiles"
+        cls.FEEDBACK_DB_PATH = data_dir / "feedback.db"
+        cls.SESSION_DB_PATH = data_dir / "sessions.db"
+        cls.RESPONSE_CACHE_PATH = data_dir / "response_cache.db"
+        cls.LLM_CACHE_PATH = data_dir / "llm_cache.db"
+        cls.HISTORY_SPILL_DIR = data_dir / "history"
+
     @classmethod
     def is_ollama_available(cls):
         """Check if Ollama is running"""
@@ -109,7 +207,7 @@ class Config:
             import requests
             response = requests.get(f"{cls.OLLAMA_URL}/api/version", timeout=2)
             return response.status_code == 200
-        except:
+        except Exception:
             return False
     
     @classmethod
@@ -134,6 +232,7 @@ class DevelopmentConfig(Config):
     DEBUG = True
     LOG_LEVEL = "DEBUG"
     CACHE_SIZE = 10
+    TRACE_SAMPLE_RATE = 1.0
 
 class ProductionConfig(Config):
     """Production configuration"""
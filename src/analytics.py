@@ -0,0 +1,290 @@
+# src/analytics.py - Sharded in-memory event counters with periodic rollups to disk
+
+import atexit
+import itertools
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from config import get_config
+
+Config = get_config()
+
+# Order of the guided questions, for the drop-off funnel
+QUESTION_SEQUENCE = ["age", "profession", "location", "annual_income", "family_size"]
+
+
+class ShardedCounter:
+    """Counters split across per-thread shards, so emitters rarely contend
+
+    Each thread is dealt a shard round-robin the first time it counts (thread
+    idents are aligned addresses, so `ident % shards` would put every thread in
+    one shard). Each shard has its own small lock; incrementing is a dict update
+    under an almost always uncontended lock. drain() empties every shard and
+    merges what it held.
+    """
+
+    def __init__(self, shards: int = 16):
+        self._shards = [({}, threading.Lock()) for _ in range(shards)]
+        self._count = shards
+        self._increments = [0] * shards
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+
+    def _shard_index(self) -> int:
+        index = getattr(self._local, "index", None)
+        if index is None:
+            index = self._local.index = next(self._next_shard) % self._count
+        return index
+
+    def incr(self, key: Tuple[str, str], amount: int = 1):
+        index = self._shard_index()
+        counts, lock = self._shards[index]
+        with lock:
+            counts[key] = counts.get(key, 0) + amount
+            self._increments[index] += 1
+
+    @property
+    def increments(self) -> int:
+        """incr() calls since creation (exact: each shard's tally is kept under its lock)"""
+        total = 0
+        for index, (_, lock) in enumerate(self._shards):
+            with lock:
+                total += self._increments[index]
+        return total
+
+    def drain(self) -> Counter:
+        """Counts since the last drain (and reset them)"""
+        total = Counter()
+        for counts, lock in self._shards:
+            with lock:
+                drained = dict(counts)
+                counts.clear()
+            total.update(drained)
+        return total
+
+    def peek(self) -> Counter:
+        total = Counter()
+        for counts, lock in self._shards:
+            with lock:
+                total.update(counts)
+        return total
+
+
+class Analytics:
+    """Event counts rolled up every `flush_interval` seconds into per-event monthly files
+
+    Layout under `directory`: <event>/<YYYY-MM>.tsv, one "period<TAB>key<TAB>count"
+    row per key and flush. Files are append-only, and a query for one event
+    over a date range opens only that event's files for the months in range.
+    Once a month is over its file is compacted to one row per day and key, so
+    scanning months of history reads a few thousand rows per event.
+    """
+
+    def __init__(self, directory, flush_interval: float = 60.0, shards: int = 16):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.counter = ShardedCounter(shards)
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.flushes = 0
+        self.rows_written = 0
+        self._compacted_before = None
+        self._thread = threading.Thread(target=self._run, name="analytics-rollup", daemon=True)
+        self._thread.start()
+
+    def track(self, event: str, key: str = "", amount: int = 1):
+        """Count one occurrence of event/key (a few microseconds)"""
+        self.counter.incr((event, str(key)), amount)
+
+    @property
+    def events(self) -> int:
+        return self.counter.increments
+
+    def _run(self):
+        self.compact()
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+            self.compact()
+
+    def compact(self) -> int:
+        """Compact every finished month not compacted yet by this process"""
+        current_month = time.strftime("%Y-%m", time.gmtime())
+        with self._flush_lock:
+            if self._compacted_before == current_month or not self.directory.is_dir():
+                return 0
+            compacted = 0
+            for path in self.directory.glob("*/*.tsv"):
+                if path.stem < current_month:
+                    try:
+                        compacted += compact_month(path)
+                    except OSError as e:
+                        print(f"Compacting {path} failed: {e}")
+            self._compacted_before = current_month
+            return compacted
+
+    def flush(self) -> int:
+        """Append everything counted since the last flush; returns rows written"""
+        with self._flush_lock:
+            counts = self.counter.drain()
+            if not counts:
+                return 0
+            period = time.strftime("%Y-%m-%dT%H:%M", time.gmtime())
+            month = period[:7]
+            by_event: Dict[str, list] = {}
+            for (event, key), count in counts.items():
+                clean_key = key.replace("\t", " ").replace("\n", " ")
+                by_event.setdefault(event, []).append(f"{period}\t{clean_key}\t{count}\n")
+            try:
+                for event, rows in by_event.items():
+                    path = self.directory / event / f"{month}.tsv"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write("".join(rows))
+            except OSError as e:
+                print(f"Analytics rollup failed: {e}")
+                return 0
+            self.flushes += 1
+            self.rows_written += len(counts)
+            return len(counts)
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+    def stats(self) -> Dict:
+        return {
+            "events": self.events,
+            "pending_keys": len(self.counter.peek()),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+        }
+
+
+def compact_month(path: Path) -> int:
+    """Rewrite a finished month's rollups as daily totals; returns rows removed"""
+    totals = Counter()
+    rows = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            period, _, rest = line.partition("\t")
+            key, _, count = rest.rpartition("\t")
+            try:
+                totals[(period[:10], key)] += int(count)
+            except ValueError:
+                continue
+            rows += 1
+    if rows == len(totals):
+        return 0
+    partial = path.with_suffix(".tmp")
+    with open(partial, "w", encoding="utf-8") as f:
+        f.write("".join(f"{day}\t{key}\t{count}\n" for (day, key), count in sorted(totals.items())))
+    os.replace(partial, path)
+    return rows - len(totals)
+
+
+def scan_rollups(directory, event: str, since: str = None, until: str = None) -> Iterator[Tuple[str, str, int]]:
+    """(period, key, count) rows for one event; since/until are YYYY-MM-DD, inclusive"""
+    event_dir = Path(directory) / event
+    if not event_dir.is_dir():
+        return
+    for path in sorted(event_dir.glob("*.tsv")):
+        month = path.stem
+        if (since and month < since[:7]) or (until and month > until[:7]):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                period, _, rest = line.partition("\t")
+                day = period[:10]
+                if (since and day < since) or (until and day > until):
+                    continue
+                key, _, count = rest.rpartition("\t")
+                try:
+                    yield period, key, int(count)
+                except ValueError:
+                    continue
+
+
+def aggregate(rows: Iterable[Tuple[str, str, int]], by: str = "total") -> Dict:
+    """Sum rows per key, or per (day|month, key)"""
+    width = {"day": 10, "month": 7}.get(by)
+    totals = Counter()
+    for period, key, count in rows:
+        totals[(period[:width], key) if width else key] += count
+    return totals
+
+
+def question_funnel(directory, since: str = None, until: str = None) -> Dict:
+    """Sessions asked each question, and how many never reached the next step"""
+    asked = aggregate(scan_rollups(directory, "question_asked", since, until))
+    completed = sum(aggregate(scan_rollups(directory, "questions_completed", since, until)).values())
+    funnel = {}
+    for i, field in enumerate(QUESTION_SEQUENCE):
+        reached_next = asked.get(QUESTION_SEQUENCE[i + 1], 0) if i + 1 < len(QUESTION_SEQUENCE) else completed
+        funnel[field] = {"asked": asked.get(field, 0), "dropped": max(0, asked.get(field, 0) - reached_next)}
+    return funnel
+
+
+_analytics: Optional[Analytics] = None
+_analytics_lock = threading.Lock()
+
+
+def get_analytics() -> Optional[Analytics]:
+    """Process-wide pipeline (None when ENABLE_ANALYTICS is off); started on first use"""
+    global _analytics
+    if not Config.ENABLE_ANALYTICS:
+        return None
+    if _analytics is None:
+        with _analytics_lock:
+            if _analytics is None:
+                _analytics = Analytics(Config.ANALYTICS_DB_PATH, Config.ANALYTICS_FLUSH_INTERVAL,
+                                       Config.ANALYTICS_SHARDS)
+                atexit.register(_analytics.close)
+    return _analytics
+
+
+def track(event: str, key: str = "", amount: int = 1):
+    """Count an analytics event"""
+    analytics = _analytics if _analytics is not None else get_analytics()
+    if analytics is not None:
+        analytics.track(event, key, amount)
+
+
+def analytics_stats() -> Dict:
+    return _analytics.stats() if _analytics is not None else {"enabled": Config.ENABLE_ANALYTICS}
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Query analytics rollups")
+    parser.add_argument("event", nargs="?", help="recommendation, scheme_details, question_asked, "
+                                                 "questions_completed, language, office_lookup; omit to list")
+    parser.add_argument("--since", help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--until", help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--by", choices=["total", "day", "month"], default="total")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--funnel", action="store_true", help="drop-off per guided question")
+    parser.add_argument("--dir", default=str(Config.ANALYTICS_DB_PATH))
+    args = parser.parse_args()
+
+    if args.funnel:
+        print(json.dumps(question_funnel(args.dir, args.since, args.until), indent=2))
+        return
+    if not args.event:
+        events = sorted(p.name for p in Path(args.dir).iterdir() if p.is_dir()) if Path(args.dir).is_dir() else []
+        print("\n".join(events) or "no rollups yet")
+        return
+
+    totals = aggregate(scan_rollups(args.dir, args.event, args.since, args.until), args.by)
+    for key, count in sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:args.top]:
+        label = "\t".join(key) if isinstance(key, tuple) else key
+        print(f"{count}\t{label}")
+
+
+if __name__ == "__main__":
+    main()
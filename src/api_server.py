@@ -0,0 +1,398 @@
+# src/api_server.py - Headless HTTP/JSON API for SaarthakAI
+
+import asyncio
+import json
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import EnhancedConversationEngine
+from config import get_config
+from src.analytics import analytics_stats
+from src.circuit_breaker import breaker_stats
+from src.conversation_log import conversation_log_stats, log_turn
+from src.conversation_engine import SaarthakConversationEngine
+from src.deadline import deadline_stats, last_turn_deadline
+from src.feedback import feedback_stats
+from src.llm_extractor import llm_stats
+from src.metrics import CONTENT_TYPE, REGISTRY, http_requests_total, register_sessions
+from src.office_prefetch import OfficePrefetcher
+from src.profiler import LOOPBACK_ADDRESSES, profiler_stats, requested_seconds, start_profile
+from src.rate_limit import admission, allow_request, rate_limit_stats
+from src.session_history import HistorySpill, cap_history, session_memory_usage
+from src.session_store import (SessionSweeper, SessionStore, create_session_store,
+                               pack_messages, unpack_messages)
+from src.single_flight import flight_stats
+from src.stage_timing import stage_timing_stats
+from src.tracing import last_trace_id, tracing_stats
+
+Config = get_config()
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+class SaarthakAPIServer:
+    """Lightweight asyncio HTTP/JSON server exposing both conversation engines
+
+    Endpoints:
+        POST   /v1/chat              - stateful guided conversation (EnhancedConversationEngine)
+        POST   /v1/query             - stateless scheme lookup (SaarthakConversationEngine)
+        GET    /v1/sessions/<id>     - memory accounting for one conversation
+        DELETE /v1/sessions/<id>     - end a conversation
+        GET    /health               - liveness probe
+        GET    /metrics              - Prometheus text-format metrics
+        POST   /admin/profile        - start a sampling-profiler capture (loopback clients only)
+        GET    /admin/profile        - profiler status and the last capture
+
+    The engines are synchronous (regex extraction, blocking HTTP lookups), so each
+    turn runs in a bounded thread pool and the event loop only does socket I/O.
+    Conversation state lives in a SessionStore, so any replica can serve any turn.
+    Each session and client IP is held to Config.RATE_LIMIT (429 with a canned
+    answer); when too many turns are in flight the server sheds load the same way.
+    """
+
+    def __init__(self, host: str = None, port: int = None, workers: int = None,
+                 session_store: SessionStore = None, rate_limited: bool = True):
+        self.host = host or Config.API_HOST
+        self.port = port if port is not None else Config.API_PORT
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or Config.API_WORKERS,
+            thread_name_prefix="saarthak-api"
+        )
+        self.stateless_engine = SaarthakConversationEngine()
+        self.session_store = session_store or create_session_store(Config)
+        register_sessions(self.session_store.stats)
+        self.prefetcher = OfficePrefetcher(Config.PREFETCH_WORKERS) if Config.ENABLE_PREFETCH else None
+        self.history_spill = HistorySpill(Config.HISTORY_SPILL_DIR)
+        self.sweeper = SessionSweeper(self.session_store, self.history_spill,
+                                      interval=Config.SESSION_SWEEP_INTERVAL)
+        # session_id -> [lock, number of turns holding or waiting on it]
+        self.session_locks: Dict[str, list] = {}
+        self.rate_limited = rate_limited
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.started_at = time.time()
+
+    async def start(self):
+        """Bind the listening socket"""
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.sweeper.start()
+        return self.server
+
+    async def serve_forever(self):
+        """Start and serve until cancelled"""
+        if self.server is None:
+            await self.start()
+        print(f"SaarthakAI API listening on http://{self.host}:{self.port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        """Stop accepting connections and release worker threads"""
+        if self.server is not None:
+            self.server.close()
+        self.sweeper.stop()
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+        self.executor.shutdown(wait=False)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one connection (keep-alive aware)"""
+        peer = writer.get_extra_info("peername")
+        client_ip = peer[0] if peer else None
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.write_response(writer, 400, {"error": "malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (version == "HTTP/1.1" and
+                              headers.get("connection", "").lower() != "close")
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.write_response(writer, 400, {"error": "invalid Content-Length"}, False)
+                    break
+                if length > Config.API_MAX_BODY_BYTES:
+                    await self.write_response(writer, 413, {"error": "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                path, _, query = target.partition("?")
+                status, payload = await self.dispatch(method, path, body, client_ip, query)
+                http_requests_total.labels(metrics_path(path), status).inc()
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def write_response(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        """Serialize a JSON response (or send a text payload as is)"""
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), CONTENT_TYPE
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method: str, path: str, body: bytes, client_ip: str = None,
+                       query: str = "") -> Tuple[int, Dict]:
+        """Route a request to its handler"""
+        try:
+            if path == "/health":
+                return 200, {"status": "ok", "sessions": self.session_store.stats(),
+                             "deduplicated_lookups": flight_stats(),
+                             "circuit_breakers": breaker_stats(),
+                             "latency_budget": deadline_stats(),
+                             "llm_extraction": llm_stats(),
+                             "conversation_log": conversation_log_stats(),
+                             "analytics": analytics_stats(),
+                             "feedback": feedback_stats(),
+                             "rate_limit": rate_limit_stats(),
+                             "response_cache": self.stateless_engine.cache_stats(),
+                             "stage_timings": stage_timing_stats(),
+                             "tracing": tracing_stats(),
+                             "profiler": profiler_stats(),
+                             "uptime": round(time.time() - self.started_at, 1)}
+
+            if path == "/metrics":
+                return 200, REGISTRY.render()
+
+            if path == "/admin/profile":
+                return self.admin_profile(method, query, body, client_ip)
+
+            if path.startswith("/v1/sessions/"):
+                session_id = path.rsplit("/", 1)[-1]
+                if method == "GET":
+                    return self.session_usage(session_id)
+                if method != "DELETE":
+                    return 405, {"error": "use GET or DELETE"}
+                self.session_store.delete(session_id)
+                self.history_spill.delete(session_id)
+                if self.prefetcher is not None:
+                    self.prefetcher.cancel_session(session_id)
+                return 200, {"session_id": session_id, "deleted": True}
+
+            if path not in ("/v1/chat", "/v1/query"):
+                return 404, {"error": f"unknown path {path}"}
+            if method != "POST":
+                return 405, {"error": "use POST"}
+
+            try:
+                request = json.loads(body.decode("utf-8") or "{}")
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                return 400, {"error": "body must be JSON"}
+            if not isinstance(request, dict):
+                return 400, {"error": "body must be a JSON object"}
+
+            message = str(request.get("message", "")).strip()
+            if not message:
+                return 400, {"error": "message is required"}
+            if len(message) > Config.MAX_MESSAGE_LENGTH:
+                return 413, {"error": f"message longer than {Config.MAX_MESSAGE_LENGTH} characters"}
+
+            if self.rate_limited and not allow_request(request.get("session_id"), client_ip):
+                language = request.get("language", "English" if path == "/v1/chat" else Config.DEFAULT_LANGUAGE)
+                return 429, {"error": "rate limit exceeded", "rate_limited": True,
+                             "response": self.stateless_engine.get_busy_response(language, rate_limited=True)}
+
+            if path == "/v1/chat":
+                return 200, await self.handle_chat(request, message)
+            return 200, await self.handle_query(request, message)
+
+        except Exception as e:
+            print(f"Error handling {method} {path}: {e}")
+            return 500, {"error": "internal error"}
+
+    def admin_profile(self, method: str, query: str, body: bytes, client_ip: str = None) -> Tuple[int, Dict]:
+        """Start a time-limited profiler capture (?seconds=N or {"seconds": N}) or report on the last one"""
+        if client_ip not in LOOPBACK_ADDRESSES:
+            return 403, {"error": "admin endpoints only answer loopback clients"}
+        if method == "GET":
+            return 200, profiler_stats()
+        if method != "POST":
+            return 405, {"error": "use GET or POST"}
+        try:
+            seconds = requested_seconds(query, body)
+        except ValueError:
+            return 400, {"error": "use ?seconds=30 or a JSON body like {\"seconds\": 30}"}
+        result = start_profile(seconds)
+        return (200 if result["started"] else 409), result
+
+    async def handle_chat(self, request: Dict, message: str) -> Dict:
+        """One turn of the guided conversation for a server-side session"""
+        session_id = request.get("session_id") or uuid.uuid4().hex
+        language = request.get("language", "English")
+
+        if not admission.try_enter():
+            return {"session_id": session_id, "shed": True,
+                    "response": self.stateless_engine.get_busy_response(language)}
+
+        entry = self.session_locks.setdefault(session_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                loop = asyncio.get_running_loop()
+                response, engine = await loop.run_in_executor(
+                    self.executor, self.run_chat_turn, session_id, message, language
+                )
+        finally:
+            admission.leave()
+            entry[1] -= 1
+            if not entry[1]:
+                self.session_locks.pop(session_id, None)
+
+        return {
+            "session_id": session_id,
+            "response": response,
+            "conversation_stage": engine.conversation_stage,
+            "user_profile": engine.user_profile,
+            "waiting_for_city": engine.waiting_for_city,
+            **budget_tags(engine.last_deadline),
+            **trace_tags(engine.last_trace_id),
+        }
+
+    def run_chat_turn(self, session_id: str, message: str, language: str):
+        """Load session, run one engine turn, save session (worker thread)"""
+        state = self.session_store.load(session_id) or {}
+        engine = EnhancedConversationEngine.from_state(state.get("e"))
+        history = state.get("m", [])
+        engine.session_id = session_id
+
+        if self.prefetcher is not None:
+            engine.prefetcher = self.prefetcher
+            if not state:
+                self.prefetcher.prefetch_user_location(session_id, engine)
+
+        response = engine.process_query(message, language)
+
+        history = unpack_messages(history) + [
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": response},
+        ]
+        history, overflow = cap_history(history, Config.MAX_HISTORY_MESSAGES, Config.SESSION_MEMORY_BUDGET)
+        if overflow:
+            self.history_spill.spill(session_id, overflow)
+        elif state.get("n"):
+            self.history_spill.touch(session_id)
+
+        self.session_store.save(session_id, {
+            "e": engine.to_state(),
+            "m": pack_messages(history),
+            "l": language,
+            "n": state.get("n", 0) + len(overflow),
+        })
+        return response, engine
+
+    def session_usage(self, session_id: str) -> Tuple[int, Dict]:
+        """Memory accounting for one stored session"""
+        state = self.session_store.load(session_id)
+        if state is None:
+            return 404, {"error": "unknown or expired session"}
+        usage = session_memory_usage(state.get("e"), unpack_messages(state.get("m", [])), state.get("n", 0))
+        usage["session_id"] = session_id
+        usage["budget_bytes"] = Config.SESSION_MEMORY_BUDGET
+        return 200, usage
+
+    async def handle_query(self, request: Dict, message: str) -> Dict:
+        """Stateless lookup against the scheme database"""
+        language = request.get("language", Config.DEFAULT_LANGUAGE)
+        if not admission.try_enter():
+            return {"response": self.stateless_engine.get_busy_response(language), "shed": True}
+        try:
+            loop = asyncio.get_running_loop()
+            response, deadline, trace_id = await loop.run_in_executor(self.executor, self.run_query, message, language)
+        finally:
+            admission.leave()
+        return {"response": response, **budget_tags(deadline), **trace_tags(trace_id)}
+
+    def run_query(self, message: str, language: str):
+        """Stateless lookup (worker thread)"""
+        response = self.stateless_engine.process_query(message, language)
+        deadline = last_turn_deadline()
+        trace_id = last_trace_id()
+        log_turn(None, language, message, response, "query",
+                 deadline.elapsed() if deadline else None, deadline.degraded_stages if deadline else None, trace_id)
+        return response, deadline, trace_id
+
+
+def metrics_path(path: str) -> str:
+    """Path label with session ids collapsed, so the label set stays small"""
+    if path.startswith("/v1/sessions/"):
+        return "/v1/sessions/<id>"
+    return path if path in ("/v1/chat", "/v1/query", "/health", "/metrics", "/admin/profile") else "other"
+
+
+def trace_tags(trace_id: Optional[str]) -> Dict:
+    """Expose the turn's trace id in debug mode"""
+    return {"trace_id": trace_id} if Config.DEBUG and trace_id else {}
+
+
+def budget_tags(deadline) -> Dict:
+    """Tag a response that hit the per-turn latency budget"""
+    if deadline is None or not deadline.exceeded:
+        return {"budget_exceeded": False}
+    return {"budget_exceeded": True, "degraded_stages": deadline.degraded_stages}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SaarthakAI headless API server")
+    parser.add_argument("--host", default=Config.API_HOST)
+    parser.add_argument("--port", type=int, default=Config.API_PORT)
+    parser.add_argument("--workers", type=int, default=Config.API_WORKERS)
+    args = parser.parse_args()
+
+    server = SaarthakAPIServer(args.host, args.port, args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# src/circuit_breaker.py - Per-dependency circuit breakers with adaptive timeouts
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from config import get_config
+from src.metrics import REGISTRY, external_call_seconds, external_errors_total
+
+Config = get_config()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open"""
+
+
+class CircuitBreaker:
+    """Fail fast when an external service is down or slow
+
+    The breaker opens after `failure_threshold` consecutive failures (errors,
+    timeouts, 5xx, or calls slower than `slow_call_seconds`). While open every
+    call fails immediately so callers drop to their offline fallback. After
+    `reset_timeout` one probe call is let through (half-open); success closes
+    the breaker, failure re-opens it.
+
+    Timeouts come from observed latency: twice the p99 of recent successful
+    calls, clamped to [min_timeout, max_timeout]. Until enough samples exist the
+    max_timeout (the old fixed constant) is used.
+    """
+
+    def __init__(self, name: str, max_timeout: float, min_timeout: float = 0.5,
+                 failure_threshold: int = 3, slow_call_seconds: Optional[float] = None,
+                 reset_timeout: float = 30.0, window: int = 50, min_samples: int = 10):
+        self.name = name
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds if slow_call_seconds is not None else max_timeout * 0.8
+        self.reset_timeout = reset_timeout
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def current_timeout(self) -> float:
+        """Timeout derived from recent latency percentiles"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.max_timeout
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        return max(self.min_timeout, min(self.max_timeout, p99 * 2))
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(latency)
+            if latency > self.slow_call_seconds:
+                self._register_failure()
+                return
+            self.consecutive_failures = 0
+            self.state = CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.calls += 1
+            self._register_failure()
+
+    def release_probe(self):
+        """Let another half-open probe through without judging this call"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _register_failure(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def call(self, fn: Callable, *args, is_failure: Callable = None, **kwargs):
+        """Call fn(*args, timeout=<adaptive>, **kwargs) under the breaker"""
+        if not self.allow_request():
+            external_errors_total.labels(self.name, "circuit_open").inc()
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        adaptive_timeout = self.current_timeout()
+        timeout = kwargs.setdefault("timeout", adaptive_timeout)
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            external_call_seconds.labels(self.name).observe(elapsed)
+            external_errors_total.labels(self.name, "timeout" if "Timeout" in type(e).__name__ else "error").inc()
+            # A timeout we shortened for the caller's latency budget says nothing about the dependency
+            if timeout < adaptive_timeout and elapsed >= timeout:
+                self.release_probe()
+            else:
+                self.record_failure()
+            raise
+
+        elapsed = time.perf_counter() - start
+        external_call_seconds.labels(self.name).observe(elapsed)
+        if is_failure is not None and is_failure(result):
+            external_errors_total.labels(self.name, "server_error").inc()
+            self.record_failure()
+        else:
+            self.record_success(elapsed)
+        return result
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            state = self.state
+            if state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                state = HALF_OPEN
+            snapshot = {
+                "state": state,
+                "consecutive_failures": self.consecutive_failures,
+                "calls": self.calls,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+            }
+        snapshot["timeout"] = round(self.current_timeout(), 3)
+        return snapshot
+
+
+def is_server_error(response) -> bool:
+    """Treat HTTP 5xx and 429 (rate limited) responses as dependency failures"""
+    return response.status_code >= 500 or response.status_code == 429
+
+
+nominatim_breaker = CircuitBreaker(
+    "nominatim",
+    max_timeout=Config.NOMINATIM_TIMEOUT,
+    failure_threshold=Config.BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=Config.BREAKER_RESET_TIMEOUT,
+)
+ipapi_breaker = CircuitBreaker(
+    "ipapi",
+    max_timeout=Config.IPAPI_TIMEOUT,
+    failure_threshold=Config.BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=Config.BREAKER_RESET_TIMEOUT,
+)
+ollama_breaker = CircuitBreaker(
+    "ollama",
+    max_timeout=Config.OLLAMA_TIMEOUT,
+    failure_threshold=Config.BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=Config.BREAKER_RESET_TIMEOUT,
+)
+
+
+def breaker_stats() -> Dict:
+    """State of every dependency breaker"""
+    return {breaker.name: breaker.snapshot() for breaker in (nominatim_breaker, ipapi_breaker, ollama_breaker)}
+
+
+def _collect_breakers():
+    snapshots = breaker_stats()
+    return [
+        ("saarthak_breaker_open", "gauge", "1 while a dependency's circuit is open or half-open",
+         [({"dependency": name}, int(snapshot["state"] != CLOSED)) for name, snapshot in snapshots.items()]),
+        ("saarthak_breaker_timeout_seconds", "gauge", "Adaptive timeout currently used per dependency",
+         [({"dependency": name}, snapshot["timeout"]) for name, snapshot in snapshots.items()]),
+    ]
+
+
+REGISTRY.add_collector("breakers", _collect_breakers)
@@ -1,17 +1,38 @@
 # src/conversation_engine.py - Working Conversation Engine
 
+import hashlib
 import json
 import re
 from typing import Dict, List, Optional
 import os
 from pathlib import Path
 
+from config import get_config
+from src.deadline import deadline_scope, has_time_for, turn_budget
+from src.language_packs import pack_for, resolve_code
+from src.metrics import count_error, observe_turn, register_cache
+from src.profiler import stage_tag
+from src.response_cache import ResponseCache, normalize_query
+from src.scheme_render import build_scheme_summaries, scheme_key
+from src.stage_timing import record_stage, timed_stage
+from src.tracing import span, trace_turn
+
 class SaarthakConversationEngine:
     """Enhanced conversation engine with real government schemes data"""
     
     def __init__(self):
+        config = get_config()
         self.schemes_data = self.load_schemes_database()
+        self.schemes_version = self.compute_schemes_version(self.schemes_data)
+        self.scheme_summaries = build_scheme_summaries(self.schemes_data)
         self.user_context = {}
+        self.response_cache = None
+        if config.CACHED_RESPONSES:
+            disk_path = config.RESPONSE_CACHE_PATH if config.PERSIST_RESPONSE_CACHE else None
+            self.response_cache = ResponseCache(config.CACHE_SIZE, config.RESPONSE_CACHE_TTL, disk_path)
+            self.response_cache.reload(self.schemes_version)
+            register_cache("responses", self.response_cache.stats)
+        self._busy_responses = {}
         
     def load_schemes_database(self) -> List[Dict]:
         """Load schemes database with fallback to hardcoded data"""
@@ -24,11 +45,39 @@ class SaarthakConversationEngine:
                     data = json.load(f)
                     return data.get('schemes', [])
         except Exception as e:
+            count_error("schemes_database")
             print(f"Could not load schemes database: {e}")
         
         # Fallback to hardcoded schemes data
         return self.get_hardcoded_schemes()
     
+    @staticmethod
+    def compute_schemes_version(schemes: List[Dict]) -> str:
+        """Content hash of the scheme database, used to key cached answers"""
+        
+        payload = json.dumps(schemes, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+    
+    def reload_schemes_database(self) -> bool:
+        """Re-read the scheme database and invalidate answers cached against the old one"""
+        
+        schemes = self.load_schemes_database()
+        version = self.compute_schemes_version(schemes)
+        changed = version != self.schemes_version
+        self.schemes_data = schemes
+        self.schemes_version = version
+        self.scheme_summaries = build_scheme_summaries(schemes)
+        if self.response_cache is not None:
+            self.response_cache.reload(version)
+        return changed
+    
+    def cache_stats(self) -> Dict:
+        """Response cache counters (hit ratio included)"""
+        
+        if self.response_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, "schemes_version": self.schemes_version, **self.response_cache.stats()}
+    
     def get_hardcoded_schemes(self) -> List[Dict]:
         """Hardcoded schemes data for demo purposes"""
         
@@ -176,22 +225,55 @@ class SaarthakConversationEngine:
     def process_query(self, user_input: str, language: str = "hindi") -> str:
         """Process user query and return appropriate response"""
         
-        try:
-            # Extract user information
-            user_info = self.extract_user_info(user_input)
-            
-            # Find matching schemes
-            matching_schemes = self.find_matching_schemes(user_input, user_info)
-            
-            # Generate response
-            if matching_schemes:
-                return self.generate_scheme_response(matching_schemes, language)
-            else:
-                return self.generate_general_response(user_input, language)
+        # One cache entry per rendered language, however the caller spelled it
+        language = "english" if resolve_code(language) == "en" else "hindi"
+        with trace_turn("query.turn", language=language) as trace, stage_tag("query"), \
+                deadline_scope(turn_budget(get_config())) as deadline:
+            intent = None
+            try:
+                # Same phrasing, same language, same scheme data -> same answer
+                query = normalize_query(user_input)
+                if self.response_cache is not None:
+                    with timed_stage("query.cache"), span("cache"):
+                        cached = self.response_cache.get(self.schemes_version, language, query)
+                    if cached is not None:
+                        intent = "cached"
+                        return cached
                 
-        except Exception as e:
-            print(f"Error in process_query: {e}")
-            return self.get_fallback_response(language)
+                # Extract user information
+                with timed_stage("query.extract"), span("extraction"):
+                    user_info = self.extract_user_info(query)
+                intent = user_info.get("category", "general")
+                
+                # Out of budget: answer with the templated overview instead of matching
+                if not has_time_for("matching"):
+                    return self.generate_general_response(query, language)
+                
+                # Find matching schemes
+                with timed_stage("query.matching"), span("matching"):
+                    matching_schemes = self.find_matching_schemes(query, user_info)
+                
+                # Generate response
+                with timed_stage("query.render"), span("render"):
+                    if matching_schemes:
+                        response = self.generate_scheme_response(matching_schemes, language)
+                    else:
+                        response = self.generate_general_response(query, language)
+                
+                # Degraded answers are not worth remembering
+                if self.response_cache is not None and not deadline.exceeded:
+                    self.response_cache.set(self.schemes_version, language, query, response)
+                return response
+                    
+            except Exception as e:
+                intent = "error"
+                count_error("query_engine")
+                print(f"Error in process_query: {e}")
+                return self.get_fallback_response(language)
+            finally:
+                record_stage("query.turn", deadline.elapsed())
+                observe_turn("query", intent, deadline.elapsed())
+                trace.set("intent", intent)
     
     def extract_user_info(self, user_input: str) -> Dict:
         """Extract user information from input"""
@@ -255,15 +337,14 @@ class SaarthakConversationEngine:
             if user_info.get("profession") and user_info["profession"] in target_group:
                 score += 4
             
-            # Add scheme if it has any relevance
+            # Add scheme if it has any relevance (scored locally: the scheme dicts are shared across threads)
             if score > 0:
-                scheme["match_score"] = score
-                matching_schemes.append(scheme)
+                matching_schemes.append((score, scheme))
         
         # Sort by relevance score
-        matching_schemes.sort(key=lambda x: x.get("match_score", 0), reverse=True)
+        matching_schemes.sort(key=lambda x: x[0], reverse=True)
         
-        return matching_schemes[:3]  # Return top 3 matches
+        return [scheme for _, scheme in matching_schemes[:3]]  # Return top 3 matches
     
     def generate_scheme_response(self, schemes: List[Dict], language: str) -> str:
         """Generate response with scheme information"""
@@ -273,19 +354,11 @@ class SaarthakConversationEngine:
         else:
             response = "बहुत अच्छा! आपके लिए ये सरकारी योजनाएं हैं:\n\n"
         
+        # Entries are pre-rendered per language; only the numbering is done here
+        summary_language = "english" if language == "english" else "hindi"
         for i, scheme in enumerate(schemes, 1):
-            if language == "english":
-                response += f"**{i}. {scheme['name_english']}**\n"
-                response += f"💰 Benefit: {scheme['benefits']['description']}\n"
-                response += f"✅ Eligibility: {scheme['eligibility']['criteria']}\n"
-                response += f"📄 Documents: {', '.join(scheme['documents'][:3])}\n"
-                response += f"🌐 Apply: {scheme['application_process']['website']}\n\n"
-            else:
-                response += f"**{i}. {scheme['name_hindi']}**\n"
-                response += f"💰 लाभ: {scheme['benefits']['description']}\n"
-                response += f"✅ पात्रता: {scheme['eligibility']['criteria']}\n"
-                response += f"📄 दस्तावेज: {', '.join(scheme['documents'][:3])}\n"
-                response += f"🌐 आवेदन: {scheme['application_process']['website']}\n\n"
+            name, body = self.scheme_summaries[scheme_key(scheme)][summary_language]
+            response += f"**{i}. {name}**\n{body}"
         
         if language == "english":
             response += "Would you like more details about any specific scheme?"
@@ -326,6 +399,15 @@ Popular schemes:
 💼 मुद्रा लोन - व्यापार के लिए ₹10 लाख तक
             """
     
+    def get_busy_response(self, language: str, rate_limited: bool = False) -> str:
+        """Canned answer for rate-limited or load-shed turns, in the session's language pack (or English)"""
+        
+        pack = pack_for(language)
+        key = (pack.code, rate_limited)
+        if key not in self._busy_responses:
+            self._busy_responses[key] = pack.text("rate_limited" if rate_limited else "busy")
+        return self._busy_responses[key]
+    
     def get_fallback_response(self, language: str) -> str:
         """Fallback response when there's an error"""
         
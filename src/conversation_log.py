@@ -0,0 +1,292 @@
+# src/conversation_log.py - Append-only conversation log with group-commit writes and rotation
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from config import get_config
+
+Config = get_config()
+
+_STOP = object()
+
+
+class ConversationLog:
+    """JSON-lines log of conversation turns, written off the request thread
+
+    log() only enqueues a dict (microseconds). A background writer drains the
+    queue in groups, writes each group with one write() and makes it durable
+    with one fsync (group commit). The active file is rotated when it exceeds
+    `max_bytes` or the day changes; rotated segments are gzipped in the
+    background when `compress` is set, and with `max_segments` only the newest
+    that many rotated segments are kept. If the writer falls behind by more than
+    `max_queue` records, new records are dropped and counted rather than
+    blocking a turn.
+    """
+
+    def __init__(self, path, max_bytes: int = 64 * 1024 * 1024, rotate_daily: bool = True,
+                 compress: bool = True, flush_interval: float = 0.2, batch_size: int = 512,
+                 max_queue: int = 10000, max_segments: Optional[int] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.max_segments = max_segments
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._size = 0
+        self._day = None
+        self.logged = 0
+        self.written = 0
+        self.dropped = 0
+        self.commits = 0
+        self.rotations = 0
+        self.pruned = 0
+        self._thread = threading.Thread(target=self._run, name="conversation-log", daemon=True)
+        self._thread.start()
+
+    def log(self, record: Dict):
+        """Queue one record; never blocks"""
+        try:
+            self._queue.put_nowait(record)
+            self.logged += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            closes_at = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, closes_at - time.monotonic())))
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not _STOP]
+            if records:
+                try:
+                    self._commit(records)
+                except OSError as e:
+                    print(f"Conversation log write failed: {e}")
+            if batch[-1] is _STOP:
+                self._close_file()
+                return
+
+    def _commit(self, records: List[Dict]):
+        data = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+        data = data.encode("utf-8")
+        self._maybe_rotate(len(data))
+        if self._file is None:
+            self._open_file()
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._size += len(data)
+        self.written += len(records)
+        self.commits += 1
+
+    def _open_file(self):
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        if self._size:
+            self._day = date.fromtimestamp(self.path.stat().st_mtime)
+        else:
+            self._day = date.today()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _maybe_rotate(self, incoming: int):
+        if self._file is None:
+            if not self.path.exists():
+                return
+            self._open_file()
+        new_day = self.rotate_daily and self._day != date.today()
+        too_big = self._size and self._size + incoming > self.max_bytes
+        if not (new_day or too_big):
+            return
+
+        self._close_file()
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"{int(now * 1000) % 1000:03d}"
+        segment = self.path.with_name(f"{self.path.stem}-{stamp}{self.path.suffix}")
+        counter = 1
+        while segment.exists() or segment.with_name(segment.name + ".gz").exists():
+            segment = self.path.with_name(f"{self.path.stem}-{stamp}-{counter}{self.path.suffix}")
+            counter += 1
+        os.replace(self.path, segment)
+        self.rotations += 1
+        if self.max_segments is not None:
+            self.pruned += prune_segments(self.path, self.max_segments)
+        if self.compress:
+            threading.Thread(target=compress_segment, args=(segment,), name="conversation-log-gzip",
+                             daemon=True).start()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything logged so far is on disk"""
+        end = time.monotonic() + timeout
+        while self.written + self.dropped < self.logged:
+            if time.monotonic() >= end:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        return {
+            "logged": self.logged,
+            "written": self.written,
+            "dropped": self.dropped,
+            "commits": self.commits,
+            "records_per_commit": round(self.written / self.commits, 1) if self.commits else 0.0,
+            "rotations": self.rotations,
+            "pruned": self.pruned,
+            "queued": self._queue.qsize(),
+        }
+
+
+def compress_segment(segment: Path):
+    """gzip a rotated segment; readers see either the plain or the finished .gz file"""
+    target = segment.with_name(segment.name + ".gz")
+    partial = segment.with_name(segment.name + ".gz.tmp")
+    try:
+        with open(segment, "rb") as src, gzip.open(partial, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(partial, target)
+        os.remove(segment)
+    except OSError as e:
+        print(f"Compressing {segment} failed: {e}")
+
+
+def prune_segments(path, keep: int) -> int:
+    """Delete all but the newest `keep` rotated segments of the log at `path`; returns how many went"""
+    path = Path(path)
+    rotated = [segment for segment in log_segments(path) if segment != path]
+    removed = 0
+    for segment in rotated[:max(0, len(rotated) - keep)]:
+        plain = segment.with_name(segment.name[:-3]) if segment.name.endswith(".gz") else segment
+        for candidate in (plain, plain.with_name(plain.name + ".gz"), plain.with_name(plain.name + ".gz.tmp")):
+            try:
+                os.remove(candidate)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Removing {candidate} failed: {e}")
+        removed += 1
+    return removed
+
+
+def _segment_order(path: Path, name: str):
+    """Sort key for a rotated segment name: (stamp, collision counter)
+
+    "<stem>-<stamp>-1.jsonl" was rotated after "<stem>-<stamp>.jsonl", but
+    sorts before it as a string ('-' < '.').
+    """
+    match = re.fullmatch(re.escape(path.stem) + r"-(\d{8}-\d+)(?:-(\d+))?" + re.escape(path.suffix), name)
+    if match is None:
+        return (name, -1)
+    return (match.group(1), int(match.group(2) or 0))
+
+
+def log_segments(path) -> List[Path]:
+    """Rotated segments (oldest first) followed by the active file"""
+    path = Path(path)
+    segments = {}
+    for candidate in path.parent.glob(f"{path.stem}-*{path.suffix}*"):
+        if candidate.name.endswith(".tmp"):
+            continue
+        plain = candidate.name[:-3] if candidate.name.endswith(".gz") else candidate.name
+        # Mid-compression both files exist; the plain one is complete
+        if plain not in segments or not candidate.name.endswith(".gz"):
+            segments[plain] = candidate
+    ordered = [segments[name] for name in sorted(segments, key=lambda name: _segment_order(path, name))]
+    if path.exists():
+        ordered.append(path)
+    return ordered
+
+
+def read_conversations(path=None, since: Optional[float] = None) -> Iterator[Dict]:
+    """Stream logged turns, oldest first, without loading whole files
+
+    `since` is a Unix timestamp; older records are skipped. A torn last line
+    (the process died mid-write) is ignored.
+    """
+    for segment in log_segments(path or Config.CONVERSATIONS_DB_PATH):
+        if not segment.exists() and segment.with_name(segment.name + ".gz").exists():
+            segment = segment.with_name(segment.name + ".gz")  # compressed since it was listed
+        opener = gzip.open if segment.suffix == ".gz" else open
+        try:
+            with opener(segment, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if since is not None and record.get("ts", 0) < since:
+                        continue
+                    yield record
+        except (OSError, EOFError) as e:
+            print(f"Skipping conversation log segment {segment}: {e}")
+
+
+_log: Optional[ConversationLog] = None
+_log_lock = threading.Lock()
+
+
+def get_conversation_log() -> Optional[ConversationLog]:
+    """Process-wide log (None when ENABLE_CONVERSATION_LOG is off); started on first use"""
+    global _log
+    if not Config.ENABLE_CONVERSATION_LOG:
+        return None
+    with _log_lock:
+        if _log is None:
+            _log = ConversationLog(
+                Config.CONVERSATIONS_DB_PATH,
+                max_bytes=Config.CONVERSATION_LOG_MAX_BYTES,
+                rotate_daily=Config.CONVERSATION_LOG_ROTATE_DAILY,
+                compress=Config.COMPRESS_CONVERSATION_LOGS,
+                flush_interval=Config.CONVERSATION_LOG_FLUSH_INTERVAL,
+            )
+            atexit.register(_log.close)
+    return _log
+
+
+def log_turn(session_id: Optional[str], language: str, user: str, assistant: str,
+             stage: str = None, seconds: float = None, degraded: List[str] = None, trace_id: str = None):
+    """Record one turn in the conversation log"""
+    conversation_log = get_conversation_log()
+    if conversation_log is None:
+        return
+    conversation_log.log({
+        "ts": round(time.time(), 3),
+        "sid": session_id,
+        "lang": language,
+        "stage": stage,
+        "user": user,
+        "assistant": assistant,
+        "ms": round(seconds * 1000, 1) if seconds is not None else None,
+        "degraded": degraded or [],
+        "trace": trace_id,
+    })
+
+
+def conversation_log_stats() -> Dict:
+    return _log.stats() if _log is not None else {"enabled": Config.ENABLE_CONVERSATION_LOG}
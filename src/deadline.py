@@ -0,0 +1,126 @@
+# src/deadline.py - Per-turn latency budget propagated to every stage
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+_current_deadline = contextvars.ContextVar("saarthak_deadline", default=None)
+_last_deadline = contextvars.ContextVar("saarthak_last_deadline", default=None)
+
+_stats_lock = threading.Lock()
+_stats = {"turns": 0, "over_budget": 0, "by_stage": {}}
+
+
+class Deadline:
+    """Time budget for one process_query turn"""
+
+    def __init__(self, budget: Optional[float]):
+        self.budget = budget
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget if budget is not None else None
+        self.degraded_stages: List[str] = []
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def degrade(self, stage: str):
+        """Record that a stage fell back to a cached/templated answer for lack of time"""
+        if stage not in self.degraded_stages:
+            self.degraded_stages.append(stage)
+
+    @property
+    def exceeded(self) -> bool:
+        return bool(self.degraded_stages)
+
+
+def turn_budget(config) -> Optional[float]:
+    """Budget for one turn: MAX_RESPONSE_TIME when FAST_RESPONSES is on"""
+    return config.MAX_RESPONSE_TIME if config.FAST_RESPONSES else config.REQUEST_TIMEOUT
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def last_turn_deadline() -> Optional[Deadline]:
+    """Deadline of the turn that most recently finished in this thread/context"""
+    return _last_deadline.get()
+
+
+def remaining_time() -> float:
+    """Seconds left in the current turn (infinite outside a budgeted turn)"""
+    deadline = _current_deadline.get()
+    return deadline.remaining() if deadline is not None else float("inf")
+
+
+def wait_timeout() -> Optional[float]:
+    """Remaining budget as a blocking-wait timeout (None when unbounded)"""
+    deadline = _current_deadline.get()
+    return deadline.remaining() if deadline is not None and deadline.budget is not None else None
+
+
+def mark_degraded(stage: str):
+    """Tag the current turn as having degraded `stage`"""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.degrade(stage)
+
+
+def clamp_timeout(timeout: float) -> float:
+    """Shrink a network timeout so it cannot outlive the turn's budget"""
+    return min(timeout, remaining_time())
+
+
+def has_time_for(stage: str, needed: float = 0.0) -> bool:
+    """True if at least `needed` seconds remain; otherwise marks `stage` degraded"""
+    deadline = _current_deadline.get()
+    if deadline is None or deadline.remaining() > needed:
+        return True
+    deadline.degrade(stage)
+    return False
+
+
+@contextmanager
+def deadline_scope(budget: Optional[float]):
+    """Run a turn under a fresh deadline and count it in the budget statistics"""
+    deadline = Deadline(budget)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        try:
+            _current_deadline.reset(token)
+        except ValueError:
+            # A streaming generator finalized from another context
+            _current_deadline.set(None)
+        _last_deadline.set(deadline)
+        _record_turn(deadline)
+
+
+def _record_turn(deadline: Deadline):
+    with _stats_lock:
+        _stats["turns"] += 1
+        if deadline.exceeded:
+            _stats["over_budget"] += 1
+            for stage in deadline.degraded_stages:
+                _stats["by_stage"][stage] = _stats["by_stage"].get(stage, 0) + 1
+
+
+def deadline_stats() -> Dict:
+    """How many turns ran out of budget, and in which stages"""
+    with _stats_lock:
+        return {
+            "turns": _stats["turns"],
+            "over_budget": _stats["over_budget"],
+            "by_stage": dict(_stats["by_stage"]),
+        }
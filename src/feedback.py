@@ -0,0 +1,222 @@
+# src/feedback.py - Per-scheme feedback with in-memory aggregates and batched persistence
+
+import atexit
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import get_config
+
+Config = get_config()
+
+FEEDBACK_KINDS = ("up", "down", "applied")
+
+
+def income_band(income) -> str:
+    if not isinstance(income, (int, float)):
+        return "unknown"
+    if income < 100000:
+        return "<1L"
+    if income < 300000:
+        return "1-3L"
+    if income < 600000:
+        return "3-6L"
+    return "6L+"
+
+
+def age_band(age) -> str:
+    if not isinstance(age, (int, float)):
+        return "unknown"
+    if age < 30:
+        return "<30"
+    if age < 45:
+        return "30-44"
+    if age < 60:
+        return "45-59"
+    return "60+"
+
+
+def profile_bucket(profile: Dict) -> str:
+    """Coarse, non-identifying profile group, e.g. 'farmer|rural|1-3L|30-44'"""
+    return "|".join((
+        str(profile.get("profession") or "unknown"),
+        str(profile.get("location") or "unknown"),
+        income_band(profile.get("annual_income")),
+        age_band(profile.get("age")),
+    ))
+
+
+class FeedbackStore:
+    """Feedback counts per (scheme, profile bucket), kept in memory and persisted in batches
+
+    record() updates the in-memory aggregate and a pending delta under one
+    short lock; a background writer swaps out the pending deltas every
+    `flush_interval` seconds and commits them to SQLite in one transaction,
+    so a click never waits on disk. Pending deltas are merged per key, so
+    they stay small however far the writer falls behind; only the raw event
+    history (feedback_events) is capped at `max_pending` rows per batch.
+    Reads are dict lookups against the aggregate, which is loaded from the
+    database once at startup.
+    """
+
+    def __init__(self, path, flush_interval: float = 1.0, max_pending: int = 10000):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._pending_deltas: Dict[Tuple[str, str, str], int] = {}
+        self._pending_events: List[Tuple] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.recorded = 0
+        self.written = 0
+        self.events_dropped = 0
+        self.failed = 0
+        self.commits = 0
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS feedback_events ("
+            "ts REAL NOT NULL, session_id TEXT, scheme TEXT NOT NULL, bucket TEXT NOT NULL, "
+            "kind TEXT NOT NULL, delta INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS feedback_counts ("
+            "scheme TEXT NOT NULL, bucket TEXT NOT NULL, kind TEXT NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (scheme, bucket, kind))"
+        )
+        self._conn.commit()
+        for scheme, bucket, kind, count in self._conn.execute("SELECT scheme, bucket, kind, count FROM feedback_counts"):
+            self._counts.setdefault((scheme, bucket), {})[kind] = count
+        self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, scheme: str, bucket: str, kind: str, session_id: str = None, delta: int = 1):
+        """Count one feedback event (delta=-1 withdraws an earlier one); never blocks"""
+        if kind not in FEEDBACK_KINDS:
+            raise ValueError(f"Unknown feedback kind: {kind}")
+        with self._lock:
+            counts = self._counts.setdefault((scheme, bucket), {})
+            counts[kind] = max(0, counts.get(kind, 0) + delta)
+            key = (scheme, bucket, kind)
+            self._pending_deltas[key] = self._pending_deltas.get(key, 0) + delta
+            if len(self._pending_events) < self.max_pending:
+                self._pending_events.append((time.time(), session_id, scheme, bucket, kind, delta))
+            else:
+                self.events_dropped += 1
+            self.recorded += 1
+
+    def counts(self, scheme: str, bucket: str = None) -> Dict[str, int]:
+        """Counts per kind for a scheme, within one bucket or across all of them"""
+        with self._lock:
+            if bucket is not None:
+                return dict(self._counts.get((scheme, bucket), {}))
+            total = {}
+            for (counted_scheme, _), counts in self._counts.items():
+                if counted_scheme == scheme:
+                    for kind, count in counts.items():
+                        total[kind] = total.get(kind, 0) + count
+            return total
+
+    def scheme_counts(self, bucket: str) -> Dict[str, Dict[str, int]]:
+        """{scheme: counts per kind} for one profile bucket, for ranking"""
+        with self._lock:
+            return {scheme: dict(counts) for (scheme, counted_bucket), counts in self._counts.items()
+                    if counted_bucket == bucket}
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_pending()
+        self._write_pending()
+        self._conn.close()
+
+    def _write_pending(self):
+        with self._lock:
+            deltas, self._pending_deltas = self._pending_deltas, {}
+            events, self._pending_events = self._pending_events, []
+            upto = self.recorded
+        if not deltas:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO feedback_events (ts, session_id, scheme, bucket, kind, delta) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", events
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO feedback_counts (scheme, bucket, kind, count) VALUES (?, ?, ?, 0)",
+                    list(deltas)
+                )
+                self._conn.executemany(
+                    "UPDATE feedback_counts SET count = max(0, count + ?) "
+                    "WHERE scheme = ? AND bucket = ? AND kind = ?",
+                    [(delta, scheme, bucket, kind) for (scheme, bucket, kind), delta in deltas.items()]
+                )
+            self.commits += 1
+        except sqlite3.Error as e:
+            # Keep the counts for the next attempt; the event rows are only history
+            with self._lock:
+                for key, delta in deltas.items():
+                    self._pending_deltas[key] = self._pending_deltas.get(key, 0) + delta
+            self.failed += 1
+            print(f"Feedback write failed: {e}")
+            return
+        self.written = upto
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Commit everything recorded so far now; False if it did not finish in time"""
+        target = self.recorded
+        self._wake.set()
+        end = time.monotonic() + timeout
+        while self.written < target:
+            if time.monotonic() >= end or not self._thread.is_alive():
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            groups = len(self._counts)
+            pending = len(self._pending_deltas)
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "pending_keys": pending,
+            "events_dropped": self.events_dropped,
+            "failed": self.failed,
+            "commits": self.commits,
+            "groups": groups,
+        }
+
+
+_store: Optional[FeedbackStore] = None
+_store_lock = threading.Lock()
+
+
+def get_feedback_store() -> Optional[FeedbackStore]:
+    """Process-wide store (None when ENABLE_FEEDBACK is off); opened on first use"""
+    global _store
+    if not Config.ENABLE_FEEDBACK:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FeedbackStore(Config.FEEDBACK_DB_PATH, Config.FEEDBACK_FLUSH_INTERVAL)
+                atexit.register(_store.close)
+    return _store
+
+
+def feedback_stats() -> Dict:
+    return _store.stats() if _store is not None else {"enabled": Config.ENABLE_FEEDBACK}
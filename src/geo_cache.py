@@ -0,0 +1,21 @@
+# src/geo_cache.py - Process-wide caches for office and IP geolocation lookups
+
+from config import get_config
+from src.metrics import register_cache
+from src.ttl_cache import TTLCache
+
+Config = get_config()
+
+# (city, state) -> list of office addresses resolved through Nominatim
+office_cache = TTLCache(maxsize=Config.OFFICE_CACHE_SIZE, ttl=Config.OFFICE_CACHE_TTL)
+
+# "ipapi" -> location dict from get_user_location
+location_cache = TTLCache(maxsize=16, ttl=Config.LOCATION_CACHE_TTL)
+
+register_cache("offices", office_cache.stats)
+register_cache("ip_location", location_cache.stats)
+
+
+def office_key(city: str, state: str):
+    """Cache key for an office lookup, insensitive to case and spacing"""
+    return (" ".join(city.lower().split()), " ".join(state.lower().split()))
@@ -0,0 +1,138 @@
+# src/language_packs/__init__.py - Lazily loaded language packs shared by every session
+
+import importlib
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# code -> display name. This table is all that is read at startup; a pack
+# module (keywords, numerals, prompts, templates) is imported on first use.
+AVAILABLE_PACKS = {
+    "en": "English",
+    "hi": "हिंदी",
+    "mr": "मराठी",
+    "bn": "বাংলা",
+    "ta": "தமிழ்",
+}
+DEFAULT_PACK = "en"
+# Always matched: users mix English, Hindi and Hinglish whatever the UI language
+BASE_PACKS = ("en", "hi")
+
+_ALIASES = {name: code for code, name in AVAILABLE_PACKS.items()}
+_ALIASES.update({"english": "en", "hindi": "hi", "marathi": "mr", "bengali": "bn", "tamil": "ta"})
+
+
+class LanguagePack:
+    """Keywords, numerals, prompts and templates for one language"""
+
+    def __init__(self, data: Dict, fallback: "LanguagePack" = None):
+        self.code = data["code"]
+        self.name = data["name"]
+        self.display_name = data["display_name"]
+        self.digits = data.get("digits", "")
+        self.keywords = data.get("keywords", {})
+        self.numerals = data.get("numerals", {})
+        self.income_units = data.get("income_units", {})
+        self.prompts = data.get("prompts", {})
+        self.templates = data.get("templates", {})
+        self.fallback = fallback
+
+    def prompt(self, field: str) -> str:
+        """Question lines for `field` (this pack's default prompt, then English, if it lacks one)"""
+        lines = self.prompts.get(field) or self.prompts.get("default")
+        if lines is None:
+            if self.fallback is None:
+                raise KeyError(field)
+            return self.fallback.prompt(field)
+        return "\n".join(lines)
+
+    def text(self, key: str, **values) -> str:
+        """Template `key` formatted with values (English text if this pack lacks it)"""
+        template = self.templates.get(key)
+        if template is None:
+            if self.fallback is None:
+                raise KeyError(key)
+            return self.fallback.text(key, **values)
+        return template.format(**values) if values else template
+
+
+def resolve_code(language: str) -> str:
+    """Pack code for a code, display name or language name ('hi', 'हिंदी', 'hindi')"""
+    if language in AVAILABLE_PACKS:
+        return language
+    return _ALIASES.get(language) or _ALIASES.get(str(language).lower(), DEFAULT_PACK)
+
+
+@lru_cache(maxsize=None)
+def get_pack(code: str) -> LanguagePack:
+    """Import and build a pack once per process"""
+    data = importlib.import_module(f"src.language_packs.{code}").PACK
+    fallback = None if code == DEFAULT_PACK else get_pack(DEFAULT_PACK)
+    return LanguagePack(data, fallback)
+
+
+def pack_for(language: str) -> LanguagePack:
+    return get_pack(resolve_code(language))
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(codes: Tuple[str, ...]) -> Dict:
+    """Matcher tables merged from several packs, shared by every session using them
+
+    Same shape as the engine's language_patterns, plus `digits` (a str.translate
+    table mapping native digits such as ०-९, ০-৯, ௦-௯ to ASCII) and precompiled
+    `income_patterns`.
+    """
+    patterns = {
+        "age_indicators": [],
+        "profession_keywords": {},
+        "location_keywords": {},
+        "income_keywords": [],
+        "family_keywords": [],
+        "number_words": {},
+        "digits": {},
+    }
+    units = {"lakh": [], "thousand": [], "crore": []}
+    for code in codes:
+        pack = get_pack(code)
+        keywords = pack.keywords
+        patterns["age_indicators"].extend(keywords.get("age", []))
+        for profession, words in keywords.get("profession", {}).items():
+            patterns["profession_keywords"].setdefault(profession, []).extend(words)
+        for location_type, words in keywords.get("location", {}).items():
+            patterns["location_keywords"].setdefault(location_type, []).extend(words)
+        patterns["income_keywords"].extend(keywords.get("income", []))
+        patterns["family_keywords"].extend(keywords.get("family", []))
+        for word, number in pack.numerals.items():
+            patterns["number_words"].setdefault(word, number)
+        if pack.digits:
+            patterns["digits"].update(str.maketrans(pack.digits, "0123456789"))
+        for unit, words in pack.income_units.items():
+            units[unit].extend(words)
+
+    amount = r'(\d+(?:\.\d+)?)\s*'
+    patterns["income_patterns"] = [
+        (re.compile(amount + "(?:" + "|".join(units["lakh"] + ["l", "L"]) + ")"), 100000),
+        (re.compile(amount + "(?:" + "|".join(units["thousand"] + ["k", "K"]) + ")"), 1000),
+        (re.compile(amount + "(?:" + "|".join(units["crore"]) + ")"), 10000000),
+        (re.compile(r'(\d{1,3}(?:,\d{3})+)'), 1),
+        (re.compile(r'(\d{4,8})'), 1),
+    ]
+    return patterns
+
+
+def patterns_for(language: str) -> Dict:
+    """Matcher tables for a session's language (base packs + its own)"""
+    code = resolve_code(language)
+    codes = BASE_PACKS if code in BASE_PACKS else BASE_PACKS + (code,)
+    return compile_patterns(codes)
+
+
+def loaded_packs() -> Dict:
+    """Which packs this process has actually loaded"""
+    return {
+        "available": list(AVAILABLE_PACKS),
+        "loaded": sorted(code for code in AVAILABLE_PACKS if f"src.language_packs.{code}" in sys.modules),
+        "matchers": compile_patterns.cache_info().currsize,
+    }
@@ -0,0 +1,135 @@
+# src/language_packs/bn.py - Bengali language pack
+
+PACK = {
+    "code": "bn",
+    "name": "bengali",
+    "display_name": "বাংলা",
+    "digits": "০১২৩৪৫৬৭৮৯",
+
+    "keywords": {
+        "age": ["বয়স", "বছর", "boyosh", "bochor"],
+        "profession": {
+            "farmer": ["কৃষক", "চাষী", "চাষ", "কৃষি", "ফসল", "krishok", "chashi", "chash"],
+            "student": ["ছাত্র", "ছাত্রী", "পড়াশোনা", "স্কুল", "কলেজ", "chhatro", "chhatri", "porashona"],
+            "employee": ["চাকরি", "কর্মচারী", "অফিস", "কাজ করি", "chakri", "kormochari"],
+            "business_owner": ["ব্যবসা", "দোকান", "ব্যবসায়ী", "byabsa", "dokan", "byabsayi"],
+            "unemployed": ["বেকার", "কাজ নেই", "চাকরি নেই", "bekar", "kaj nei", "chakri nei"]
+        },
+        "location": {
+            "rural": ["গ্রাম", "গ্রামীণ", "gram", "gramin"],
+            "urban": ["শহর", "নগর", "শহুরে", "shohor", "nogor"]
+        },
+        "income": ["আয়", "বেতন", "রোজগার", "টাকা", "aay", "beton", "rojgar", "taka"],
+        "family": ["পরিবার", "সদস্য", "লোক", "poribar", "sodosyo"]
+    },
+
+    # Amount words for income ("2 lakh"); "l"/"k" shorthands are built in
+    "income_units": {
+        "lakh": ["লাখ", "লক্ষ"],
+        "thousand": ["হাজার"],
+        "crore": ["কোটি"]
+    },
+
+    "numerals": {
+        "এক": 1, "দুই": 2, "তিন": 3, "চার": 4, "পাঁচ": 5, "ছয়": 6, "সাত": 7, "আট": 8, "দশ": 10,
+        "এগারো": 11, "বারো": 12, "তেরো": 13, "চৌদ্দ": 14, "পনেরো": 15, "ষোলো": 16, "সতেরো": 17, "আঠারো": 18, "উনিশ": 19, "কুড়ি": 20
+    },
+
+    "prompts": {
+        "age": ["আপনার বয়স কত? 🎂", "*সংখ্যা লিখুন (যেমন: 25)*"],
+        "profession": ["আপনি কী করেন? 💼", "• 'কৃষক' 🌾 • 'ছাত্র' 📚 • 'চাকরি' 💼"],
+        "location": ["আপনি কোথায় থাকেন? 🏠", "• 'গ্রাম' 🌾 • 'শহর' 🏙️"],
+        "annual_income": ["পরিবারের বার্ষিক আয়? 💰", "যেমন: '2 লাখ' বা '50000'"],
+        "family_size": ["পরিবারে কতজন সদস্য? 👨‍👩‍👧‍👦", "*সংখ্যা লিখুন (যেমন: 4)*"],
+        "default": ["অনুগ্রহ করে আরও তথ্য দিন।"]
+    },
+
+    "templates": {
+        "welcome": """নমস্কার! আমি আপনার স্মার্ট সহকারী! 🚀
+
+মাত্র **5টি সহজ প্রশ্ন** করে আমি আপনার জন্য **সেরা প্রকল্প** খুঁজে দেব।
+
+আপনি **বাংলা, হিন্দি বা English**-এ উত্তর দিতে পারেন!
+
+**আপনার বয়স কত?** 🎂
+*উদাহরণ: "25", "পঁচিশ", "25 বছর"*""",
+        "chat_placeholder": "আপনার উত্তর লিখুন...",
+        "load_earlier": "⬆️ আগের বার্তা দেখুন",
+        "full_details": "সম্পূর্ণ তথ্য",
+        "contact": "যোগাযোগ",
+        "applied": "আমি আবেদন করেছি",
+        "helpful_count": "👍 আপনার মতো {count} জন এটি উপকারী মনে করেছেন",
+        "no_schemes": "আপনার প্রোফাইলের সাথে মেলে এমন কোনো প্রকল্প পাওয়া যায়নি।",
+        "recommendations_intro": """🎯 **দারুণ! আপনার জন্য সেরা সরকারি প্রকল্পগুলি পাওয়া গেছে!**
+
+যেকোনো প্রকল্পের সম্পূর্ণ তথ্য দেখতে নিচের কার্ডে ক্লিক করুন। 👇""",
+        "invalid_scheme_number": "ভুল প্রকল্প নম্বর। অনুগ্রহ করে আবার চেষ্টা করুন।",
+        "scheme_number_help": "অনুগ্রহ করে সঠিক প্রকল্প নম্বর বলুন (1, 2 বা 3)।",
+        "travel_tips": """
+**💡 যাওয়ার আগে পরামর্শ:**
+
+• **CSC কেন্দ্র** দ্রুত, অপেক্ষা কম
+• সব নথির **আসল + 2টি ফটোকপি** সঙ্গে নিন
+• কম ভিড়ের জন্য **11 AM - 3 PM**-এর মধ্যে যান
+""",
+        "offices_near_you": """
+**🏢 আপনার কাছের সরকারি অফিস ({city}, {state}):**
+
+""",
+        "quick_assistance": """
+**📱 দ্রুত সহায়তা:**
+
+• **সঠিক দিক:** Google Maps-এ "{office}" খুঁজুন
+• **ফোন সহায়তা:** 1800-180-1551 (জেলা হেল্পলাইন)
+• **সম্পূর্ণ তালিকা:** {state} সরকারি পোর্টাল দেখুন
+""",
+        "ask_city": """
+### 🏢 আপনার কাছের সরকারি অফিস খুঁজুন:
+
+**আপনার শহরের নাম বলুন**, আমি সঠিক অফিস খুঁজে দেব! 🎯
+
+*উদাহরণ: "কলকাতা", "হাওড়া", "শিলিগুড়ি", "দুর্গাপুর" লিখুন*
+
+---
+
+### 📋 সাধারণ অফিস:
+
+• **জেলা শাসকের অফিস** - প্রধান প্রশাসনিক কেন্দ্র
+• **ব্লক উন্নয়ন অফিস (BDO)** - গ্রামীণ প্রকল্পের আবেদন
+• **কমন সার্ভিস সেন্টার (CSC)** - ডিজিটাল পরিষেবা কেন্দ্র
+
+### 📞 হেল্পলাইন:
+
+• **সাধারণ সরকারি তথ্য:** 1800-180-1551
+• **CSC লোকেটর:** 1800-121-3468
+• **আধার সহায়তা:** 1947
+""",
+        "city_offices_header": "**🏢 {city}, {state}-এর সরকারি অফিস:**\n\n",
+        "city_offices_tips": """
+**📱 সঠিক অবস্থানের জন্য:**
+• Google Maps: "{office}" খুঁজুন
+• ফোন: 1800-180-1551-এ কল করুন
+• রাজ্য পোর্টাল: "{state} সরকারি অফিস" খুঁজুন
+
+**🚀 {city}-এর জন্য পরামর্শ:**
+• যাওয়ার সেরা সময়: 11 AM - 3 PM (কম ভিড়)
+• সঙ্গে নিন: সব আসল নথি + 2টি ফটোকপি
+
+**📞 {city} হেল্পলাইন:**
+• জেলা প্রশাসন: 1800-180-1551
+• আধার সহায়তা: 1947
+""",
+        "busy": """আমি আপনাকে সরকারি প্রকল্প খুঁজতে সাহায্য করতে পারি! অনুগ্রহ করে বলুন:
+- আপনি কী কাজ করেন? (কৃষক, ছাত্র, ব্যবসায়ী, ইত্যাদি)
+- আপনার কী ধরনের সাহায্য দরকার? (আর্থিক, স্বাস্থ্য, শিক্ষা, বাসস্থান)
+- আপনার বয়স কত?
+
+জনপ্রিয় প্রকল্প:
+🌾 PM Kisan - কৃষকদের জন্য ₹6,000/বছর
+🏥 আয়ুষ্মান ভারত - ₹5 লাখ স্বাস্থ্য বীমা
+🎓 বৃত্তি - ছাত্রছাত্রীদের ₹36,000 পর্যন্ত
+🏠 PM আবাস - বাড়ির জন্য ₹2.67 লাখ
+💼 মুদ্রা ঋণ - ব্যবসার জন্য ₹10 লাখ পর্যন্ত""",
+        "rate_limited": "সরকারি প্রকল্পের তথ্য দিতে আমি এখানে আছি! কৃষক, স্বাস্থ্য, শিক্ষা, বাসস্থান বা ব্যবসার প্রকল্প সম্পর্কে জিজ্ঞাসা করুন।"
+    }
+}
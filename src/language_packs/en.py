@@ -0,0 +1,141 @@
+# src/language_packs/en.py - English language pack
+
+PACK = {
+    "code": "en",
+    "name": "english",
+    "display_name": "English",
+    "digits": "",
+
+    "keywords": {
+        "age": ["age", "years old", "year old", "yrs", "i am"],
+        "profession": {
+            "farmer": ["farmer", "farming", "agriculture", "crop", "farm"],
+            "student": ["student", "study", "studying", "college", "school", "education"],
+            "employee": ["job", "work", "working", "employee", "service", "office"],
+            "business_owner": ["business", "shop", "store", "entrepreneur", "owner", "trade"],
+            "unemployed": ["unemployed", "no job", "jobless", "searching job"]
+        },
+        "location": {
+            "rural": ["village", "rural", "countryside", "farm area"],
+            "urban": ["city", "town", "urban", "metro", "municipal"]
+        },
+        "income": ["income", "salary", "earning", "earn", "rupees", "rs", "inr"],
+        "family": ["family", "members", "people", "persons"]
+    },
+
+    # Amount words for income ("2 lakh"); "l"/"k" shorthands are built in
+    "income_units": {
+        "lakh": ["lakh", "lakhs"],
+        "thousand": ["thousand", "thousands"],
+        "crore": ["crore", "crores"]
+    },
+
+    "numerals": {},
+
+    "prompts": {
+        "age": ["What is your age? 🎂", "*Type a number (e.g., 25)*"],
+        "profession": ["What do you do? 💼", "• 'farmer' 🌾 • 'student' 📚 • 'job' 💼"],
+        "location": ["Where do you live? 🏠", "• 'village' 🌾 • 'city' 🏙️"],
+        "annual_income": ["Family income per year? 💰", "e.g., '2 lakh' or '50000'"],
+        "family_size": ["How many family members? 👨‍👩‍👧‍👦", "*Type a number (e.g., 4)*"],
+        "default": ["Please provide more details."]
+    },
+
+    "templates": {
+        "welcome": """Hello! I'm your smart assistant! 🚀
+
+I'll find **perfect schemes** for you by asking just **5 quick questions**.
+
+You can respond in **English, Hindi, or Hinglish**!
+
+**What's your age?** 🎂
+*Examples: "25", "twenty five", "25 saal"*""",
+        "chat_placeholder": "Type your answer...",
+        "load_earlier": "⬆️ Load earlier messages",
+        "full_details": "Full Details",
+        "contact": "Contact",
+        "applied": "I applied",
+        "helpful_count": "👍 {count} people with a similar profile found this useful",
+        "no_schemes": "No schemes found matching your profile.",
+        "recommendations_intro": """🎯 **Perfect! Found the best government schemes for you!**
+
+Click on any card below to see complete details for that scheme. 👇""",
+        "invalid_scheme_number": "Invalid scheme number. Please try again.",
+        "scheme_number_help": "Please specify a valid scheme number (1, 2, or 3).",
+        "travel_tips": """
+**💡 Travel Tips:**
+
+• **CSC Centers** are faster with less waiting time
+• Carry **originals + 2 photocopies** of all documents
+• Visit during **11 AM - 3 PM** for shorter queues
+""",
+        "offices_near_you": """
+**🏢 Government Offices Near You ({city}, {state}):**
+
+""",
+        "quick_assistance": """
+**📱 Quick Assistance:**
+
+• **Exact Directions:** Search "{office}" on Google Maps
+• **Phone Support:** 1800-180-1551 (District Helpline)
+• **Complete List:** Visit {state} Government Portal
+""",
+        "ask_city": """
+### 🏢 Find Government Offices Near You:
+
+**Tell me your city name**, and I'll find exact offices! 🎯
+
+*Example: Type "Mumbai", "Delhi", "Jaipur", "Lucknow"*
+
+---
+
+### 📋 Common Office Types:
+
+• **District Collector Office** - Main administrative center
+• **Tehsil Office** - Sub-district level applications
+• **Block Development Office** - Rural scheme applications
+• **Common Service Center (CSC)** - Digital services hub
+
+### 📞 Universal Helplines:
+
+• **General Government Info:** 1800-180-1551
+• **CSC Locator:** 1800-121-3468
+• **Aadhaar Help:** 1947
+
+### 🌐 Online Resources:
+
+• Search "[Your City] District Collector Office" on Google Maps
+• Visit your state government website
+• Use 'Jan Aushadhi' app for nearest centers
+""",
+        "city_offices_header": "**🏢 Government Offices in {city}, {state}:**\n\n",
+        "city_offices_tips": """
+**📱 For Exact Locations:**
+• Google Maps: Search "{office}"
+• Phone Directory: Call 1800-180-1551
+• State Portal: Search "{state} government offices"
+
+**🚀 Quick Tips for {city}:**
+• Best time to visit: 11 AM - 3 PM (less crowded)
+• Carry: All originals + 2 photocopies
+• Parking: Most offices have visitor parking
+
+**📞 {city} Helplines:**
+• General Govt Info: 100
+• District Administration: 1800-180-1551
+• Aadhaar Support: 1947
+""",
+        "busy": """I can help you find government schemes! Please tell me:
+- What is your profession? (farmer, student, business owner, etc.)
+- What kind of help do you need? (financial, health, education, housing)
+- Your age group?
+
+Popular schemes:
+🌾 PM Kisan - ₹6,000/year for farmers
+🏥 Ayushman Bharat - ₹5 lakh health insurance
+🎓 Scholarships - Up to ₹36,000 for students
+🏠 PM Awas - ₹2.67 lakh housing subsidy
+💼 Mudra Loan - Up to ₹10 lakh for business""",
+        "rate_limited": "I'm here to help you find government schemes! Please ask about farmers, health, education, housing, or business schemes."
+    }
+}
@@ -0,0 +1,181 @@
+# src/language_packs/hi.py - Hindi / Hinglish language pack
+
+PACK = {
+    "code": "hi",
+    "name": "hindi",
+    "display_name": "हिंदी",
+    "digits": "०१२३४५६७८९",
+
+    "keywords": {
+        "age": ["umra", "umr", "saal", "varsh", "main", "hun", "hoon", "umar", "age hai", "saal ka", "saal ki"],
+        "profession": {
+            "farmer": [
+                "किसान", "खेती", "कृषि", "खेत", "फसल", "कृषक",
+                "kisan", "kheti", "krishi", "khet", "fasal", "krshak",
+                "farming karta", "kheti karta", "farmer hun"
+            ],
+            "student": [
+                "छात्र", "छात्रा", "पढ़ाई", "पढ़ता", "पढ़ती", "कॉलेज", "स्कूल", "शिक्षा",
+                "chatra", "chhatra", "padhai", "padhta", "padhti", "college", "school",
+                "student hun", "padh raha", "padh rahi", "study karta"
+            ],
+            "employee": [
+                "नौकरी", "काम", "कार्य", "सेवा", "ऑफिस", "कर्मचारी", "कामगार",
+                "naukri", "nokri", "kaam", "karya", "seva", "office", "karmchari",
+                "job karta", "kaam karta", "naukri hai", "service mein"
+            ],
+            "business_owner": [
+                "व्यापार", "व्यवसाय", "दुकान", "कारोबार", "धंधा", "मालिक",
+                "vyapar", "vyvasay", "dukan", "karobar", "dhanda", "malik",
+                "business karta", "shop hai", "vyapar karta"
+            ],
+            "unemployed": [
+                "बेरोजगार", "बिना काम", "काम नहीं", "नौकरी नहीं",
+                "berojgar", "berozgar", "kaam nahi", "naukri nahi", "job nahi",
+                "koi kaam nahi", "unemployed hun"
+            ]
+        },
+        "location": {
+            "rural": [
+                "गांव", "गाँव", "ग्रामीण", "देहात", "खेत",
+                "gaon", "ganv", "grameen", "dehat", "village mein",
+                "gaon se", "rural area"
+            ],
+            "urban": [
+                "शहर", "नगर", "महानगर", "कस्बा", "शहरी",
+                "sheher", "shahar", "nagar", "mahanagar", "kasba", "shahri",
+                "city mein", "town mein", "urban area"
+            ]
+        },
+        "income": [
+            "आय", "वेतन", "कमाई", "कमाता", "कमाती", "रुपए", "रुपये", "पैसा",
+            "aay", "vetan", "kamai", "kamata", "kamati", "rupee", "rupaye", "paisa",
+            "salary hai", "kamai hai", "income hai", "kamata hun"
+        ],
+        "family": [
+            "परिवार", "सदस्य", "लोग", "व्यक्ति", "घर", "घरवाले",
+            "parivar", "parivaar", "sadasya", "log", "vyakti", "ghar", "gharwale",
+            "family mein", "ghar mein", "members hai"
+        ]
+    },
+
+    # Amount words for income ("2 lakh"); "l"/"k" shorthands are built in
+    "income_units": {
+        "lakh": ["लाख", "लाखों"],
+        "thousand": ["हजार", "हज़ार"],
+        "crore": ["करोड़", "करोड़ों"]
+    },
+
+    "numerals": {
+        "एक": 1, "दो": 2, "तीन": 3, "चार": 4, "पांच": 5, "छह": 6, "सात": 7, "आठ": 8, "नौ": 9, "दस": 10,
+        "ग्यारह": 11, "बारह": 12, "तेरह": 13, "चौदह": 14, "पंद्रह": 15, "सोलह": 16, "सत्रह": 17, "अट्ठारह": 18, "उन्नीस": 19, "बीस": 20,
+        "ek": 1, "do": 2, "teen": 3, "char": 4, "panch": 5, "chhe": 6, "saat": 7, "aath": 8, "nau": 9, "das": 10,
+        "gyarah": 11, "barah": 12, "terah": 13, "chaudah": 14, "pandrah": 15, "solah": 16, "satrah": 17, "atharah": 18, "unnis": 19, "bees": 20
+    },
+
+    "prompts": {
+        "age": ["आपकी उम्र क्या है? 🎂", "*संख्या लिखें (जैसे: 25)*"],
+        "profession": ["आप क्या करते हैं? 💼", "• 'किसान' 🌾 • 'छात्र' 📚 • 'नौकरी' 💼"],
+        "location": ["आप कहाँ रहते हैं? 🏠", "• 'गांव' 🌾 • 'शहर' 🏙️"],
+        "annual_income": ["सालाना पारिवारिक आय? 💰", "जैसे: '2 लाख' या '50000'"],
+        "family_size": ["परिवार में कितने सदस्य? 👨‍👩‍👧‍👦", "*संख्या लिखें (जैसे: 4)*"]
+    },
+
+    "templates": {
+        "welcome": """नमस्ते! मैं आपका स्मार्ट सहायक हूं! 🚀
+
+मैं सिर्फ **5 आसान सवाल** पूछकर **बेहतरीन योजनाएं** खोजूंगा।
+
+आप **हिंदी, English, या Hinglish** में जवाब दे सकते हैं!
+
+**आपकी उम्र क्या है?** 🎂
+*उदाहरण: "25", "पच्चीस", "25 years"*""",
+        "chat_placeholder": "अपना जवाब टाइप करें...",
+        "load_earlier": "⬆️ पिछले संदेश देखें",
+        "full_details": "पूरी जानकारी",
+        "contact": "संपर्क करें",
+        "applied": "मैंने आवेदन किया",
+        "helpful_count": "👍 आपके जैसे {count} लोगों को यह उपयोगी लगा",
+        "no_schemes": "आपकी प्रोफ़ाइल से मेल खाने वाली कोई योजना नहीं मिली।",
+        "recommendations_intro": """🎯 **बहुत बढ़िया! आपके लिए सबसे अच्छी सरकारी योजनाएं मिल गईं!**
+
+नीचे दिए गए कार्ड पर क्लिक करके किसी भी योजना की पूरी जानकारी देखें। 👇""",
+        "invalid_scheme_number": "गलत योजना नंबर। कृपया फिर से कोशिश करें।",
+        "scheme_number_help": "कृपया सही योजना नंबर बताएं (1, 2, या 3)।",
+        "travel_tips": """
+**💡 यात्रा के सुझाव:**
+
+• **CSC केंद्र** तेज़ होते हैं और कम इंतजार
+• सभी दस्तावेजों के **मूल + 2 फोटोकॉपी** लेकर जाएं
+• कम भीड़ के लिए **11 AM - 3 PM** के बीच जाएं
+""",
+        "offices_near_you": """
+**🏢 आपके नजदीक सरकारी कार्यालय ({city}, {state}):**
+
+""",
+        "quick_assistance": """
+**📱 त्वरित सहायता:**
+
+• **सटीक दिशा:** Google Maps पर "{office}" खोजें
+• **फोन सहायता:** 1800-180-1551 (जिला हेल्पलाइन)
+• **ऑनलाइन सूची:** {state} सरकार पोर्टल देखें
+""",
+        "ask_city": """
+### 🏢 अपने नजदीक सरकारी कार्यालय खोजें:
+
+**अपने शहर का नाम बताएं**, मैं सटीक कार्यालय खोजूंगा! 🎯
+
+*उदाहरण: "मुंबई", "दिल्ली", "जयपुर", "लखनऊ" लिखें*
+
+---
+
+### 📋 सामान्य कार्यालय प्रकार:
+
+• **जिला कलेक्टर कार्यालय** - मुख्य प्रशासनिक केंद्र
+• **तहसील कार्यालय** - उप-जिला स्तर के आवेदन
+• **ब्लॉक विकास कार्यालय** - ग्रामीण योजना आवेदन
+• **कॉमन सर्विस सेंटर (CSC)** - डिजिटल सेवा केंद्र
+
+### 📞 सार्वभौमिक हेल्पलाइन:
+
+• **सामान्य सरकारी जानकारी:** 1800-180-1551
+• **CSC लोकेटर:** 1800-121-3468
+• **आधार सहायता:** 1947
+
+### 🌐 ऑनलाइन संसाधन:
+
+• Google Maps पर "[आपका शहर] जिला कलेक्टर कार्यालय" खोजें
+• अपनी राज्य सरकार की वेबसाइट देखें
+• नजदीकी केंद्रों के लिए 'जन औषधि' ऐप का उपयोग करें
+""",
+        "city_offices_header": "**🏢 {city}, {state} में सरकारी कार्यालय:**\n\n",
+        "city_offices_tips": """
+**📱 सटीक स्थान के लिए:**
+• Google Maps: "{office}" खोजें
+• फोन डायरेक्टरी: 1800-180-1551 पर कॉल करें
+• राज्य पोर्टल: "{state} सरकारी कार्यालय" खोजें
+
+**🚀 {city} के लिए त्वरित सुझाव:**
+• जाने का बेस्ट समय: 11 AM - 3 PM (कम भीड़)
+• साथ लेकर जाएं: सभी मूल + 2 फोटोकॉपी
+• पार्किंग: ज्यादातर कार्यालयों में विजिटर पार्किंग है
+
+**📞 {city} हेल्पलाइन:**
+• सामान्य सरकारी जानकारी: 100
+• जिला प्रशासन: 1800-180-1551
+• आधार सपोर्ट: 1947
+""",
+        "busy": """मैं आपको सरकारी योजना खोजने में मदद कर सकता हूं! कृपया बताएं:
+- आप क्या काम करते हैं? (किसान, छात्र, व्यापारी, आदि)
+- आपको किस तरह की मदद चाहिए? (पैसा, स्वास्थ्य, शिक्षा, घर)
+- आपकी उम्र कितनी है?
+
+प्रमुख योजनाएं:
+🌾 PM Kisan - किसानों को ₹6,000/साल
+🏥 आयुष्मान भारत - ₹5 लाख स्वास्थ्य बीमा
+🎓 छात्रवृत्ति - छात्रों को ₹36,000 तक
+🏠 PM आवास - घर के लिए ₹2.67 लाख
+💼 मुद्रा लोन - व्यापार के लिए ₹10 लाख तक""",
+        "rate_limited": "मैं आपको सरकारी योजनाओं के बारे में बताने के लिए यहां हूं! किसान, स्वास्थ्य, शिक्षा, आवास, या व्यापार योजनाओं के बारे में पूछें।"
+    }
+}
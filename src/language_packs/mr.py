@@ -0,0 +1,137 @@
+# src/language_packs/mr.py - Marathi language pack
+
+PACK = {
+    "code": "mr",
+    "name": "marathi",
+    "display_name": "मराठी",
+    "digits": "०१२३४५६७८९",
+
+    "keywords": {
+        "age": ["वय", "वर्षे", "वर्षांचा", "वर्षांची", "vay", "varshe", "varshancha"],
+        "profession": {
+            "farmer": ["शेतकरी", "शेती", "शेत", "पीक", "shetkari", "sheti", "shet", "pik"],
+            "student": ["विद्यार्थी", "विद्यार्थिनी", "शिक्षण", "अभ्यास", "शाळा", "महाविद्यालय",
+                        "vidyarthi", "shikshan", "abhyas", "shala"],
+            "employee": ["नोकरी", "कामगार", "कर्मचारी", "सेवा", "nokari", "kamgar", "karmachari"],
+            "business_owner": ["व्यवसाय", "धंदा", "दुकान", "व्यापारी", "vyavsay", "dhanda", "vyapari"],
+            "unemployed": ["बेरोजगार", "काम नाही", "नोकरी नाही", "berojgar", "kaam nahi", "nokari nahi"]
+        },
+        "location": {
+            "rural": ["गाव", "खेडे", "ग्रामीण", "gaav", "khede", "gramin"],
+            "urban": ["शहर", "नगर", "शहरी", "महानगर", "shahar", "shahari"]
+        },
+        "income": ["उत्पन्न", "पगार", "कमाई", "रुपये", "utpanna", "pagar"],
+        "family": ["कुटुंब", "सदस्य", "घरातील", "लोक", "kutumb", "sadasya"]
+    },
+
+    # Amount words for income ("2 lakh"); "l"/"k" shorthands are built in
+    "income_units": {
+        "lakh": ["लाख"],
+        "thousand": ["हजार"],
+        "crore": ["कोटी"]
+    },
+
+    "numerals": {
+        "एक": 1, "दोन": 2, "तीन": 3, "चार": 4, "पाच": 5, "सहा": 6, "सात": 7, "आठ": 8, "नऊ": 9, "दहा": 10,
+        "अकरा": 11, "बारा": 12, "तेरा": 13, "चौदा": 14, "पंधरा": 15, "सोळा": 16, "सतरा": 17, "अठरा": 18, "एकोणीस": 19, "वीस": 20
+    },
+
+    "prompts": {
+        "age": ["तुमचे वय किती आहे? 🎂", "*अंक लिहा (उदा: 25)*"],
+        "profession": ["तुम्ही काय करता? 💼", "• 'शेतकरी' 🌾 • 'विद्यार्थी' 📚 • 'नोकरी' 💼"],
+        "location": ["तुम्ही कुठे राहता? 🏠", "• 'गाव' 🌾 • 'शहर' 🏙️"],
+        "annual_income": ["कुटुंबाचे वार्षिक उत्पन्न? 💰", "उदा: '2 लाख' किंवा '50000'"],
+        "family_size": ["कुटुंबात किती सदस्य आहेत? 👨‍👩‍👧‍👦", "*अंक लिहा (उदा: 4)*"],
+        "default": ["कृपया अधिक माहिती द्या."]
+    },
+
+    "templates": {
+        "welcome": """नमस्कार! मी तुमचा स्मार्ट सहाय्यक आहे! 🚀
+
+फक्त **5 सोपे प्रश्न** विचारून मी तुमच्यासाठी **योग्य योजना** शोधेन.
+
+तुम्ही **मराठी, हिंदी किंवा English** मध्ये उत्तर देऊ शकता!
+
+**तुमचे वय किती आहे?** 🎂
+*उदाहरण: "25", "पंचवीस", "25 वर्षे"*""",
+        "chat_placeholder": "तुमचे उत्तर लिहा...",
+        "load_earlier": "⬆️ आधीचे संदेश पहा",
+        "full_details": "संपूर्ण माहिती",
+        "contact": "संपर्क करा",
+        "applied": "मी अर्ज केला",
+        "helpful_count": "👍 तुमच्यासारख्या {count} लोकांना हे उपयुक्त वाटले",
+        "no_schemes": "तुमच्या प्रोफाइलशी जुळणारी कोणतीही योजना सापडली नाही.",
+        "recommendations_intro": """🎯 **छान! तुमच्यासाठी सर्वोत्तम सरकारी योजना सापडल्या!**
+
+कोणत्याही योजनेची संपूर्ण माहिती पाहण्यासाठी खालील कार्डवर क्लिक करा. 👇""",
+        "invalid_scheme_number": "चुकीचा योजना क्रमांक. कृपया पुन्हा प्रयत्न करा.",
+        "scheme_number_help": "कृपया योग्य योजना क्रमांक सांगा (1, 2 किंवा 3).",
+        "travel_tips": """
+**💡 भेटीसाठी सूचना:**
+
+• **CSC केंद्रे** जलद असतात आणि प्रतीक्षा कमी असते
+• सर्व कागदपत्रांचे **मूळ + 2 झेरॉक्स** सोबत घ्या
+• कमी गर्दीसाठी **11 AM - 3 PM** दरम्यान जा
+""",
+        "offices_near_you": """
+**🏢 तुमच्या जवळील सरकारी कार्यालये ({city}, {state}):**
+
+""",
+        "quick_assistance": """
+**📱 त्वरित मदत:**
+
+• **अचूक दिशा:** Google Maps वर "{office}" शोधा
+• **फोन मदत:** 1800-180-1551 (जिल्हा हेल्पलाइन)
+• **संपूर्ण यादी:** {state} सरकार पोर्टल पहा
+""",
+        "ask_city": """
+### 🏢 तुमच्या जवळील सरकारी कार्यालये शोधा:
+
+**तुमच्या शहराचे नाव सांगा**, मी अचूक कार्यालये शोधेन! 🎯
+
+*उदाहरण: "मुंबई", "पुणे", "नागपूर", "नाशिक" लिहा*
+
+---
+
+### 📋 सामान्य कार्यालये:
+
+• **जिल्हाधिकारी कार्यालय** - मुख्य प्रशासकीय केंद्र
+• **तहसील कार्यालय** - उपजिल्हा स्तरावरील अर्ज
+• **पंचायत समिती** - ग्रामीण योजनांचे अर्ज
+• **आपले सरकार सेवा केंद्र (CSC)** - डिजिटल सेवा केंद्र
+
+### 📞 हेल्पलाइन:
+
+• **सामान्य सरकारी माहिती:** 1800-180-1551
+• **CSC लोकेटर:** 1800-121-3468
+• **आधार मदत:** 1947
+""",
+        "city_offices_header": "**🏢 {city}, {state} मधील सरकारी कार्यालये:**\n\n",
+        "city_offices_tips": """
+**📱 अचूक ठिकाणासाठी:**
+• Google Maps: "{office}" शोधा
+• फोन: 1800-180-1551 वर कॉल करा
+• राज्य पोर्टल: "{state} सरकारी कार्यालये" शोधा
+
+**🚀 {city} साठी सूचना:**
+• भेटीची उत्तम वेळ: 11 AM - 3 PM (कमी गर्दी)
+• सोबत घ्या: सर्व मूळ कागदपत्रे + 2 झेरॉक्स
+
+**📞 {city} हेल्पलाइन:**
+• जिल्हा प्रशासन: 1800-180-1551
+• आधार मदत: 1947
+""",
+        "busy": """मी तुम्हाला सरकारी योजना शोधण्यात मदत करू शकतो! कृपया सांगा:
+- तुम्ही काय काम करता? (शेतकरी, विद्यार्थी, व्यापारी, इ.)
+- तुम्हाला कोणत्या प्रकारची मदत हवी आहे? (आर्थिक, आरोग्य, शिक्षण, घर)
+- तुमचे वय किती आहे?
+
+प्रमुख योजना:
+🌾 PM Kisan - शेतकऱ्यांना ₹6,000/वर्ष
+🏥 आयुष्मान भारत - ₹5 लाख आरोग्य विमा
+🎓 शिष्यवृत्ती - विद्यार्थ्यांना ₹36,000 पर्यंत
+🏠 PM आवास - घरासाठी ₹2.67 लाख
+💼 मुद्रा कर्ज - व्यवसायासाठी ₹10 लाखांपर्यंत""",
+        "rate_limited": "सरकारी योजनांबद्दल माहिती देण्यासाठी मी येथे आहे! शेतकरी, आरोग्य, शिक्षण, घर किंवा व्यवसाय योजनांबद्दल विचारा."
+    }
+}
@@ -0,0 +1,137 @@
+# src/language_packs/ta.py - Tamil language pack
+
+PACK = {
+    "code": "ta",
+    "name": "tamil",
+    "display_name": "தமிழ்",
+    "digits": "௦௧௨௩௪௫௬௭௮௯",
+
+    "keywords": {
+        "age": ["வயது", "வருடம்", "vayathu", "vayasu", "varusham"],
+        "profession": {
+            "farmer": ["விவசாயி", "விவசாயம்", "வயல்", "பயிர்", "vivasayi", "vivasayam", "vayal"],
+            "student": ["மாணவர்", "மாணவி", "படிப்பு", "பள்ளி", "கல்லூரி", "manavar", "manavi", "padippu"],
+            "employee": ["வேலை", "ஊழியர்", "பணியாளர்", "அலுவலகம்", "velai", "oozhiyar", "paniyalar"],
+            "business_owner": ["வியாபாரம்", "தொழில்", "கடை", "வணிகம்", "viyabaram", "thozhil", "kadai"],
+            "unemployed": ["வேலையில்லை", "வேலை இல்லை", "velai illai", "velaiyillai"]
+        },
+        "location": {
+            "rural": ["கிராமம்", "ஊர்", "கிராமப்புறம்", "gramam", "kiramam"],
+            "urban": ["நகரம்", "பட்டணம்", "மாநகரம்", "nagaram", "pattanam"]
+        },
+        "income": ["வருமானம்", "சம்பளம்", "ரூபாய்", "varumanam", "sambalam"],
+        "family": ["குடும்பம்", "உறுப்பினர்கள்", "பேர்", "kudumbam", "uruppinar"]
+    },
+
+    # Amount words for income ("2 lakh"); "l"/"k" shorthands are built in
+    "income_units": {
+        "lakh": ["லட்சம்", "லட்சம"],
+        "thousand": ["ஆயிரம்"],
+        "crore": ["கோடி"]
+    },
+
+    "numerals": {
+        "ஒன்று": 1, "இரண்டு": 2, "மூன்று": 3, "நான்கு": 4, "ஐந்து": 5, "ஆறு": 6, "ஏழு": 7, "எட்டு": 8, "ஒன்பது": 9, "பத்து": 10,
+        "பதினொன்று": 11, "பன்னிரண்டு": 12, "பதின்மூன்று": 13, "பதினான்கு": 14, "பதினைந்து": 15,
+        "பதினாறு": 16, "பதினேழு": 17, "பதினெட்டு": 18, "பத்தொன்பது": 19, "இருபது": 20
+    },
+
+    "prompts": {
+        "age": ["உங்கள் வயது என்ன? 🎂", "*எண்ணை உள்ளிடவும் (எ.கா: 25)*"],
+        "profession": ["நீங்கள் என்ன செய்கிறீர்கள்? 💼", "• 'விவசாயி' 🌾 • 'மாணவர்' 📚 • 'வேலை' 💼"],
+        "location": ["நீங்கள் எங்கே வசிக்கிறீர்கள்? 🏠", "• 'கிராமம்' 🌾 • 'நகரம்' 🏙️"],
+        "annual_income": ["குடும்பத்தின் ஆண்டு வருமானம்? 💰", "எ.கா: '2 லட்சம்' அல்லது '50000'"],
+        "family_size": ["குடும்பத்தில் எத்தனை பேர்? 👨‍👩‍👧‍👦", "*எண்ணை உள்ளிடவும் (எ.கா: 4)*"],
+        "default": ["தயவுசெய்து கூடுதல் விவரங்களைத் தரவும்."]
+    },
+
+    "templates": {
+        "welcome": """வணக்கம்! நான் உங்கள் ஸ்மார்ட் உதவியாளர்! 🚀
+
+**5 எளிய கேள்விகள்** மட்டும் கேட்டு உங்களுக்கு **சரியான திட்டங்களை** கண்டுபிடிப்பேன்.
+
+நீங்கள் **தமிழ், हिंदी அல்லது English**-இல் பதிலளிக்கலாம்!
+
+**உங்கள் வயது என்ன?** 🎂
+*உதாரணம்: "25", "இருபத்தைந்து", "25 வயது"*""",
+        "chat_placeholder": "உங்கள் பதிலை உள்ளிடவும்...",
+        "load_earlier": "⬆️ முந்தைய செய்திகளைக் காண்க",
+        "full_details": "முழு விவரம்",
+        "contact": "தொடர்பு",
+        "applied": "நான் விண்ணப்பித்தேன்",
+        "helpful_count": "👍 உங்களைப் போன்ற {count} பேருக்கு இது பயனுள்ளதாக இருந்தது",
+        "no_schemes": "உங்கள் விவரங்களுக்கு பொருந்தும் திட்டம் எதுவும் கிடைக்கவில்லை.",
+        "recommendations_intro": """🎯 **அருமை! உங்களுக்கான சிறந்த அரசு திட்டங்கள் கிடைத்துள்ளன!**
+
+எந்தத் திட்டத்தின் முழு விவரத்தையும் காண கீழே உள்ள அட்டையைக் கிளிக் செய்யவும். 👇""",
+        "invalid_scheme_number": "தவறான திட்ட எண். மீண்டும் முயற்சிக்கவும்.",
+        "scheme_number_help": "சரியான திட்ட எண்ணைக் குறிப்பிடவும் (1, 2 அல்லது 3).",
+        "travel_tips": """
+**💡 பயண குறிப்புகள்:**
+
+• **CSC மையங்கள்** வேகமானவை, காத்திருப்பு குறைவு
+• எல்லா ஆவணங்களின் **அசல் + 2 நகல்கள்** எடுத்துச் செல்லவும்
+• கூட்டம் குறைவாக இருக்க **11 AM - 3 PM** இடையே செல்லவும்
+""",
+        "offices_near_you": """
+**🏢 உங்கள் அருகிலுள்ள அரசு அலுவலகங்கள் ({city}, {state}):**
+
+""",
+        "quick_assistance": """
+**📱 உடனடி உதவி:**
+
+• **சரியான வழி:** Google Maps-இல் "{office}" தேடவும்
+• **தொலைபேசி உதவி:** 1800-180-1551 (மாவட்ட உதவி எண்)
+• **முழு பட்டியல்:** {state} அரசு இணையதளத்தைப் பார்க்கவும்
+""",
+        "ask_city": """
+### 🏢 உங்கள் அருகிலுள்ள அரசு அலுவலகங்களைக் கண்டறியவும்:
+
+**உங்கள் நகரத்தின் பெயரைச் சொல்லுங்கள்**, சரியான அலுவலகங்களைக் கண்டுபிடிப்பேன்! 🎯
+
+*உதாரணம்: "சென்னை", "மதுரை", "கோயம்புத்தூர்", "திருச்சி"*
+
+---
+
+### 📋 பொதுவான அலுவலகங்கள்:
+
+• **மாவட்ட ஆட்சியர் அலுவலகம்** - முதன்மை நிர்வாக மையம்
+• **வட்டாட்சியர் அலுவலகம்** - வட்ட அளவிலான விண்ணப்பங்கள்
+• **ஊராட்சி ஒன்றிய அலுவலகம்** - கிராமப்புற திட்ட விண்ணப்பங்கள்
+• **பொது சேவை மையம் (CSC)** - டிஜிட்டல் சேவை மையம்
+
+### 📞 உதவி எண்கள்:
+
+• **பொது அரசு தகவல்:** 1800-180-1551
+• **CSC இருப்பிடம்:** 1800-121-3468
+• **ஆதார் உதவி:** 1947
+""",
+        "city_offices_header": "**🏢 {city}, {state} அரசு அலுவலகங்கள்:**\n\n",
+        "city_offices_tips": """
+**📱 சரியான இடத்திற்கு:**
+• Google Maps: "{office}" தேடவும்
+• தொலைபேசி: 1800-180-1551 அழைக்கவும்
+• மாநில இணையதளம்: "{state} government offices" தேடவும்
+
+**🚀 {city} குறிப்புகள்:**
+• செல்ல சிறந்த நேரம்: 11 AM - 3 PM (குறைந்த கூட்டம்)
+• எடுத்துச் செல்லவும்: அனைத்து அசல் ஆவணங்கள் + 2 நகல்கள்
+
+**📞 {city} உதவி எண்கள்:**
+• மாவட்ட நிர்வாகம்: 1800-180-1551
+• ஆதார் உதவி: 1947
+""",
+        "busy": """அரசுத் திட்டங்களைக் கண்டறிய நான் உதவ முடியும்! தயவுசெய்து சொல்லுங்கள்:
+- நீங்கள் என்ன வேலை செய்கிறீர்கள்? (விவசாயி, மாணவர், வணிகர், போன்றவை)
+- உங்களுக்கு எந்த வகையான உதவி தேவை? (நிதி, சுகாதாரம், கல்வி, வீடு)
+- உங்கள் வயது என்ன?
+
+பிரபலமான திட்டங்கள்:
+🌾 PM Kisan - விவசாயிகளுக்கு ஆண்டுக்கு ₹6,000
+🏥 ஆயுஷ்மான் பாரத் - ₹5 லட்சம் மருத்துவக் காப்பீடு
+🎓 கல்வி உதவித்தொகை - மாணவர்களுக்கு ₹36,000 வரை
+🏠 PM ஆவாஸ் - வீட்டுக்கு ₹2.67 லட்சம்
+💼 முத்ரா கடன் - வணிகத்துக்கு ₹10 லட்சம் வரை""",
+        "rate_limited": "அரசுத் திட்டங்களைப் பற்றி சொல்ல நான் இங்கே இருக்கிறேன்! விவசாயம், சுகாதாரம், கல்வி, வீட்டுவசதி அல்லது வணிகத் திட்டங்களைப் பற்றிக் கேளுங்கள்."
+    }
+}
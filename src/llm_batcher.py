@@ -0,0 +1,181 @@
+# src/llm_batcher.py - Micro-batching scheduler for LLM calls from concurrent sessions
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+
+import requests
+
+
+class Waiter:
+    """One session waiting on a batched call, with its own deadline"""
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline  # time.monotonic() value; None waits indefinitely
+        self.ready = threading.Event()  # the session has what it asked for
+        self.finished = threading.Event()  # the call ended (completed, failed or dropped)
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def live(self, now: float) -> bool:
+        return not self.cancelled.is_set() and (self.deadline is None or now < self.deadline)
+
+
+class Job:
+    """A call shared by every waiter that submitted the same key"""
+
+    def __init__(self, key: Hashable, payload):
+        self.key = key
+        self.payload = payload
+        self.waiters: List[Waiter] = []
+        self.lock = threading.Lock()
+        self.done = False
+
+    def live_waiters(self) -> List[Waiter]:
+        now = time.monotonic()
+        with self.lock:
+            return [waiter for waiter in self.waiters if waiter.live(now)]
+
+    def deadline(self) -> float:
+        """Earliest deadline among live waiters (jobs are served earliest-deadline first)"""
+        deadlines = [w.deadline for w in self.live_waiters() if w.deadline is not None]
+        return min(deadlines) if deadlines else float("inf")
+
+
+class MicroBatcher:
+    """Collect calls arriving within `window` seconds and run them over a few connections
+
+    A local model serves only a handful of requests at once, so instead of one
+    HTTP call per session the batcher:
+
+    * joins identical calls (same key) into one job whose result every waiter sees,
+    * releases what arrived within the window as one batch, earliest deadline
+      first, so it lands in the server's parallel slots together,
+    * skips jobs whose waiters have all given up or passed their deadline,
+    * runs jobs on `connections` workers, each reusing one keep-alive session.
+
+    `run(session, job)` performs the call and reports progress to job.waiters.
+    """
+
+    def __init__(self, run: Callable, connections: int = 4, window: float = 0.005,
+                 max_batch: int = 16, name: str = "llm"):
+        self.run = run
+        self.connections = connections
+        self.window = window
+        self.max_batch = max_batch
+        self.name = name
+        self._intake: "queue.Queue[Job]" = queue.Queue()
+        self._ready: List = []
+        self._ready_cond = threading.Condition()
+        self._order = itertools.count()
+        self._jobs: Dict[Hashable, Job] = {}
+        self._lock = threading.Lock()
+        self._started = False
+        self.submitted = 0
+        self.joined = 0
+        self.dropped = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.in_flight = 0
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._collect, name=f"{self.name}-batcher", daemon=True).start()
+        for i in range(self.connections):
+            threading.Thread(target=self._work, name=f"{self.name}-conn-{i}", daemon=True).start()
+
+    def submit(self, key: Hashable, payload, waiter: Waiter) -> Job:
+        """Queue a call, or attach to the identical one already queued or running"""
+        self.start()
+        with self._lock:
+            self.submitted += 1
+            job = self._jobs.get(key)
+            if job is not None:
+                with job.lock:
+                    if not job.done:
+                        job.waiters.append(waiter)
+                        self.joined += 1
+                        return job
+            job = Job(key, payload)
+            job.waiters.append(waiter)
+            self._jobs[key] = job
+        self._intake.put(job)
+        return job
+
+    def _collect(self):
+        while True:
+            batch = [self._intake.get()]
+            closes_at = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = closes_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._intake.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            with self._ready_cond:
+                self.batches += 1
+                self.largest_batch = max(self.largest_batch, len(batch))
+                for job in batch:
+                    heapq.heappush(self._ready, (job.deadline(), next(self._order), job))
+                self._ready_cond.notify(len(batch))
+
+    def _work(self):
+        session = requests.Session()
+        while True:
+            with self._ready_cond:
+                while not self._ready:
+                    self._ready_cond.wait()
+                _, _, job = heapq.heappop(self._ready)
+                # Counters shared by the intake and every worker change under _ready_cond
+                live = bool(job.live_waiters())
+                if live:
+                    self.in_flight += 1
+                else:
+                    self.dropped += 1
+            if not live:
+                self._finish(job)
+                continue
+            try:
+                self.run(session, job)
+            except Exception as e:
+                print(f"{self.name} batched call failed: {e}")
+            finally:
+                with self._ready_cond:
+                    self.in_flight -= 1
+                self._finish(job)
+
+    def _finish(self, job: Job):
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            with job.lock:
+                job.done = True
+                waiters = list(job.waiters)
+        for waiter in waiters:
+            waiter.ready.set()
+            waiter.finished.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            submitted, joined = self.submitted, self.joined
+        with self._ready_cond:
+            return {
+                "connections": self.connections,
+                "submitted": submitted,
+                "joined": joined,
+                "dropped_expired": self.dropped,
+                "batches": self.batches,
+                "largest_batch": self.largest_batch,
+                "queued": len(self._ready) + self._intake.qsize(),
+                "in_flight": self.in_flight,
+            }
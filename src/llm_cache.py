@@ -0,0 +1,165 @@
+# src/llm_cache.py - Content-addressed cache of LLM results with a memory and a disk tier
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.response_cache import normalize_query
+from src.ttl_cache import TTLCache
+
+
+def prompt_version(template: str) -> str:
+    """Short digest of a prompt template; editing the template changes every key"""
+    return hashlib.sha1(template.encode("utf-8")).hexdigest()[:12]
+
+
+def cache_key(model: str, template_version: str, text: str) -> str:
+    """Address of one model call: model, prompt template version and normalized input"""
+    material = "\0".join((model, template_version, normalize_query(text)))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """LRU/TTL memory tier in front of a SQLite table of model results
+
+    Results must be JSON-serializable. A memory hit is a hash plus a dict lookup
+    (microseconds); a disk hit is promoted to memory. Identical messages from
+    different sessions, and the same message with different case, spacing or
+    trailing punctuation, share one entry.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: Optional[float] = None, disk_path=None):
+        self.memory = TTLCache(maxsize, ttl)
+        self.ttl = ttl
+        self.disk_path = str(disk_path) if disk_path else None
+        self._local = threading.local()
+        self.disk_hits = 0
+        self.writes = 0
+        if self.disk_path:
+            Path(self.disk_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connection()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_results ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, template_version TEXT NOT NULL, "
+                "input TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL, expires_at REAL)"
+            )
+            conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.disk_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, model: str, template_version: str, text: str) -> Optional[Any]:
+        key = cache_key(model, template_version, text)
+        result = self.memory.get(key)
+        if result is not None or not self.disk_path:
+            return result
+
+        try:
+            row = self._connection().execute(
+                "SELECT result FROM llm_results WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"LLM cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        result = json.loads(row[0])
+        self.disk_hits += 1
+        self.memory.set(key, result)
+        return result
+
+    def set(self, model: str, template_version: str, text: str, result: Any):
+        key = cache_key(model, template_version, text)
+        self.memory.set(key, result)
+        self.writes += 1
+        if not self.disk_path:
+            return
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_results "
+                "(key, model, template_version, input, result, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, template_version, normalize_query(text),
+                 json.dumps(result, ensure_ascii=False), now, expires_at)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"LLM cache write failed: {e}")
+
+    def purge(self, template_versions: Iterable[str] = None) -> int:
+        """Drop expired rows, and rows for prompt templates no longer in use"""
+        if not self.disk_path:
+            return 0
+        versions = list(template_versions or [])
+        query = "DELETE FROM llm_results WHERE expires_at <= ?"
+        params: List = [time.time()]
+        if versions:
+            query += f" OR template_version NOT IN ({','.join('?' * len(versions))})"
+            params.extend(versions)
+        try:
+            conn = self._connection()
+            removed = conn.execute(query, params).rowcount
+            conn.commit()
+            return removed
+        except sqlite3.Error as e:
+            print(f"LLM cache purge failed: {e}")
+            return 0
+
+    def stats(self) -> Dict:
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["writes"] = self.writes
+        stats["persistent"] = bool(self.disk_path)
+        lookups = stats["hits"] + stats["misses"]
+        hits = stats["hits"] + self.disk_hits
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def common_messages(records: Iterable[Dict], top: int = 100) -> List[str]:
+    """Most frequent user messages (by normalized form) in conversation log records
+
+    Accepts conversation log turns ({"user": ...}) and spilled chat history
+    ({"role": "user", "content": ...}).
+    """
+    counts = Counter()
+    originals = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        text = record.get("user") if "user" in record else (
+            record.get("content") if record.get("role") == "user" else None)
+        normalized = normalize_query(str(text)) if text else ""
+        if normalized:
+            counts[normalized] += 1
+            originals.setdefault(normalized, text)
+    return [originals[normalized] for normalized, _ in counts.most_common(top)]
+
+
+def read_jsonl(paths: Iterable) -> Iterable[Dict]:
+    """Records from plain JSON-lines files, skipping unreadable lines and files"""
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except OSError as e:
+            print(f"Skipping conversation log {path}: {e}")
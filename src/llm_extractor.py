@@ -0,0 +1,334 @@
+# src/llm_extractor.py - Fallback profile extraction with a local Ollama model when the regex extractor misses
+
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import requests
+
+from config import get_config
+from src.circuit_breaker import CircuitOpenError, is_server_error, ollama_breaker
+from src.conversation_log import read_conversations
+from src.deadline import mark_degraded, remaining_time
+from src.llm_batcher import Job, MicroBatcher, Waiter
+from src.llm_cache import LLMCache, cache_key, common_messages, prompt_version, read_jsonl
+from src.metrics import register_cache
+
+Config = get_config()
+
+PROFESSIONS = ("farmer", "student", "employee", "business_owner", "unemployed")
+LOCATIONS = ("rural", "urban")
+
+EXTRACTION_PROMPT = """Extract the user's details from this message (Hindi, English or Hinglish).
+Reply with JSON only, using these keys and null for anything the message does not state:
+{{"age": <years>, "profession": "farmer|student|employee|business_owner|unemployed", "location": "rural|urban", "annual_income": <rupees per year>, "family_size": <people>}}
+
+Message: {message}"""
+PROMPT_VERSION = prompt_version(EXTRACTION_PROMPT)
+
+
+def _number_field(key: str):
+    # Only a number followed by a delimiter is complete; "2" may still become "25"
+    return re.compile(r'"' + key + r'"\s*:\s*"?(\d+(?:\.\d+)?)"?\s*[,}\n]')
+
+
+def _choice_field(key: str, choices: Iterable[str]):
+    return re.compile(r'"' + key + r'"\s*:\s*"(' + "|".join(choices) + r')"')
+
+
+FIELD_PATTERNS = {
+    "age": _number_field("age"),
+    "profession": _choice_field("profession", PROFESSIONS),
+    "location": _choice_field("location", LOCATIONS),
+    "annual_income": _number_field("annual_income"),
+    "family_size": _number_field("family_size"),
+}
+
+# A key followed by any complete value, null included: the model has answered it
+ANSWERED_PATTERNS = {
+    field: re.compile(r'"' + field + r'"\s*:\s*(?:null|"[^"]*"|-?\d+(?:\.\d+)?\s*[,}\n])')
+    for field in FIELD_PATTERNS
+}
+
+# Same ranges the regex extractor accepts
+NUMBER_RANGES = {
+    "age": (15, 100),
+    "annual_income": (1000, 50000000),
+    "family_size": (1, 20),
+}
+
+
+def parse_partial(buffer: str, fields: Iterable[str]) -> Dict:
+    """Complete, valid field values found so far in a (possibly unfinished) JSON reply"""
+    found = {}
+    for field in fields:
+        match = FIELD_PATTERNS[field].search(buffer)
+        if not match:
+            continue
+        value = match.group(1)
+        if field in NUMBER_RANGES:
+            low, high = NUMBER_RANGES[field]
+            value = int(float(value))
+            if not low <= value <= high:
+                continue
+        found[field] = value
+    return found
+
+
+def answered_fields(buffer: str, fields: Iterable[str]) -> set:
+    """Fields the reply has already given a value for, usable or not (e.g. null)"""
+    return {field for field in fields if ANSWERED_PATTERNS[field].search(buffer)}
+
+
+class OllamaHealth:
+    """Ollama availability, refreshed by a background thread instead of per call"""
+
+    def __init__(self, base_url: str, interval: float):
+        self.base_url = base_url
+        self.interval = interval
+        self.available = False
+        self.checked_at = None
+        self._started = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def is_available(self) -> bool:
+        """Last known state; the first call starts the checker and reports unavailable"""
+        self.start()
+        return self.available
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, name="ollama-health", daemon=True).start()
+
+    def refresh(self) -> bool:
+        try:
+            response = requests.get(f"{self.base_url}/api/version", timeout=2)
+            self.available = response.status_code == 200
+        except requests.RequestException:
+            self.available = False
+        self.checked_at = time.time()
+        return self.available
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+class Extraction(Waiter):
+    """One session's wait on an LLM extraction; `fields` grows as tokens stream in
+
+    `ready` is set as soon as the model has answered every `needed` field (by
+    default all wanted ones), even with null, or when the call ends. The reply
+    keeps streaming so the complete result can be cached.
+    """
+
+    def __init__(self, wanted: Iterable[str] = (), deadline: float = None, fields: Dict = None,
+                 needed: Iterable[str] = None):
+        super().__init__(deadline)
+        self.wanted = tuple(wanted)
+        self.needed = tuple(needed) if needed is not None else self.wanted
+        self.fields: Dict = fields or {}
+        self.cached = fields is not None
+        if self.cached:
+            self.ready.set()
+            self.finished.set()
+
+    def offer(self, found: Dict, answered: Iterable[str] = ()):
+        """Take the wanted fields out of everything parsed so far"""
+        if self.ready.is_set():
+            return
+        # Swap in a new dict so the collecting thread never sees a half-updated one
+        self.fields = {field: found[field] for field in self.wanted if field in found}
+        if all(field in self.fields or field in answered for field in self.needed):
+            self.ready.set()
+
+
+class OllamaExtractor:
+    """Stream a JSON profile from Ollama's /api/generate and parse it token by token
+
+    This is a fallback, not a race: the caller runs the regex extractor first
+    and only asks the model when the field being asked is still missing. It
+    submits the fields the regex left unresolved and waits just for the asked
+    one, so a turn the regex answered never waits on the model. Fields the
+    regex found are never overwritten, and a slow or unreachable model costs at
+    most LLM_EXTRACTION_WAIT seconds (nothing at all while the background
+    health check reports Ollama as down).
+
+    Calls from concurrent sessions go through a MicroBatcher: identical messages
+    share one call, and at most LLM_WORKERS requests reach the model at a time.
+    Complete replies are cached by model, prompt version and normalized message,
+    so repeated answers ("gaon", "2 lakh") skip inference entirely.
+    """
+
+    def __init__(self, base_url: str = None, model: str = None, connections: int = None,
+                 health_interval: float = None, breaker=ollama_breaker, cache: LLMCache = None,
+                 batch_window: float = None):
+        self.base_url = (base_url or Config.OLLAMA_URL).rstrip("/")
+        self.model = model or Config.OLLAMA_MODEL
+        self.health = OllamaHealth(self.base_url, health_interval or Config.OLLAMA_HEALTH_INTERVAL)
+        self.breaker = breaker
+        self.cache = cache
+        self.batcher = MicroBatcher(
+            self.run_job,
+            connections=connections or Config.LLM_WORKERS,
+            window=batch_window if batch_window is not None else Config.LLM_BATCH_WINDOW,
+            max_batch=Config.LLM_MAX_BATCH,
+            name="ollama",
+        )
+        self.submitted = 0
+        self.filled = 0
+        self.too_slow = 0
+        self.errors = 0
+        self.cache_hits = 0
+
+    def submit(self, text: str, fields: Iterable[str], wait: float = None,
+               needed: Iterable[str] = None) -> Optional[Extraction]:
+        """Start extracting `fields` from text, or None if Ollama is not available
+
+        The extraction is ready once the model has answered `needed` (default: all of `fields`).
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self.model, PROMPT_VERSION, text)
+            if cached is not None:
+                self.cache_hits += 1
+                return Extraction(fields, fields=cached)
+        if not self.health.is_available():
+            return None
+        wait = min(wait if wait is not None else Config.LLM_EXTRACTION_WAIT, remaining_time())
+        extraction = Extraction(fields, deadline=time.monotonic() + wait, needed=needed)
+        self.batcher.submit(cache_key(self.model, PROMPT_VERSION, text), text, extraction)
+        self.submitted += 1
+        return extraction
+
+    def collect(self, extraction: Extraction, fields: Iterable[str]) -> Dict:
+        """Wanted fields the model produced before the extraction's deadline"""
+        if not extraction.ready.wait(max(0.0, extraction.deadline - time.monotonic())
+                                     if extraction.deadline is not None else None):
+            extraction.cancel()
+            self.too_slow += 1
+            mark_degraded("llm_extraction")
+        found = {field: value for field, value in extraction.fields.items() if field in fields}
+        if found:
+            self.filled += 1
+        return found
+
+    def run_job(self, session: requests.Session, job: Job):
+        """Stream one reply on a batcher connection, feeding every waiter as tokens arrive"""
+        text = job.payload
+        payload = {
+            "model": self.model,
+            "prompt": EXTRACTION_PROMPT.format(message=text),
+            "format": "json",
+            "stream": True,
+            "options": {"temperature": 0, "num_predict": 128},
+        }
+        try:
+            response = self.breaker.call(session.post, f"{self.base_url}/api/generate",
+                                         json=payload, stream=True, is_failure=is_server_error)
+        except CircuitOpenError:
+            return
+        except requests.RequestException as e:
+            self.errors += 1
+            self.health.available = False  # until the next background check says otherwise
+            print(f"Ollama request failed: {e}")
+            return
+
+        with response:
+            if response.status_code != 200:
+                self.errors += 1
+                return
+            buffer = ""
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    waiters = job.live_waiters()
+                    if not waiters:
+                        return
+                    chunk = json.loads(line)
+                    buffer += chunk.get("response", "")
+                    found = parse_partial(buffer, FIELD_PATTERNS)
+                    answered = answered_fields(buffer, FIELD_PATTERNS)
+                    for waiter in waiters:
+                        waiter.offer(found, answered)
+                    if chunk.get("done"):
+                        if self.cache is not None:
+                            self.cache.set(self.model, PROMPT_VERSION, text, found)
+                        return
+            except (requests.RequestException, ValueError) as e:
+                self.errors += 1
+                print(f"Ollama stream error: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            "available": self.health.available,
+            "checked_at": self.health.checked_at,
+            "submitted": self.submitted,
+            "filled": self.filled,
+            "too_slow": self.too_slow,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "batching": self.batcher.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    def warm_up(self, messages: Iterable[str], timeout: float = None) -> int:
+        """Run extraction for messages not cached yet; returns how many were added"""
+        added = 0
+        if self.cache is None or not self.health.refresh():
+            return added
+        for text in messages:
+            extraction = self.submit(text, FIELD_PATTERNS, wait=timeout or Config.OLLAMA_TIMEOUT)
+            if extraction is None or extraction.cached:
+                continue
+            extraction.finished.wait(timeout or Config.OLLAMA_TIMEOUT)
+            if self.cache.get(self.model, PROMPT_VERSION, text) is not None:
+                added += 1
+        return added
+
+
+llm_extractor = OllamaExtractor(cache=LLMCache(
+    Config.LLM_CACHE_SIZE,
+    Config.LLM_CACHE_TTL,
+    Config.get_database_path("llm_cache") if Config.PERSIST_LLM_CACHE else None,
+))
+register_cache("llm", llm_extractor.cache.stats)
+
+
+def llm_stats() -> Dict:
+    """Usage counters for the LLM extraction path"""
+    return llm_extractor.stats()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Warm the LLM result cache from conversation logs")
+    parser.add_argument("--logs", help="directory of JSONL chat history (default: the conversation log)")
+    parser.add_argument("--days", type=float, default=30, help="only replay messages from the last N days")
+    parser.add_argument("--top", type=int, default=200, help="most common user messages to replay")
+    args = parser.parse_args()
+
+    if args.logs:
+        records = read_jsonl(sorted(Path(args.logs).glob("*.jsonl")))
+    else:
+        records = read_conversations(since=time.time() - args.days * 24 * 60 * 60)
+    messages = common_messages(records, args.top)
+    added = llm_extractor.warm_up(messages)
+    print(f"Replayed {len(messages)} common messages, cached {added} new results "
+          f"({llm_extractor.cache.purge([PROMPT_VERSION])} stale rows purged)")
+
+
+if __name__ == "__main__":
+    main()
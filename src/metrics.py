@@ -0,0 +1,392 @@
+# src/metrics.py - Prometheus text-format metrics registry and a small scrape endpoint
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import get_config
+from src.profiler import LOOPBACK_ADDRESSES, profiler_stats, requested_seconds, start_profile
+from src.stage_timing import stage_histograms
+
+Config = get_config()
+
+# Seconds; covers sub-millisecond regex stages up to the 10s Nominatim timeout
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# /admin/profile bodies are a tiny {"seconds": N}
+MAX_ADMIN_BODY_BYTES = 1024
+
+# A collector returns metric families computed at scrape time:
+# (name, type, help, [(labels, value), ...])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base for labelled metrics: one child per label combination, created once"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_dicts(self):
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in children:
+            yield dict(zip(self.labelnames, key)), child
+
+
+class _Value:
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def samples(self):
+        for labels, child in self._label_dicts():
+            yield self.name, labels, child.value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def samples(self):
+        for labels, child in self._label_dicts():
+            yield self.name, labels, child.value
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "buckets", "count", "sum", "lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self.lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        self.bounds = tuple(buckets)
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def samples(self):
+        for labels, child in self._label_dicts():
+            with child.lock:
+                buckets, count, total = list(child.buckets), child.count, child.sum
+            yield from histogram_samples(self.name, labels, self.bounds, buckets, count, total)
+
+
+def histogram_samples(name: str, labels: Dict, bounds, buckets, count, total):
+    """_bucket (cumulative), _sum and _count samples from per-bucket counts"""
+    cumulative = 0
+    for bound, bucket_count in zip(list(bounds) + [float("inf")], buckets):
+        cumulative += bucket_count
+        yield name + "_bucket", {**labels, "le": _format_value(float(bound))}, cumulative
+    yield name + "_sum", labels, total
+    yield name + "_count", labels, count
+
+
+class Registry:
+    """Metrics updated in place by the code paths, plus collectors read at scrape time"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def add_collector(self, name: str, collector: Callable[[], Iterable[Family]]):
+        """Register (or replace) a scrape-time collector under `name`"""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        # Several collectors may contribute to one family (one per cache, say)
+        families: Dict[str, Tuple[str, str, list]] = {}
+        for collector_name, collector in collectors:
+            try:
+                for name, kind, help_text, samples in collector():
+                    families.setdefault(name, (kind, help_text, []))[2].extend(samples)
+            except Exception as e:
+                print(f"Metrics collector {collector_name} failed: {e}")
+        for name, (kind, help_text, samples) in families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                labels = dict(labels)
+                sample_name = labels.pop("__name__", name)
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+requests_total = REGISTRY.counter("saarthak_requests_total", "Conversation turns by engine and intent",
+                                  ("engine", "intent"))
+turn_seconds = REGISTRY.histogram("saarthak_turn_seconds", "Turn latency by engine and intent",
+                                  ("engine", "intent"))
+external_call_seconds = REGISTRY.histogram("saarthak_external_call_seconds",
+                                           "Latency of calls to external dependencies", ("dependency",))
+external_errors_total = REGISTRY.counter("saarthak_external_errors_total",
+                                         "Failed or rejected calls per dependency", ("dependency", "reason"))
+errors_total = REGISTRY.counter("saarthak_errors_total", "Exceptions handled inside a component", ("component",))
+http_requests_total = REGISTRY.counter("saarthak_http_requests_total", "API server requests by path and status",
+                                       ("path", "status"))
+
+
+def observe_turn(engine: str, intent: Optional[str], seconds: float):
+    intent = intent or "unknown"
+    requests_total.labels(engine, intent).inc()
+    turn_seconds.labels(engine, intent).observe(seconds)
+
+
+def count_error(component: str):
+    errors_total.labels(component).inc()
+
+
+def register_cache(name: str, stats: Callable[[], Dict]):
+    """Export hits, misses, size and hit ratio of a cache whose stats() has those keys"""
+    def collect():
+        values = stats()
+        labels = {"cache": name}
+        return [
+            ("saarthak_cache_hits_total", "counter", "Cache hits (memory and disk)",
+             [(dict(labels), values.get("hits", 0) + values.get("disk_hits", 0))]),
+            ("saarthak_cache_misses_total", "counter", "Cache misses",
+             [(dict(labels), values.get("misses", 0))]),
+            ("saarthak_cache_entries", "gauge", "Entries held in memory", [(dict(labels), values.get("size", 0))]),
+            ("saarthak_cache_hit_ratio", "gauge", "Hits / lookups since start",
+             [(dict(labels), values.get("hit_ratio", 0.0))]),
+        ]
+    REGISTRY.add_collector(f"cache:{name}", collect)
+
+
+def register_sessions(stats: Callable[[], Dict]):
+    """Export active sessions and stored bytes from a SessionStore.stats()"""
+    def collect():
+        values = stats()
+        return [
+            ("saarthak_active_sessions", "gauge", "Unexpired conversation sessions",
+             [({}, values.get("sessions", 0))]),
+            ("saarthak_session_stored_bytes", "gauge", "Bytes of stored session state",
+             [({}, values.get("stored_bytes", 0))]),
+        ]
+    REGISTRY.add_collector("sessions", collect)
+
+
+def _collect_stages():
+    samples = []
+    for stage, histogram in stage_histograms().items():
+        with histogram._lock:
+            buckets, count, total = list(histogram.buckets), histogram.count, histogram.total_ms
+        bounds = [bound / 1000 for bound in histogram.bounds]
+        for name, labels, value in histogram_samples("saarthak_stage_seconds", {"stage": stage},
+                                                       bounds, buckets, count, total / 1000):
+            samples.append(({**labels, "__name__": name}, value))
+    return [("saarthak_stage_seconds", "histogram", "Latency of each pipeline stage", samples)]
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_started_at = time.time()
+
+
+def _collect_process():
+    rss = None
+    try:
+        with open("/proc/self/statm", "r") as f:
+            rss = int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, kB on Linux
+        except (ImportError, OSError):
+            pass
+    families = [
+        ("process_start_time_seconds", "gauge", "Start time of the process", [({}, _started_at)]),
+        ("saarthak_threads", "gauge", "Live Python threads", [({}, threading.active_count())]),
+    ]
+    if rss is not None:
+        families.append(("process_resident_memory_bytes", "gauge", "Resident memory size", [({}, rss)]))
+    return families
+
+
+REGISTRY.add_collector("stages", _collect_stages)
+REGISTRY.add_collector("process", _collect_process)
+
+
+class MetricsServer:
+    """GET /metrics (and the /admin/profile trigger) on a local port, served from a daemon thread"""
+
+    def __init__(self, host: str = None, port: int = None, registry: Registry = REGISTRY):
+        registry_ = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status: int, body: str, content_type: str):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/admin/profile":
+                    self.reply(200, json.dumps(profiler_stats()), "application/json")
+                elif path == "/metrics":
+                    self.reply(200, registry_.render(), CONTENT_TYPE)
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                """POST /admin/profile?seconds=N (or {"seconds": N}) starts a profiler capture (loopback clients only)"""
+                path, _, query = self.path.partition("?")
+                if path != "/admin/profile":
+                    self.send_error(404)
+                    return
+                if self.client_address[0] not in LOOPBACK_ADDRESSES:
+                    self.send_error(403)
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    if not 0 <= length <= MAX_ADMIN_BODY_BYTES:
+                        raise ValueError(f"bad Content-Length {length}")
+                    seconds = requested_seconds(query, self.rfile.read(length))
+                except ValueError:
+                    self.send_error(400)
+                    return
+                result = start_profile(seconds)
+                self.reply(200 if result["started"] else 409, json.dumps(result), "application/json")
+
+        self.server = ThreadingHTTPServer((host or Config.METRICS_HOST, Config.METRICS_PORT if port is None else port),
+                                          Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def start_metrics_server(host: str = None, port: int = None) -> Optional[MetricsServer]:
+    """Start the scrape endpoint; None when the port is taken (e.g. another Streamlit worker has it)"""
+    try:
+        return MetricsServer(host, port).start()
+    except OSError as e:
+        print(f"Metrics endpoint not started: {e}")
+        return None
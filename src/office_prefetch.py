@@ -0,0 +1,106 @@
+# src/office_prefetch.py - Background prefetch of office data once a location is known
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Set
+
+from src.geo_cache import office_cache, office_key
+
+
+class OfficePrefetcher:
+    """Resolve government offices for a city off the request thread
+
+    Results land in the shared office cache, so a later "offices near me" or
+    "offices in <city>" turn is answered without waiting on Nominatim. A small
+    worker pool keeps us within Nominatim's usage policy; identical areas already
+    being fetched are not submitted twice.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="office-prefetch")
+        # Re-entrant: a done-callback may run inline while _track holds the lock
+        self._lock = threading.RLock()
+        self._session_futures: Dict[str, Set[Future]] = {}
+        self._inflight: Dict[tuple, Future] = {}
+        self.submitted = 0
+        self.already_cached = 0
+        self.cancelled = 0
+
+    def _track(self, session_id: Optional[str], future: Future):
+        if session_id is None:
+            return
+        futures = self._session_futures.setdefault(session_id, set())
+        futures.add(future)
+
+        def forget(done, session_id=session_id):
+            with self._lock:
+                pending = self._session_futures.get(session_id)
+                if pending is not None:
+                    pending.discard(done)
+                    if not pending:
+                        del self._session_futures[session_id]
+
+        future.add_done_callback(forget)
+
+    def prefetch_offices(self, session_id: Optional[str], engine, city: str, state: str) -> Optional[Future]:
+        """Queue an office lookup for (city, state) unless it is cached or in flight"""
+        key = office_key(city, state)
+        if key in office_cache:
+            self.already_cached += 1
+            return None
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None or future.done():
+                future = self.executor.submit(self._resolve_offices, engine, city, state, key)
+                self._inflight[key] = future
+                self.submitted += 1
+            self._track(session_id, future)
+        return future
+
+    def prefetch_user_location(self, session_id: Optional[str], engine) -> Future:
+        """Resolve IP geolocation, then the offices for that city"""
+        with self._lock:
+            future = self.executor.submit(self._resolve_user_location, engine)
+            self.submitted += 1
+            self._track(session_id, future)
+        return future
+
+    def _resolve_offices(self, engine, city: str, state: str, key: tuple):
+        try:
+            return engine.get_real_government_offices(city, state)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _resolve_user_location(self, engine):
+        location = engine.get_user_location()
+        if location and location.get("city") not in (None, "Unknown"):
+            key = office_key(location["city"], location.get("state", location["city"]))
+            if key not in office_cache:
+                engine.get_real_government_offices(location["city"], location.get("state", location["city"]))
+        return location
+
+    def cancel_session(self, session_id: str) -> int:
+        """Cancel work queued for a session that has ended (running lookups finish)"""
+        with self._lock:
+            futures = self._session_futures.pop(session_id, set())
+            # Lookups shared with a live session keep running for that session
+            for others in self._session_futures.values():
+                futures = futures - others
+        cancelled = sum(1 for future in futures if future.cancel())
+        self.cancelled += cancelled
+        return cancelled
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "already_cached": self.already_cached,
+                "cancelled": self.cancelled,
+                "in_flight": len(self._inflight),
+                "sessions_waiting": len(self._session_futures),
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
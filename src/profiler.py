@@ -0,0 +1,229 @@
+# src/profiler.py - Opt-in sampling profiler writing collapsed stacks tagged by conversation stage
+
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+from config import get_config
+
+Config = get_config()
+
+# Leaf functions of threads that are parked, not working
+IDLE_FUNCTIONS = {"wait", "select", "poll", "epoll", "get", "accept", "sleep", "_wait_for_tstate_lock",
+                  "serve_forever", "_worker", "readline", "recv_into", "_run_once"}
+
+LOOPBACK_ADDRESSES = ("127.0.0.1", "::1", "::ffff:127.0.0.1")
+
+# thread id -> conversation stage of the turn it is running (set by the engines)
+_thread_stages: Dict[int, str] = {}
+
+
+class stage_tag:
+    """`with stage_tag(engine.conversation_stage):` labels this thread's samples with the stage
+
+    Tags nest: leaving an inner tag restores the outer one.
+    """
+
+    __slots__ = ("stage", "thread_id", "previous")
+
+    def __init__(self, stage: Optional[str]):
+        self.stage = stage or "unknown"
+
+    def __enter__(self):
+        # Remember the thread: a streaming turn may be closed from another one
+        self.thread_id = threading.get_ident()
+        self.previous = _thread_stages.get(self.thread_id)
+        _thread_stages[self.thread_id] = self.stage
+        return self
+
+    def __exit__(self, *exc):
+        if self.previous is None:
+            _thread_stages.pop(self.thread_id, None)
+        else:
+            _thread_stages[self.thread_id] = self.previous
+        return False
+
+
+def _thread_group(name: str) -> str:
+    """'saarthak-api_12' -> 'saarthak-api', so worker threads aggregate"""
+    return re.sub(r"[_-]?\d+$", "", name) or name
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at an interval and counts collapsed stacks
+
+    One capture runs at a time and stops after at most `max_seconds`. Each
+    sample is "thread;stage:<stage>;outer frame;...;leaf", the format
+    flamegraph.pl, speedscope and inferno read. The sampler measures its own
+    cost and stretches the interval so it stays under `max_overhead` of one
+    CPU.
+    """
+
+    def __init__(self, output_dir, interval: float = 0.01, max_seconds: float = 120,
+                 max_overhead: float = 0.03, max_depth: int = 64):
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.max_overhead = max_overhead
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.captures = 0
+        self.last_path: Optional[Path] = None
+        self.last_capture: Dict = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float = 30, include_idle: bool = False) -> Optional[Path]:
+        """Begin a capture; returns the output path, or None if one is already running"""
+        with self._lock:
+            if self.running:
+                return None
+            seconds = max(0.1, min(seconds, self.max_seconds))
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self.output_dir / f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.collapsed"
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._capture, args=(path, seconds, include_idle),
+                                            name="sampling-profiler", daemon=True)
+            self._thread.start()
+            return path
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _capture(self, path: Path, seconds: float, include_idle: bool):
+        stacks = Counter()
+        samples = 0
+        sampling_time = 0.0
+        interval = self.interval
+        own_id = threading.get_ident()
+        started = time.monotonic()
+        ends_at = started + seconds
+
+        while not self._stop.is_set() and time.monotonic() < ends_at:
+            tick = time.perf_counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stage = _thread_stages.get(thread_id)
+                if stage is None and not include_idle and frame.f_code.co_name in IDLE_FUNCTIONS:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < self.max_depth:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.reverse()
+                root = f"{_thread_group(names.get(thread_id, 'thread'))};stage:{stage or 'none'}"
+                stacks[root + ";" + ";".join(labels)] += 1
+            samples += 1
+            cost = time.perf_counter() - tick
+            sampling_time += cost
+            # Keep cost / (interval) under max_overhead however many threads there are
+            interval = max(self.interval, cost / self.max_overhead)
+            self._stop.wait(interval)
+
+        elapsed = time.monotonic() - started
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            print(f"Could not write profile {path}: {e}")
+        self.captures += 1
+        self.last_path = path
+        self.last_capture = {
+            "path": str(path),
+            "seconds": round(elapsed, 2),
+            "samples": samples,
+            "stacks": len(stacks),
+            "overhead": round(sampling_time / elapsed, 4) if elapsed else 0.0,
+        }
+
+    def stats(self) -> Dict:
+        return {"running": self.running, "captures": self.captures, "last": self.last_capture}
+
+
+profiler = SamplingProfiler(Config.PROFILE_DIR, interval=Config.PROFILER_INTERVAL,
+                            max_seconds=Config.PROFILER_MAX_SECONDS, max_overhead=Config.PROFILER_MAX_OVERHEAD)
+
+if os.getenv("SAARTHAK_PROFILE"):
+    # SAARTHAK_PROFILE=<seconds> captures from startup (capped at PROFILER_MAX_SECONDS)
+    try:
+        profiler.start(float(os.getenv("SAARTHAK_PROFILE")))
+    except ValueError:
+        profiler.start()
+
+
+def requested_seconds(query: str = "", body: bytes = b"") -> float:
+    """Capture length from `?seconds=N` or a JSON body {"seconds": N} (default 30); ValueError if malformed"""
+    values = parse_qs(query).get("seconds")
+    try:
+        if values:
+            seconds = float(values[0])
+        else:
+            request = json.loads(body.decode("utf-8") or "{}")
+            seconds = float(request.get("seconds", 30))
+    except (UnicodeDecodeError, json.JSONDecodeError, AttributeError, TypeError) as e:
+        raise ValueError(f"malformed capture request: {e}")
+    if not math.isfinite(seconds):
+        raise ValueError("seconds must be a finite number")
+    return seconds
+
+
+def start_profile(seconds: float = 30) -> Dict:
+    """Admin entry point: start a capture and say where it will be written"""
+    path = profiler.start(seconds)
+    if path is None:
+        return {"started": False, "reason": "a capture is already running", **profiler.stats()}
+    return {"started": True, "path": str(path), "seconds": max(0.1, min(seconds, profiler.max_seconds))}
+
+
+def profiler_stats() -> Dict:
+    return profiler.stats()
+
+
+def top_frames(path, stage: str = None, top: int = 20) -> Counter:
+    """Leaf-inclusive self time per frame in a collapsed file, optionally for one stage"""
+    totals = Counter()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            frames = stack.split(";")
+            if stage and frames[1] != f"stage:{stage}":
+                continue
+            totals[frames[-1]] += int(count)
+    return Counter(dict(totals.most_common(top)))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize a collapsed-stack profile")
+    parser.add_argument("path", help="profile-*.collapsed file")
+    parser.add_argument("--stage", help="only samples taken in this conversation stage")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    for frame, count in top_frames(args.path, args.stage, args.top).items():
+        print(f"{count:>8}  {frame}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# src/rate_limit.py - Token-bucket rate limiting and load shedding
+
+import os
+import threading
+import time
+from typing import Dict, Hashable
+
+from config import get_config
+
+Config = get_config()
+
+
+class TokenBucket:
+    """Classic token bucket; refilled lazily on each take()"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float):
+        self.capacity = capacity
+        self.rate = rate  # tokens per second
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float, cost: float = 1.0) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+
+class RateLimiter:
+    """Per-key token buckets allowing `per_minute` requests with a short burst
+
+    Buckets of idle keys are dropped once the table grows past `max_keys`, so
+    memory stays bounded however many users/IPs show up.
+    """
+
+    def __init__(self, per_minute: int, burst: int = None, max_keys: int = 50000):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, per_minute // 6))
+        self.max_keys = max_keys
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def allow(self, key: Hashable) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = TokenBucket(self.capacity, self.rate, now)
+            if bucket.take(now):
+                self.allowed += 1
+                return True
+            self.limited += 1
+            return False
+
+    def _prune(self, now: float):
+        """Drop buckets that have refilled completely (their keys are idle)"""
+        full_after = self.capacity / self.rate if self.rate else 0
+        idle = [key for key, bucket in self._buckets.items() if now - bucket.updated >= full_after]
+        for key in idle:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+    def stats(self) -> Dict:
+        return {"keys": len(self._buckets), "allowed": self.allowed, "limited": self.limited}
+
+
+class AdmissionController:
+    """Global admission control: shed work when too many turns are in flight or CPU is saturated
+
+    Shed turns get a cached, templated answer instead of the full pipeline.
+    The load average is sampled at most once per second.
+    """
+
+    def __init__(self, max_in_flight: int, max_load_per_cpu: float = 1.5):
+        self.max_in_flight = max_in_flight
+        self.max_load = max_load_per_cpu * (os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self._load = 0.0
+        self._load_sampled_at = 0.0
+
+    def _cpu_load(self, now: float) -> float:
+        if now - self._load_sampled_at >= 1.0:
+            self._load_sampled_at = now
+            try:
+                self._load = os.getloadavg()[0]
+            except (AttributeError, OSError):
+                self._load = 0.0
+        return self._load
+
+    def try_enter(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self.in_flight >= self.max_in_flight or self._cpu_load(now) > self.max_load:
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "load_average": round(self._load, 2),
+        }
+
+
+# Shared by every conversation in this process
+user_limiter = RateLimiter(Config.RATE_LIMIT, Config.RATE_LIMIT_BURST)
+ip_limiter = RateLimiter(Config.RATE_LIMIT * Config.RATE_LIMIT_IP_MULTIPLIER,
+                         Config.RATE_LIMIT_BURST * Config.RATE_LIMIT_IP_MULTIPLIER)
+admission = AdmissionController(Config.MAX_IN_FLIGHT_TURNS, Config.MAX_LOAD_PER_CPU)
+
+
+def allow_request(user_key: Hashable = None, client_ip: str = None) -> bool:
+    """Charge one request to the user's and the client IP's buckets"""
+    if user_key is not None and not user_limiter.allow(user_key):
+        return False
+    return client_ip is None or ip_limiter.allow(client_ip)
+
+
+def rate_limit_stats() -> Dict:
+    """Limiter and admission counters"""
+    return {"users": user_limiter.stats(), "ips": ip_limiter.stats(), "admission": admission.stats()}
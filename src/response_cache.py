@@ -0,0 +1,109 @@
+# src/response_cache.py - Cache of stateless scheme answers with an optional disk tier
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.ttl_cache import TTLCache
+
+_STRIP_CHARS = " \t\n?!.,।"
+
+
+def normalize_query(text: str) -> str:
+    """Case- and whitespace-insensitive form of a query (matching is substring based)"""
+    return " ".join(text.lower().split()).strip(_STRIP_CHARS)
+
+
+class ResponseCache:
+    """LRU/TTL memory cache for process_query answers, optionally backed by SQLite
+
+    Keys carry the scheme database version, so answers computed against an
+    older database are never served; reload() drops them. The disk tier lets a
+    restarted process start warm.
+    """
+
+    def __init__(self, maxsize: int = 100, ttl: Optional[float] = None, disk_path=None):
+        self.memory = TTLCache(maxsize, ttl)
+        self.ttl = ttl
+        self.disk_path = str(disk_path) if disk_path else None
+        self._local = threading.local()
+        self.disk_hits = 0
+        if self.disk_path:
+            Path(self.disk_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connection()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "version TEXT NOT NULL, language TEXT NOT NULL, query TEXT NOT NULL, "
+                "expires_at REAL, response TEXT NOT NULL, "
+                "PRIMARY KEY (version, language, query))"
+            )
+            conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.disk_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, version: str, language: str, query: str) -> Optional[str]:
+        key = (version, language, query)
+        response = self.memory.get(key)
+        if response is not None or not self.disk_path:
+            return response
+
+        try:
+            row = self._connection().execute(
+                "SELECT response FROM responses WHERE version = ? AND language = ? AND query = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (version, language, query, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Response cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        self.disk_hits += 1
+        self.memory.set(key, row[0])
+        return row[0]
+
+    def set(self, version: str, language: str, query: str, response: str):
+        self.memory.set((version, language, query), response)
+        if not self.disk_path:
+            return
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (version, language, query, expires_at, response) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (version, language, query, expires_at, response)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Response cache write failed: {e}")
+
+    def reload(self, version: str):
+        """Forget every answer not computed against scheme database `version`"""
+        self.memory.clear()
+        if not self.disk_path:
+            return
+        try:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses WHERE version != ? OR expires_at <= ?", (version, time.time()))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Response cache purge failed: {e}")
+
+    def stats(self) -> Dict:
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["persistent"] = bool(self.disk_path)
+        lookups = stats["hits"] + stats["misses"]
+        hits = stats["hits"] + self.disk_hits
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
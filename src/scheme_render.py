@@ -0,0 +1,176 @@
+# src/scheme_render.py - Scheme cards and detail pages rendered once per (scheme, language)
+
+from typing import Dict, Iterable, List, Tuple
+
+# Languages rendered at load time; others render on first use. Languages without
+# an entry in a template table below use the English one, and scheme fields fall
+# back to their *_english variants.
+RENDER_LANGUAGES = ("hindi", "english")
+
+DETAIL_PAGE = {
+    "hindi": """
+## 📋 {name} - पूरी जानकारी
+
+**💰 वित्तीय लाभ:**
+{benefit_summary} (कुल: ₹{benefit_amount:,})
+
+**✅ पात्रता:**
+{eligibility_summary}
+
+**📄 आवश्यक दस्तावेज:**
+{documents}
+
+**🌐 आवेदन कैसे करें:**
+1. वेबसाइट पर जाएं: {website}
+2. 'नया पंजीकरण' पर क्लिक करें
+3. आधार OTP से फॉर्म भरें
+4. दस्तावेज अपलोड करें (PDF, अधिकतम 200KB)
+5. सबमिट करें और रेफरेंस नंबर सेव करें
+
+**📞 सहायता:**
+• हेल्पलाइन: {helpline} (टोल-फ्री)
+• समय: सुबह 9 से शाम 6 बजे
+• ईमेल: support@{website}
+
+**⏰ समयसीमा:**
+• प्रोसेसिंग: 15-30 दिन
+• पहला भुगतान: अप्रूवल के 2-3 महीने बाद
+
+**💡 सुझाव:**
+• योजना की डेडलाइन में आवेदन करें (मार्च/सितंबर)
+• मोबाइल नंबर आधार से लिंक रखें
+• आवेदन कन्फर्मेशन का स्क्रीनशॉट लें
+
+*नजदीकी आवेदन केंद्र खोजने के लिए 'offices near me' लिखें*
+""",
+    "english": """
+## 📋 {name} - Complete Details
+
+**💰 Financial Benefit:**
+{benefit_summary} (Total: ₹{benefit_amount:,})
+
+**✅ Eligibility:**
+{eligibility_summary}
+
+**📄 Required Documents:**
+{documents}
+
+**🌐 How to Apply:**
+1. Visit: {website}
+2. Click 'New Registration'
+3. Fill form with Aadhaar OTP
+4. Upload documents (PDF, max 200KB each)
+5. Submit and save reference number
+
+**📞 Help & Support:**
+• Helpline: {helpline} (Toll-free)
+• Timings: 9 AM to 6 PM
+• Email: support@{website}
+
+**⏰ Timeline:**
+• Processing: 15-30 days
+• First payment: 2-3 months after approval
+
+**💡 Pro Tips:**
+• Apply during scheme deadlines (March/September)
+• Keep mobile number linked with Aadhaar
+• Take screenshots of application confirmation
+
+*Type 'offices near me' to find local application centers*
+""",
+}
+
+# Body of a recommendation expander in main()
+RECOMMENDATION_CARD = {
+    "hindi": """**💰 लाभ:**
+{benefit_summary}
+
+**👥 पात्रता:**
+{eligibility_summary}
+
+**📄 दस्तावेज:**
+{documents} + more
+
+**🌐 संपर्क:**
+Website: {website}  
+Helpline: {helpline}
+""",
+    "english": """**💰 Benefit:**
+{benefit_summary}
+
+**👥 Eligibility:**
+{eligibility_summary}
+
+**📄 Documents:**
+{documents} + more
+
+**🌐 Contact:**
+Website: {website}  
+Helpline: {helpline}
+""",
+}
+
+# One numbered entry of a SaarthakConversationEngine answer (number and name added per request)
+SUMMARY_ENTRY = {
+    "hindi": "💰 लाभ: {benefit}\n✅ पात्रता: {eligibility}\n📄 दस्तावेज: {documents}\n🌐 आवेदन: {website}\n\n",
+    "english": "💰 Benefit: {benefit}\n✅ Eligibility: {eligibility}\n📄 Documents: {documents}\n🌐 Apply: {website}\n\n",
+}
+
+
+def scheme_key(scheme: Dict) -> str:
+    """Stable key for a scheme in the render tables"""
+    return scheme.get("id") or scheme["name_english"]
+
+
+def localized(scheme: Dict, field: str, language: str):
+    """scheme[field_<language>], falling back to the English text"""
+    return scheme.get(f"{field}_{language}", scheme.get(f"{field}_english"))
+
+
+def template(table: Dict[str, str], language: str) -> str:
+    return table.get(language, table["english"])
+
+
+def build_scheme_pages(schemes: Iterable[Dict], languages: Iterable[str] = RENDER_LANGUAGES) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """{scheme id: {language: {"name", "card", "detail"}}} for the guided-conversation schemes"""
+    pages = {}
+    for scheme in schemes:
+        rendered = {}
+        for language in languages:
+            docs = localized(scheme, "quick_docs", language)
+            fields = {
+                "name": localized(scheme, "name", language),
+                "benefit_summary": localized(scheme, "benefit_summary", language),
+                "eligibility_summary": localized(scheme, "eligibility_summary", language),
+                "benefit_amount": scheme["benefit_amount"],
+                "website": scheme["website"],
+                "helpline": scheme["helpline"],
+            }
+            rendered[language] = {
+                "name": fields["name"],
+                "card": template(RECOMMENDATION_CARD, language).format(documents=", ".join(docs[:2]), **fields),
+                "detail": template(DETAIL_PAGE, language).format(documents=", ".join(docs), **fields),
+            }
+        pages[scheme_key(scheme)] = rendered
+    return pages
+
+
+def build_scheme_summaries(schemes: List[Dict], languages: Iterable[str] = RENDER_LANGUAGES) -> Dict[str, Dict[str, Tuple[str, str]]]:
+    """{scheme id: {language: (name, entry body)}} for the scheme-database answers"""
+    summaries = {}
+    for scheme in schemes:
+        rendered = {}
+        for language in languages:
+            try:
+                body = template(SUMMARY_ENTRY, language).format(
+                    benefit=scheme["benefits"]["description"],
+                    eligibility=scheme["eligibility"]["criteria"],
+                    documents=", ".join(scheme["documents"][:3]),
+                    website=scheme["application_process"]["website"],
+                )
+            except (KeyError, TypeError) as e:
+                print(f"Could not render scheme {scheme_key(scheme)}: {e}")
+                continue
+            rendered[language] = (localized(scheme, "name", language), body)
+        summaries[scheme_key(scheme)] = rendered
+    return summaries
@@ -0,0 +1,113 @@
+# src/session_history.py - Bounded chat history with disk spill and memory accounting
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Rough CPython overhead of one {"role": ..., "content": ...} dict plus its strings
+MESSAGE_OVERHEAD_BYTES = 400
+
+
+def message_bytes(message: Dict) -> int:
+    """Approximate resident size of one chat message"""
+    return MESSAGE_OVERHEAD_BYTES + sys.getsizeof(message.get("content", ""))
+
+
+def cap_history(messages: List[Dict], max_messages: int, max_bytes: int) -> Tuple[List[Dict], List[Dict]]:
+    """Split history into (kept, overflow) so kept fits both the count and byte budget
+
+    The newest messages are always kept; at least the latest message survives even
+    if it alone is larger than the budget.
+    """
+    kept_count = 0
+    total = 0
+    for message in reversed(messages):
+        size = message_bytes(message)
+        if kept_count and (kept_count >= max_messages or total + size > max_bytes):
+            break
+        kept_count += 1
+        total += size
+
+    split = len(messages) - kept_count
+    return messages[split:], messages[:split]
+
+
+def session_memory_usage(engine_state: Dict, messages: List[Dict], spilled: int = 0) -> Dict:
+    """Per-session memory accounting surface"""
+    history_bytes = sum(message_bytes(m) for m in messages)
+    state_bytes = len(json.dumps(engine_state or {}, ensure_ascii=False).encode("utf-8"))
+    return {
+        "messages_in_memory": len(messages),
+        "messages_spilled": spilled,
+        "history_bytes": history_bytes,
+        "largest_message_bytes": max((message_bytes(m) for m in messages), default=0),
+        "state_bytes": state_bytes,
+        "total_bytes": history_bytes + state_bytes,
+    }
+
+
+class HistorySpill:
+    """Append-only per-session JSONL files holding turns evicted from memory"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, session_id: str) -> Path:
+        # Hashed so distinct client-supplied ids never share (or escape) a file
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{digest}.jsonl"
+
+    def spill(self, session_id: str, messages: List[Dict]):
+        """Append evicted messages, oldest first"""
+        if not messages:
+            return
+        lines = "".join(json.dumps(m, ensure_ascii=False) + "\n" for m in messages)
+        with self._lock:
+            with open(self._path(session_id), "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def touch(self, session_id: str):
+        """Mark a session with spilled history as active, so purge_idle keeps it as long as the session"""
+        try:
+            os.utime(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def load(self, session_id: str, limit: int = None) -> List[Dict]:
+        """Read spilled messages back (the newest `limit` if given)"""
+        path = self._path(session_id)
+        if not path.exists():
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            messages = [json.loads(line) for line in f if line.strip()]
+        return messages[-limit:] if limit else messages
+
+    def delete(self, session_id: str):
+        try:
+            self._path(session_id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def purge_idle(self, max_idle_seconds: float) -> int:
+        """Remove spill files of sessions idle longer than max_idle_seconds
+
+        Every session save appends to or touches its spill file, so the file's
+        mtime is the session's last activity.
+        """
+        cutoff = time.time() - max_idle_seconds
+        removed = 0
+        for path in self.directory.glob("*.jsonl"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
@@ -0,0 +1,342 @@
+# src/session_store.py - Externalized conversation session storage
+
+import json
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+ROLE_CODES = {"user": "u", "assistant": "a"}
+ROLE_NAMES = {code: role for role, code in ROLE_CODES.items()}
+
+
+def pack_messages(messages: List[Dict]) -> List[List[str]]:
+    """Compact chat history: [{"role": "user", "content": ...}] -> [["u", ...]]"""
+    return [[ROLE_CODES.get(m["role"], m["role"]), m["content"]] for m in messages]
+
+
+def unpack_messages(packed: List[List[str]]) -> List[Dict]:
+    """Inverse of pack_messages"""
+    return [{"role": ROLE_NAMES.get(role, role), "content": content} for role, content in packed]
+
+
+class SessionStore:
+    """Base class for session backends
+
+    A session is a small dict (see EnhancedConversationEngine.to_state plus packed
+    message history) stored as compact JSON with a TTL. Backends only move bytes.
+    """
+
+    backend_name = "base"
+
+    def __init__(self, ttl: int = 3600):
+        self.ttl = ttl
+
+    @staticmethod
+    def encode(state: Dict) -> str:
+        return json.dumps(state, ensure_ascii=False, separators=(",", ":"))
+
+    @staticmethod
+    def decode(blob) -> Optional[Dict]:
+        if blob is None:
+            return None
+        if isinstance(blob, bytes):
+            blob = blob.decode("utf-8")
+        return json.loads(blob)
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def save(self, session_id: str, state: Dict):
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        """Drop sessions past their TTL; returns how many were removed"""
+        return 0
+
+    def stats(self) -> Dict:
+        """Backend-level accounting (session count and stored bytes where cheap to know)"""
+        return {"backend": self.backend_name}
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local store; sessions do not survive restarts"""
+
+    backend_name = "memory"
+
+    def __init__(self, ttl: int = 3600):
+        super().__init__(ttl)
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        entry = self._data.get(session_id)
+        if entry is None:
+            return None
+        expires_at, blob = entry
+        if expires_at < time.time():
+            with self._lock:
+                self._data.pop(session_id, None)
+            return None
+        return self.decode(blob)
+
+    def save(self, session_id: str, state: Dict):
+        blob = self.encode(state)
+        with self._lock:
+            self._data[session_id] = (time.time() + self.ttl, blob)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (expires_at, _) in self._data.items() if expires_at < now]
+            for sid in expired:
+                del self._data[sid]
+        return len(expired)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            blobs = [blob for _, blob in self._data.values()]
+        return {
+            "backend": self.backend_name,
+            "sessions": len(blobs),
+            "stored_bytes": sum(len(blob.encode("utf-8")) for blob in blobs),
+        }
+
+
+class SQLiteSessionStore(SessionStore):
+    """Single-file store shared by all processes on one machine"""
+
+    backend_name = "sqlite"
+
+    def __init__(self, path, ttl: int = 3600):
+        super().__init__(ttl)
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, expires_at REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT data FROM sessions WHERE id = ? AND expires_at > ?",
+            (session_id, time.time())
+        ).fetchone()
+        return self.decode(row[0]) if row else None
+
+    def save(self, session_id: str, state: Dict):
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (id, expires_at, data) VALUES (?, ?, ?)",
+            (session_id, time.time() + self.ttl, self.encode(state))
+        )
+        conn.commit()
+
+    def delete(self, session_id: str):
+        conn = self._connection()
+        conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        conn.commit()
+
+    def purge_expired(self) -> int:
+        conn = self._connection()
+        removed = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+        conn.commit()
+        return removed
+
+    def stats(self) -> Dict:
+        count, stored = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions WHERE expires_at > ?",
+            (time.time(),)
+        ).fetchone()
+        return {"backend": self.backend_name, "sessions": count, "stored_bytes": stored}
+
+
+class RESPClient:
+    """Minimal Redis protocol (RESP2) client - enough for GET/SET/DEL
+
+    Works with Redis, Valkey, KeyDB or any local stand-in speaking RESP.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 2.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        try:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._file = self._sock.makefile("rb")
+            if self.password:
+                self._call("AUTH", self.password)
+            if self.db:
+                self._call("SELECT", str(self.db))
+        except Exception:
+            # Never keep a connection that is unauthenticated or on the wrong DB
+            self.close()
+            raise
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                if self._file is not None:
+                    self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RuntimeError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RuntimeError(f"unexpected reply {line!r}")
+
+    def _call(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def execute(self, *args):
+        """Run a command, reconnecting once if the connection went stale"""
+        for attempt in range(2):
+            try:
+                if self._sock is None:
+                    self._connect()
+                return self._call(*args)
+            except (ConnectionError, OSError):
+                self.close()
+                if attempt:
+                    raise
+
+
+class RedisSessionStore(SessionStore):
+    """Shared store for replicas behind a load balancer; expiry handled by the server"""
+
+    backend_name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl: int = 3600, prefix: str = "saarthak:session:"):
+        super().__init__(ttl)
+        parsed = urlparse(url)
+        self.connection_kwargs = {
+            "host": parsed.hostname or "localhost",
+            "port": parsed.port or 6379,
+            "db": int((parsed.path or "/0").lstrip("/") or 0),
+            "password": parsed.password,
+        }
+        self.prefix = prefix
+        self._local = threading.local()
+
+    def _client(self) -> RESPClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = RESPClient(**self.connection_kwargs)
+            self._local.client = client
+        return client
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        return self.decode(self._client().execute("GET", self.prefix + session_id))
+
+    def save(self, session_id: str, state: Dict):
+        self._client().execute("SET", self.prefix + session_id, self.encode(state), "EX", self.ttl)
+
+    def delete(self, session_id: str):
+        self._client().execute("DEL", self.prefix + session_id)
+
+
+class SessionSweeper:
+    """Background thread expiring idle sessions and their spilled history
+
+    Redis expires keys itself; memory and SQLite backends only drop expired rows
+    lazily on load, so abandoned kiosk sessions are reclaimed here.
+    """
+
+    def __init__(self, store: SessionStore, spill=None, interval: float = 60.0):
+        self.store = store
+        self.spill = spill
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="session-sweeper", daemon=True)
+        self.last_purged = 0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def sweep(self) -> int:
+        removed = self.store.purge_expired()
+        if self.spill is not None:
+            self.spill.purge_idle(self.store.ttl)
+        self.last_purged = removed
+        return removed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Session sweep failed: {e}")
+
+
+def create_session_store(config=None) -> SessionStore:
+    """Build the backend selected by Config.SESSION_BACKEND"""
+    if config is None:
+        from config import get_config
+        config = get_config()
+
+    backend = config.SESSION_BACKEND.lower()
+    if backend == "sqlite":
+        return SQLiteSessionStore(config.SESSION_DB_PATH, ttl=config.SESSION_TTL)
+    if backend == "redis":
+        return RedisSessionStore(config.REDIS_URL, ttl=config.SESSION_TTL)
+    return MemorySessionStore(ttl=config.SESSION_TTL)
@@ -0,0 +1,77 @@
+# src/single_flight.py - Coalesce concurrent identical lookups into one request
+
+import threading
+from typing import Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result
+
+    When many CSC sessions ask about the same city within seconds, only the
+    first caller reaches the external service and the rest wait for its answer.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.deduplicated = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, wait_timeout: float = None, **kwargs):
+        """Run fn for key, or wait (up to wait_timeout) for the call already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            if not call.event.wait(wait_timeout):
+                raise TimeoutError(f"{self.name} lookup for {key!r} still in flight")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            "executed": self.executed,
+            "deduplicated": self.deduplicated,
+            "in_flight": in_flight,
+        }
+
+
+# One group per external dependency
+nominatim_flight = SingleFlight("nominatim")
+ipapi_flight = SingleFlight("ipapi")
+
+
+def flight_stats() -> Dict:
+    """Deduplication counters for every external dependency"""
+    return {group.name: group.stats() for group in (nominatim_flight, ipapi_flight)}
@@ -0,0 +1,194 @@
+# src/stage_timing.py - Per-stage latency histograms for the conversation pipeline
+
+import atexit
+import functools
+import json
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List
+
+from config import get_config
+
+Config = get_config()
+
+# Upper bounds (milliseconds) of the histogram buckets; the last bucket is unbounded
+BUCKET_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Fixed log-scale buckets plus count, sum and max; observe() is a bisect and an add"""
+
+    def __init__(self, bounds=BUCKET_BOUNDS_MS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float):
+        index = bisect_left(self.bounds, ms)
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th observation (max for the last bucket)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = p * self.count
+            seen = 0
+            for index, count in enumerate(self.buckets):
+                seen += count
+                if seen >= rank and count:
+                    return min(self.bounds[index], self.max_ms) if index < len(self.bounds) else self.max_ms
+            return self.max_ms
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+_enabled = Config.ENABLE_STAGE_TIMING
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+_callbacks: List[Callable[[str, float], None]] = []
+
+
+def set_stage_timing(enabled: bool):
+    global _enabled
+    _enabled = enabled
+
+
+def stage_timing_enabled() -> bool:
+    return _enabled
+
+
+def add_timing_callback(callback: Callable[[str, float], None]):
+    """Call `callback(stage, seconds)` for every timed stage (on the thread that ran it)"""
+    _callbacks.append(callback)
+
+
+def remove_timing_callback(callback: Callable[[str, float], None]):
+    if callback in _callbacks:
+        _callbacks.remove(callback)
+
+
+def record_stage(stage: str, seconds: float):
+    """Add one measurement to `stage`'s histogram and notify callbacks"""
+    if not _enabled:
+        return
+    histogram = _histograms.get(stage)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(stage, Histogram())
+    histogram.observe(seconds * 1000)
+    for callback in _callbacks:
+        try:
+            callback(stage, seconds)
+        except Exception as e:
+            print(f"Stage timing callback failed: {e}")
+
+
+class _Span:
+    __slots__ = ("stage", "started_at")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record_stage(self.stage, time.perf_counter() - self.started_at)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def timed_stage(stage: str):
+    """`with timed_stage("chat.matching"):` - a shared no-op when timing is off"""
+    return _Span(stage) if _enabled else _NO_SPAN
+
+
+def timed(stage: str):
+    """Decorator form of timed_stage for functions and methods"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started_at = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_stage(stage, time.perf_counter() - started_at)
+        return wrapper
+    return decorate
+
+
+def stage_summary() -> Dict[str, Dict]:
+    """Count, mean, p50/p95/p99 and max per stage"""
+    with _histograms_lock:
+        histograms = dict(_histograms)
+    return {stage: histograms[stage].summary() for stage in sorted(histograms)}
+
+
+def stage_histograms() -> Dict[str, Histogram]:
+    with _histograms_lock:
+        return dict(_histograms)
+
+
+def reset_stage_timings():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def dump_summary(stream=None):
+    """Write the per-stage summary as a table (to stdout by default)"""
+    stream = stream or sys.stdout
+    summary = stage_summary()
+    stream.write(f"{'stage':<28}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)\n")
+    for stage, row in summary.items():
+        stream.write(f"{stage:<28}{row['count']:>8}{row['mean_ms']:>10.3f}{row['p50_ms']:>10.3f}"
+                     f"{row['p95_ms']:>10.3f}{row['p99_ms']:>10.3f}{row['max_ms']:>10.3f}\n")
+
+
+def _dump_at_exit(path: str):
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(stage_summary(), f, indent=2)
+    except OSError as e:
+        print(f"Could not write stage timings to {path}: {e}")
+
+
+if Config.STAGE_TIMING_DUMP:
+    atexit.register(_dump_at_exit, Config.STAGE_TIMING_DUMP)
+
+
+def stage_timing_stats() -> Dict:
+    return {"enabled": _enabled, "stages": stage_summary()} if _enabled else {"enabled": False}
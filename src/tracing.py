@@ -0,0 +1,296 @@
+# src/tracing.py - Per-turn traces with nested spans, head-sampled, exported to JSONL or OTLP
+
+import atexit
+import contextvars
+import functools
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import requests
+
+from config import get_config
+from src.conversation_log import ConversationLog
+
+Config = get_config()
+
+_current_span = contextvars.ContextVar("saarthak_span", default=None)
+_last_trace_id = contextvars.ContextVar("saarthak_last_trace", default=None)
+
+
+class Span:
+    """One timed operation in a trace; children inherit the trace id"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "started_at", "_start", "ms", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, attributes: Dict = None):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes or {}
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.ms = None
+        self.error = None
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def finish(self):
+        self.ms = (time.perf_counter() - self._start) * 1000
+        exporter = get_exporter()
+        if exporter is not None:
+            exporter.export(self)
+
+    def to_record(self) -> Dict:
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.started_at, 6),
+            "ms": round(self.ms, 3) if self.ms is not None else None,
+        }
+        if self.attributes:
+            record["attrs"] = self.attributes
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class _NoSpan:
+    __slots__ = ()
+    trace_id = None
+
+    def set(self, key: str, value):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def _reset(token):
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        # A streaming generator finalized from another context
+        _current_span.set(None)
+
+
+@contextmanager
+def trace_turn(name: str, sample_rate: float = None, **attributes):
+    """Root span for one turn; head-sampled, so unsampled turns cost one random()"""
+    rate = Config.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    if Config.TRACE_EXPORTER == "none" or random.random() >= rate:
+        token = _current_span.set(None)
+        try:
+            yield _NO_SPAN
+        finally:
+            _reset(token)
+            _last_trace_id.set(None)
+        return
+
+    root = Span(name, f"{random.getrandbits(128):032x}", attributes=attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.error = type(e).__name__
+        raise
+    finally:
+        _reset(token)
+        _last_trace_id.set(root.trace_id)
+        root.finish()
+
+
+@contextmanager
+def _child_span(parent: Span, name: str, attributes: Dict):
+    span = Span(name, parent.trace_id, parent.span_id, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        _reset(token)
+        span.finish()
+
+
+@contextmanager
+def _no_span():
+    yield _NO_SPAN
+
+
+def span(name: str, **attributes):
+    """`with span("matching"):` - a child of the current span, or a no-op outside a sampled turn"""
+    parent = _current_span.get()
+    if parent is None:
+        return _no_span()
+    return _child_span(parent, name, attributes)
+
+
+def traced(name: str):
+    """Decorator form of span()"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = _current_span.get()
+            if parent is None:
+                return func(*args, **kwargs)
+            with _child_span(parent, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace_id if current is not None else None
+
+
+def last_trace_id() -> Optional[str]:
+    """Trace id of the turn that most recently finished in this context (None if unsampled)"""
+    return _last_trace_id.get()
+
+
+class JSONLSpanExporter:
+    """Spans as JSON lines in a size-rotated, gzipped log of bounded size (written off the request thread)"""
+
+    def __init__(self, path, max_bytes: int, max_segments: int = None, flush_interval: float = 0.5):
+        self.log = ConversationLog(path, max_bytes=max_bytes, rotate_daily=False, compress=True,
+                                   flush_interval=flush_interval, max_segments=max_segments)
+
+    def export(self, span: Span):
+        self.log.log(span.to_record())
+
+    def close(self):
+        self.log.close()
+
+    def stats(self) -> Dict:
+        return {"exporter": "jsonl", **self.log.stats()}
+
+
+class OTLPSpanExporter:
+    """Batches spans and POSTs them as OTLP/HTTP JSON to <endpoint>/v1/traces
+
+    Works with an OpenTelemetry collector, Jaeger or Tempo, or any local
+    stand-in accepting that payload. A failed batch is dropped and counted.
+    """
+
+    def __init__(self, endpoint: str, service: str = "saarthak", flush_interval: float = 1.0,
+                 batch_size: int = 256, max_queue: int = 10000, timeout: float = 2.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service = service
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._session = requests.Session()
+        self._stop = threading.Event()
+        self.exported = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._send(batch)
+
+    def _send(self, spans: List[Span]):
+        try:
+            response = self._session.post(self.url, json=self.payload(spans), timeout=self.timeout)
+            if response.status_code >= 300:
+                raise requests.RequestException(f"HTTP {response.status_code}")
+            self.exported += len(spans)
+        except requests.RequestException as e:
+            self.failed_batches += 1
+            self.dropped += len(spans)
+            print(f"OTLP export failed: {e}")
+
+    def payload(self, spans: List[Span]) -> Dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", self.service)]},
+            "scopeSpans": [{"scope": {"name": "saarthak"}, "spans": [_otlp_span(span) for span in spans]}],
+        }]}
+
+    def close(self, timeout: float = 5.0):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        return {"exporter": "otlp", "exported": self.exported, "dropped": self.dropped,
+                "failed_batches": self.failed_batches, "queued": self._queue.qsize()}
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_span(span: Span) -> Dict:
+    start_ns = int(span.started_at * 1e9)
+    record = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # internal
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(start_ns + int((span.ms or 0) * 1e6)),
+        "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        record["parentSpanId"] = span.parent_id
+    return record
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """Process-wide exporter picked by TRACE_EXPORTER (jsonl, otlp or none); started on first use"""
+    global _exporter
+    if _exporter is None and Config.TRACE_EXPORTER != "none":
+        with _exporter_lock:
+            if _exporter is None:
+                if Config.TRACE_EXPORTER == "otlp":
+                    _exporter = OTLPSpanExporter(Config.OTLP_ENDPOINT)
+                else:
+                    _exporter = JSONLSpanExporter(Config.TRACE_LOG_PATH, Config.TRACE_LOG_MAX_BYTES,
+                                                  Config.TRACE_LOG_MAX_SEGMENTS)
+                atexit.register(_exporter.close)
+    return _exporter
+
+
+def tracing_stats() -> Dict:
+    stats = {"sample_rate": Config.TRACE_SAMPLE_RATE, "exporter": Config.TRACE_EXPORTER}
+    if _exporter is not None:
+        stats.update(_exporter.stats())
+    return stats
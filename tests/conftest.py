@@ -0,0 +1,41 @@
+# tests/conftest.py - Shared fixtures; logs, caches and stores go to a temporary directory
+
+import atexit
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from config import get_config
+
+# Before any src module opens a log or store
+_DATA_DIR = tempfile.mkdtemp(prefix="saarthak-tests-")
+get_config().use_data_dir(_DATA_DIR)
+# Registered first, so it runs after the logs' and exporters' own atexit flushes
+atexit.register(shutil.rmtree, _DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def slow_geo(monkeypatch):
+    """Nominatim and ipapi stubs that answer well after the turn budget"""
+    from collections import deque
+
+    from benchmarks.stub_geo import StubGeo
+    from src.circuit_breaker import CLOSED, ipapi_breaker, nominatim_breaker
+
+    config = get_config()
+    stub = StubGeo(latency=config.MAX_RESPONSE_TIME + 2).start()
+    monkeypatch.setattr(config, "NOMINATIM_URL", stub.nominatim_url)
+    monkeypatch.setattr(config, "IPAPI_URL", stub.ipapi_url)
+    # Earlier tests may have opened the breakers against the real services
+    for breaker in (nominatim_breaker, ipapi_breaker):
+        monkeypatch.setattr(breaker, "state", CLOSED)
+        monkeypatch.setattr(breaker, "consecutive_failures", 0)
+        monkeypatch.setattr(breaker, "_latencies", deque(maxlen=breaker._latencies.maxlen))
+    yield stub
+    stub.stop()
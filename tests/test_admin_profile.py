@@ -0,0 +1,61 @@
+# tests/test_admin_profile.py - /admin/profile takes ?seconds=N or {"seconds": N} on both servers; stage tags nest
+
+import asyncio
+import threading
+
+import pytest
+import requests
+
+from src.api_server import SaarthakAPIServer
+from src.metrics import MetricsServer
+from src.profiler import _thread_stages, profiler, requested_seconds, stage_tag
+
+FORMS = [("seconds=0.3", b""), ("", b'{"seconds": 0.3}')]
+
+
+@pytest.fixture
+def finished_capture():
+    yield
+    profiler.stop()
+
+
+def test_requested_seconds_forms():
+    assert requested_seconds("seconds=5") == 5
+    assert requested_seconds("", b'{"seconds": 5}') == 5
+    assert requested_seconds() == 30
+    for query, body in [("seconds=soon", b""), ("", b"[5]"), ("", b"{"), ("", b'{"seconds": null}'),
+                        ("seconds=nan", b"")]:
+        with pytest.raises(ValueError):
+            requested_seconds(query, body)
+
+
+@pytest.mark.parametrize("query, body", FORMS)
+def test_api_server_accepts_both_forms(query, body, finished_capture):
+    server = SaarthakAPIServer(port=0, rate_limited=False)
+    try:
+        status, payload = asyncio.run(server.dispatch("POST", "/admin/profile", body, "127.0.0.1", query))
+    finally:
+        server.close()
+    assert status == 200
+    assert payload["seconds"] == 0.3
+
+
+@pytest.mark.parametrize("query, body", FORMS)
+def test_metrics_server_accepts_both_forms(query, body, finished_capture):
+    server = MetricsServer(host="127.0.0.1", port=0).start()
+    try:
+        response = requests.post(f"http://127.0.0.1:{server.port}/admin/profile" + (f"?{query}" if query else ""),
+                                 data=body, timeout=5)
+    finally:
+        server.stop()
+    assert response.status_code == 200
+    assert response.json()["seconds"] == 0.3
+
+
+def test_nested_stage_tags_restore_the_outer_stage():
+    thread_id = threading.get_ident()
+    with stage_tag("gathering_details"):
+        with stage_tag("query"):
+            assert _thread_stages[thread_id] == "query"
+        assert _thread_stages[thread_id] == "gathering_details"
+    assert thread_id not in _thread_stages
@@ -0,0 +1,36 @@
+# tests/test_analytics.py - Emitter threads spread over counter shards and every event is counted
+
+import threading
+
+from src.analytics import Analytics, ShardedCounter
+
+
+def run_threads(target, count: int = 8):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_threads_land_in_different_shards():
+    counter = ShardedCounter(shards=16)
+    run_threads(lambda: counter.incr(("question_asked", "age")))
+
+    used = sum(1 for counts, _ in counter._shards if counts)
+    assert used > 1
+    assert counter.peek()[("question_asked", "age")] == 8
+
+
+def test_event_count_is_exact_under_concurrency(tmp_path):
+    analytics = Analytics(tmp_path, flush_interval=3600)
+    try:
+        def emit():
+            for _ in range(5000):
+                analytics.track("recommendation", "pm-kisan")
+
+        run_threads(emit)
+        assert analytics.events == 8 * 5000
+        assert analytics.counter.peek()[("recommendation", "pm-kisan")] == 8 * 5000
+    finally:
+        analytics.close()
@@ -0,0 +1,76 @@
+# tests/test_api_server.py - Request validation, read-only scheme matching and per-language canned answers
+
+import asyncio
+import copy
+
+import pytest
+
+from src.api_server import SaarthakAPIServer
+from src.conversation_engine import SaarthakConversationEngine
+from src.response_cache import ResponseCache
+
+
+async def raw_request(server, head: bytes) -> bytes:
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(head)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+    finally:
+        server.close()
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_bad_content_length_is_400(length):
+    server = SaarthakAPIServer(host="127.0.0.1", port=0, rate_limited=False)
+    head = b"POST /v1/chat HTTP/1.1\r\nHost: test\r\nContent-Length: " + length + b"\r\n\r\n"
+    response = asyncio.run(raw_request(server, head))
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"invalid Content-Length" in response
+
+
+@pytest.mark.parametrize("body", [b"[]", b"\"hi\"", b"42", b"null"])
+def test_non_object_body_is_400(body):
+    server = SaarthakAPIServer(port=0, rate_limited=False)
+    try:
+        status, payload = asyncio.run(server.dispatch("POST", "/v1/chat", body, "127.0.0.1"))
+    finally:
+        server.close()
+    assert status == 400
+    assert payload == {"error": "body must be a JSON object"}
+
+
+def test_find_matching_schemes_leaves_shared_schemes_untouched():
+    engine = SaarthakConversationEngine()
+    before = copy.deepcopy(engine.schemes_data)
+    query = "I am a farmer, any kisan scheme?"
+    matches = engine.find_matching_schemes(query, engine.extract_user_info(query))
+    assert matches
+    assert all("match_score" not in scheme for scheme in matches)
+    assert engine.schemes_data == before
+
+
+@pytest.mark.parametrize("language, rate_limited, expected", [
+    ("मराठी", True, "सरकारी योजनांबद्दल"),
+    ("mr", False, "शेतकऱ्यांना"),
+    ("Tamil", True, "அரசுத் திட்டங்களைப்"),
+    ("বাংলা", False, "কৃষকদের"),
+    ("Hindi", True, "सरकारी योजनाओं"),
+    ("English", False, "Popular schemes"),
+    ("Klingon", True, "I'm here to help"),
+])
+def test_busy_response_follows_the_language_pack(language, rate_limited, expected):
+    assert expected in SaarthakConversationEngine().get_busy_response(language, rate_limited=rate_limited)
+
+
+def test_language_spellings_share_one_cache_entry():
+    engine = SaarthakConversationEngine()
+    engine.response_cache = ResponseCache(maxsize=10)
+    hindi = [engine.process_query("kisan yojana", language) for language in ("Hindi", "hindi", "hi", "हिंदी")]
+    english = [engine.process_query("kisan yojana", language) for language in ("English", "en")]
+
+    assert len(set(hindi)) == 1 and len(set(english)) == 1 and hindi[0] != english[0]
+    assert engine.response_cache.stats()["hits"] == 4
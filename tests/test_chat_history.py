@@ -0,0 +1,28 @@
+# tests/test_chat_history.py - The "load earlier" control only shows when there is earlier history
+
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from config import get_config
+
+APP = str(Path(__file__).parent.parent / "app.py")
+
+
+def has_load_earlier(at) -> bool:
+    return any(button.key == "load_earlier" for button in at.button)
+
+
+def test_load_earlier_only_when_history_is_hidden(monkeypatch):
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.chat_input[0].set_value("main 30 saal ka hun").run()
+    shown = len(at.session_state.enhanced_messages)
+
+    # Exactly one page of history and nothing spilled: everything is already on screen
+    monkeypatch.setattr(get_config(), "CHAT_PAGE_SIZE", shown)
+    at.run()
+    assert not has_load_earlier(at)
+
+    monkeypatch.setattr(get_config(), "CHAT_PAGE_SIZE", shown - 1)
+    at.run()
+    assert has_load_earlier(at)
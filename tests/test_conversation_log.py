@@ -0,0 +1,35 @@
+# tests/test_conversation_log.py - Rotated segments are read and pruned in rotation order
+
+import gzip
+import json
+
+from src.conversation_log import log_segments, prune_segments, read_conversations
+
+# Rotation order; two rotations in the same millisecond get -1, -2 suffixes
+NAMES = [
+    "conversations-20261019-110000000.jsonl",
+    "conversations-20261019-120000123.jsonl",
+    "conversations-20261019-120000123-1.jsonl.gz",
+    "conversations-20261019-120000123-2.jsonl",
+]
+
+
+def write_segments(directory):
+    path = directory / "conversations.jsonl"
+    for turn, name in enumerate(NAMES + [path.name]):
+        line = (json.dumps({"turn": turn}) + "\n").encode("utf-8")
+        target = directory / name
+        target.write_bytes(gzip.compress(line) if name.endswith(".gz") else line)
+    return path
+
+
+def test_collision_segments_sort_after_their_stamp(tmp_path):
+    path = write_segments(tmp_path)
+    assert [segment.name for segment in log_segments(path)] == NAMES + [path.name]
+    assert [record["turn"] for record in read_conversations(path)] == [0, 1, 2, 3, 4]
+
+
+def test_prune_keeps_the_newest_segments(tmp_path):
+    path = write_segments(tmp_path)
+    assert prune_segments(path, 2) == 2
+    assert [segment.name for segment in log_segments(path)] == NAMES[2:] + [path.name]
@@ -0,0 +1,50 @@
+# tests/test_deadline.py - A turn against slow geocoding stays within MAX_RESPONSE_TIME and degrades
+
+import asyncio
+import time
+
+from app import EnhancedConversationEngine
+from config import get_config
+from src.api_server import SaarthakAPIServer, budget_tags
+from src.geo_cache import office_cache, office_key
+
+# Scheduling and socket teardown on a loaded machine
+SLACK = 0.5
+
+
+def test_office_lookup_degrades_to_template_within_budget(slow_geo):
+    config = get_config()
+    office_cache.pop(office_key("Lucknow", "Uttar Pradesh"))
+    engine = EnhancedConversationEngine()
+
+    started = time.monotonic()
+    response = engine.process_query("offices in Lucknow", "English")
+    elapsed = time.monotonic() - started
+
+    assert elapsed <= config.MAX_RESPONSE_TIME + SLACK
+    assert "District Collector Office, Lucknow, Uttar Pradesh" in response
+    assert "geocoding" in engine.last_deadline.degraded_stages
+    tags = budget_tags(engine.last_deadline)
+    assert tags["budget_exceeded"] is True
+    assert "geocoding" in tags["degraded_stages"]
+
+
+def test_api_turn_is_tagged_with_degraded_stages(slow_geo):
+    config = get_config()
+    office_cache.pop(office_key("Patna", "Bihar"))
+    server = SaarthakAPIServer(port=0, rate_limited=False)
+
+    async def turn():
+        return await server.handle_chat({"language": "English"}, "offices in Patna")
+
+    try:
+        started = time.monotonic()
+        result = asyncio.run(turn())
+        elapsed = time.monotonic() - started
+    finally:
+        server.close()
+
+    assert elapsed <= config.MAX_RESPONSE_TIME + SLACK
+    assert "Municipal Corporation, Patna, Bihar" in result["response"]
+    assert result["budget_exceeded"] is True
+    assert "geocoding" in result["degraded_stages"]
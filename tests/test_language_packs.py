@@ -0,0 +1,42 @@
+# tests/test_language_packs.py - Every pack resolves every template and prompt the app uses
+
+import re
+from pathlib import Path
+from string import Formatter
+
+import pytest
+
+from src.analytics import QUESTION_SEQUENCE
+from src.language_packs import AVAILABLE_PACKS, LanguagePack, get_pack
+
+APP_SOURCE = (Path(__file__).parent.parent / "app.py").read_text(encoding="utf-8")
+TEMPLATE_KEYS = sorted(set(re.findall(r"""\.text\(["']([a-z_]+)["']""", APP_SOURCE)))
+
+
+def placeholders(template: str) -> set:
+    return {name for _, name, _, _ in Formatter().parse(template) if name}
+
+
+def test_app_template_keys_were_found():
+    assert "welcome" in TEMPLATE_KEYS and "full_details" in TEMPLATE_KEYS
+
+
+@pytest.mark.parametrize("code", list(AVAILABLE_PACKS))
+def test_pack_resolves_everything_the_app_asks_for(code):
+    pack = get_pack(code)
+    english = get_pack("en")
+    for key in TEMPLATE_KEYS:
+        text = pack.text(key)
+        assert text, key
+        # A translation may not ask for values the app does not pass
+        assert placeholders(text) <= placeholders(english.text(key)), key
+    for field in QUESTION_SEQUENCE:
+        assert pack.prompt(field), field
+
+
+def test_missing_key_is_a_key_error():
+    pack = LanguagePack({"code": "xx", "name": "Test", "display_name": "Test"}, fallback=get_pack("en"))
+    with pytest.raises(KeyError, match="no_such_template"):
+        pack.text("no_such_template")
+    with pytest.raises(KeyError):
+        LanguagePack({"code": "xx", "name": "Test", "display_name": "Test"}).prompt("age")
@@ -0,0 +1,35 @@
+# tests/test_llm_batcher.py - Batcher counters stay consistent across the intake and worker threads
+
+import threading
+import time
+
+from src.llm_batcher import MicroBatcher, Waiter
+
+
+def test_counters_balance_after_concurrent_jobs():
+    runs = []
+    runs_lock = threading.Lock()
+
+    def run(session, job):
+        time.sleep(0.001)
+        with runs_lock:
+            runs.append(job.key)
+
+    batcher = MicroBatcher(run, connections=8, window=0.001, max_batch=16, name="test")
+    waiters = []
+    for i in range(400):
+        # Every fifth caller has already given up, so its job is dropped unsent
+        waiter = Waiter(deadline=time.monotonic() - 1 if i % 5 == 0 else None)
+        batcher.submit(f"message-{i}", f"message {i}", waiter)
+        waiters.append(waiter)
+
+    assert all(waiter.finished.wait(10) for waiter in waiters)
+    deadline = time.monotonic() + 5
+    while batcher.stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    stats = batcher.stats()
+    assert stats["in_flight"] == 0
+    assert stats["dropped_expired"] == 80
+    assert len(runs) == 320
+    assert stats["queued"] == 0
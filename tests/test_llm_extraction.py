@@ -0,0 +1,82 @@
+# tests/test_llm_extraction.py - Guided turns only wait on the LLM for the field being asked
+
+import json
+import time
+
+import pytest
+
+import app
+from app import EnhancedConversationEngine
+from benchmarks.stub_ollama import StubOllama
+from src.circuit_breaker import CircuitBreaker
+from src.llm_extractor import OllamaExtractor
+
+NULL_REPLY = json.dumps({"age": None, "profession": None, "location": None,
+                         "annual_income": None, "family_size": None})
+FARMER_REPLY = json.dumps({"age": None, "profession": "farmer", "location": None,
+                           "annual_income": None, "family_size": None})
+TOKEN_DELAY = 0.05
+
+
+def full_reply_seconds(stub):
+    chunks = -(-len(stub.reply) // stub.chunk_chars) + 1
+    return stub.prefill + chunks * stub.token_delay
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """Point the app's extractor at a local stub Ollama; the test sets the reply"""
+    stub = StubOllama(parallel=4, token_delay=TOKEN_DELAY).start()
+    breaker = CircuitBreaker("test-ollama", max_timeout=30, failure_threshold=10 ** 6)
+    extractor = OllamaExtractor(base_url=stub.url, connections=2, breaker=breaker, cache=None, batch_window=0)
+    extractor.health.refresh()
+    monkeypatch.setattr(app, "llm_extractor", extractor)
+    yield stub, extractor
+    stub.stop()
+
+
+def asking_profession():
+    engine = EnhancedConversationEngine()
+    engine.process_query("main 34 saal ka hun", "English")
+    assert engine.last_question == "profession"
+    return engine
+
+
+def test_regex_answer_skips_the_model(ollama):
+    stub, extractor = ollama
+    stub.reply = NULL_REPLY
+    engine = asking_profession()
+
+    started = time.monotonic()
+    engine.process_query("kisan hun", "English")
+    elapsed = time.monotonic() - started
+
+    assert engine.user_profile["profession"] == "farmer"
+    assert extractor.submitted == 0
+    assert elapsed < stub.prefill
+
+
+def test_null_for_the_asked_field_ends_the_wait(ollama):
+    stub, extractor = ollama
+    stub.reply = NULL_REPLY
+    engine = asking_profession()
+
+    started = time.monotonic()
+    engine.process_query("abhi kuch nahi", "English")
+    elapsed = time.monotonic() - started
+
+    assert extractor.submitted == 1
+    assert "profession" not in engine.user_profile
+    # "profession": null streams early; the rest of the reply is not waited for
+    assert elapsed < full_reply_seconds(stub) - 4 * TOKEN_DELAY
+
+
+def test_streamed_field_fills_the_asked_question(ollama):
+    stub, extractor = ollama
+    stub.reply = FARMER_REPLY
+    engine = asking_profession()
+
+    engine.process_query("abhi kuch nahi", "English")
+
+    assert engine.user_profile["profession"] == "farmer"
+    assert engine.last_question == "location"
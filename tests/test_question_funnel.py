@@ -0,0 +1,22 @@
+# tests/test_question_funnel.py - Every profile question, including the first, is counted once in analytics
+
+import app
+from app import EnhancedConversationEngine
+from config import get_config
+
+
+def test_first_question_is_tracked_once(monkeypatch):
+    events = []
+    monkeypatch.setattr(app, "track", lambda event, key="", amount=1: events.append((event, key)))
+    monkeypatch.setattr(get_config(), "ENABLE_LLM_EXTRACTION", False)
+    engine = EnhancedConversationEngine()
+
+    engine.process_query("namaste, mujhe yojana chahiye")
+    assert engine.last_question == "age"
+    assert ("question_asked", "age") in events
+
+    engine.process_query("hello again")  # unanswered, asked again
+    assert events.count(("question_asked", "age")) == 1
+
+    engine.process_query("30 saal")
+    assert ("question_asked", "profession") in events
@@ -0,0 +1,32 @@
+# tests/test_session_history.py - Spill files are keyed safely and live as long as their session
+
+import os
+import time
+
+from src.session_history import HistorySpill
+
+
+def test_ids_that_sanitize_alike_get_separate_files(tmp_path):
+    spill = HistorySpill(tmp_path)
+    spill.spill("ab", [{"role": "user", "content": "mine"}])
+    spill.spill("a/b", [{"role": "user", "content": "theirs"}])
+    spill.spill("../" * 5 + "etc", [{"role": "user", "content": "escape"}])
+
+    assert spill.load("ab") == [{"role": "user", "content": "mine"}]
+    assert spill.load("a/b") == [{"role": "user", "content": "theirs"}]
+    assert sorted(path.parent for path in tmp_path.rglob("*.jsonl")) == [tmp_path] * 3
+
+
+def test_touched_spill_survives_purge(tmp_path):
+    spill = HistorySpill(tmp_path)
+    for session_id in ("active", "abandoned"):
+        spill.spill(session_id, [{"role": "user", "content": "old turn"}])
+        hour_ago = time.time() - 3600
+        os.utime(spill._path(session_id), (hour_ago, hour_ago))
+
+    spill.touch("active")  # a save with nothing new to spill
+    spill.touch("never-spilled")
+
+    assert spill.purge_idle(600) == 1
+    assert spill.load("active") and not spill.load("abandoned")
+    assert not spill._path("never-spilled").exists()
@@ -0,0 +1,32 @@
+# tests/test_session_resume.py - Resuming a ?sid= session keeps its language, profile and spilled history
+
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from config import get_config
+from src.session_history import HistorySpill
+
+APP = str(Path(__file__).parent.parent / "app.py")
+HINDI = "हिंदी"
+
+
+def test_resumed_hindi_session_is_not_reset():
+    first = AppTest.from_file(APP, default_timeout=60).run()
+    first.selectbox(key="lang").set_value(HINDI).run()
+    first.chat_input[0].set_value("main 30 saal ka hun").run()
+    session_id = first.session_state.session_id
+    assert first.session_state.enhanced_engine.user_profile.get("age") == 30
+
+    spill = HistorySpill(get_config().HISTORY_SPILL_DIR)
+    spill.spill(session_id, [{"role": "user", "content": "earlier turn"}])
+
+    # A new browser tab (or replica) opening the same ?sid= starts with English selected
+    resumed = AppTest.from_file(APP, default_timeout=60)
+    resumed.query_params["sid"] = session_id
+    resumed.run()
+
+    assert resumed.selectbox(key="lang").value == HINDI
+    assert resumed.session_state.current_lang == HINDI
+    assert resumed.session_state.enhanced_engine.user_profile.get("age") == 30
+    assert spill.load(session_id) == [{"role": "user", "content": "earlier turn"}]
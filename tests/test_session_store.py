@@ -0,0 +1,96 @@
+# tests/test_session_store.py - Session backends round-trip, expire and reconnect, well under a millisecond per call
+
+import statistics
+import time
+
+import pytest
+
+from benchmarks.stub_redis import StubRedis
+from src.session_store import RedisSessionStore, RESPClient, SQLiteSessionStore, pack_messages
+
+STATE = {
+    "e": {"p": {"age": 34, "profession": "farmer", "location": "rural"}, "s": "gathering_details", "q": "annual_income"},
+    "m": pack_messages([{"role": "user", "content": "main kisan hun"},
+                        {"role": "assistant", "content": "आपकी सालाना आय कितनी है?"}]),
+    "l": "हिंदी",
+    "n": 0,
+}
+
+# Loopback round trip plus a little JSON; the request's budget is "well under 1 ms"
+MAX_MEDIAN_SECONDS = 0.001
+
+
+@pytest.fixture
+def redis_stub():
+    stub = StubRedis().start()
+    yield stub
+    stub.stop()
+
+
+def median_latency(operation, runs: int = 200) -> float:
+    timings = []
+    for i in range(runs):
+        started = time.perf_counter()
+        operation(i)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def assert_round_trip_is_fast(store, record_property):
+    save = median_latency(lambda i: store.save(f"session-{i}", STATE))
+    load = median_latency(lambda i: store.load(f"session-{i}"))
+    record_property(f"{store.backend_name}_save_median_us", round(save * 1e6, 1))
+    record_property(f"{store.backend_name}_load_median_us", round(load * 1e6, 1))
+    print(f"{store.backend_name}: save {save * 1e6:.0f} µs, load {load * 1e6:.0f} µs (median)")
+    assert save < MAX_MEDIAN_SECONDS
+    assert load < MAX_MEDIAN_SECONDS
+
+
+def test_redis_round_trip(redis_stub, record_property):
+    store = RedisSessionStore(redis_stub.url + "/3", ttl=60)
+    store.save("abc", STATE)
+    assert store.load("abc") == STATE
+    assert redis_stub.databases[3]  # SELECT was honoured
+    store.delete("abc")
+    assert store.load("abc") is None
+    assert_round_trip_is_fast(store, record_property)
+
+
+def test_redis_keys_expire_with_the_session_ttl(redis_stub):
+    store = RedisSessionStore(redis_stub.url + "/0", ttl=1)
+    store.save("short", STATE)
+    assert store.load("short") == STATE
+    time.sleep(1.1)
+    assert store.load("short") is None
+
+
+def test_redis_reconnects_after_the_server_drops_connections(redis_stub):
+    store = RedisSessionStore(redis_stub.url + "/0", ttl=60)
+    store.save("abc", STATE)
+    redis_stub.drop_connections()
+    assert store.load("abc") == STATE
+    assert redis_stub.connections == 2
+
+
+def test_failed_handshake_is_not_kept(redis_stub):
+    redis_stub.password = "secret"
+    client = RESPClient(port=redis_stub.port, password="wrong")
+    with pytest.raises(RuntimeError, match="WRONGPASS"):
+        client.execute("PING")
+    assert client._sock is None
+    client.password = "secret"
+    assert client.execute("PING") == "PONG"
+
+    client = RESPClient(port=redis_stub.port, password="secret", db=99)
+    with pytest.raises(RuntimeError, match="out of range"):
+        client.execute("GET", "abc")
+    assert client._sock is None
+
+
+def test_sqlite_round_trip(tmp_path, record_property):
+    store = SQLiteSessionStore(tmp_path / "sessions.db", ttl=60)
+    store.save("abc", STATE)
+    assert SQLiteSessionStore(tmp_path / "sessions.db", ttl=60).load("abc") == STATE  # another process's view
+    store.delete("abc")
+    assert store.load("abc") is None
+    assert_round_trip_is_fast(store, record_property)
@@ -0,0 +1,22 @@
+# tests/test_trace_retention.py - The span log keeps only the newest rotated segments
+
+from src.conversation_log import log_segments
+from src.tracing import JSONLSpanExporter
+
+
+def test_span_log_prunes_old_segments_on_rotation(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = JSONLSpanExporter(path, max_bytes=200, max_segments=2, flush_interval=0.01)
+    try:
+        for i in range(12):
+            exporter.log.log({"span": i, "padding": "x" * 150})
+            assert exporter.log.flush()
+    finally:
+        exporter.close()
+
+    stats = exporter.stats()
+    rotated = [segment for segment in log_segments(path) if segment != path]
+    assert stats["rotations"] >= 5
+    assert len(rotated) <= 2
+    assert stats["pruned"] == stats["rotations"] - 2
+    assert not list(tmp_path.glob("*.tmp"))